@@ -0,0 +1,125 @@
+"""Adaptive difficulty from incrementally updated ability estimates.
+
+Each (user, company) pair has one `AbilityEstimate` row holding an
+Elo-style rating on the same scale as the difficulty levels below. When a
+`TestResult` is saved the rating moves by ``K * (observed - expected)``,
+where `expected` is the logistic success rate predicted for a paper of that
+difficulty; the result's accuracy is the observation. That update is O(1)
+and the rating summarises the whole history, so choosing a difficulty
+reads one row by its unique key and never scans past results.
+
+The next paper's difficulty is drawn from a mix centred on the level at
+which the user is expected to score about `TARGET_SUCCESS`. Papers stay
+single-difficulty (a `paper_id` addresses one pool), so the mix shows up
+across a user's successive papers.
+"""
+import math
+import random
+
+from django.db import transaction
+
+from .models import AbilityEstimate, TestResult
+
+LEVELS = {'easy': -1.0, 'medium': 0.0, 'hard': 1.0}
+ADAPTIVE = 'adaptive'
+
+K = 0.6
+MIN_RATING, MAX_RATING = -3.0, 3.0
+TARGET_SUCCESS = 0.6
+MIX_WIDTH = 0.5
+
+_TARGET_OFFSET = math.log(TARGET_SUCCESS / (1 - TARGET_SUCCESS))
+
+
+def expected_success(rating, difficulty):
+    """Predicted accuracy (0..1) of a user with `rating` on a `difficulty` paper."""
+    return 1.0 / (1.0 + math.exp(LEVELS[difficulty] - rating))
+
+
+def updated_rating(rating, difficulty, accuracy):
+    rating += K * (accuracy - expected_success(rating, difficulty))
+    return min(max(rating, MIN_RATING), MAX_RATING)
+
+
+def difficulty_mix(rating):
+    """Return {difficulty: probability} for the next paper."""
+    target = rating - _TARGET_OFFSET
+    weights = {
+        difficulty: math.exp(-((level - target) ** 2) / (2 * MIX_WIDTH ** 2))
+        for difficulty, level in LEVELS.items()
+    }
+    total = sum(weights.values())
+    if not total:
+        # Far outside the level range: pick the nearest end
+        nearest = min(LEVELS, key=lambda d: abs(LEVELS[d] - target))
+        return {difficulty: float(difficulty == nearest) for difficulty in LEVELS}
+    return {difficulty: weight / total for difficulty, weight in weights.items()}
+
+
+def get_rating(user, company):
+    rating = (
+        AbilityEstimate.objects.filter(user=user, company=company)
+        .values_list('rating', flat=True)
+        .first()
+    )
+    return 0.0 if rating is None else rating
+
+
+def choose_difficulty(user, company, rng=random):
+    """Pick the difficulty of `user`'s next `company` paper."""
+    mix = difficulty_mix(get_rating(user, company))
+    return rng.choices(list(mix), weights=list(mix.values()))[0]
+
+
+def record_result(user, company, difficulty, percentage):
+    """Fold one finished test into the user's estimate for `company`.
+
+    Results without a known company/difficulty or score are ignored.
+    """
+    if not company or difficulty not in LEVELS:
+        return None
+    try:
+        accuracy = min(max(float(percentage) / 100.0, 0.0), 1.0)
+    except (TypeError, ValueError):
+        return None
+
+    with transaction.atomic():
+        estimate, _ = (
+            AbilityEstimate.objects.select_for_update()
+            .get_or_create(user=user, company=company)
+        )
+        estimate.rating = updated_rating(estimate.rating, difficulty, accuracy)
+        estimate.attempts += 1
+        estimate.save(update_fields=['rating', 'attempts', 'updated_at'])
+    return estimate
+
+
+def rebuild(user_ids=None, batch_size=5000):
+    """Recompute estimates by replaying stored results, oldest first.
+
+    Only server-scored (verified) results count. With `user_ids`, only those
+    users' estimates are replaced. Returns (results replayed, estimates).
+    """
+    qs = TestResult.objects.exclude(company='').filter(verified=True, difficulty__in=list(LEVELS))
+    estimates = AbilityEstimate.objects.all()
+    if user_ids is not None:
+        qs = qs.filter(user_id__in=user_ids)
+        estimates = estimates.filter(user_id__in=user_ids)
+    rows = qs.order_by('attempt_date', 'id').values_list('user_id', 'company', 'difficulty', 'score')
+
+    ratings = {}
+    replayed = 0
+    for user_id, company, difficulty, score in rows.iterator(chunk_size=batch_size):
+        rating, attempts = ratings.get((user_id, company), (0.0, 0))
+        accuracy = min(max(score / 100.0, 0.0), 1.0)
+        ratings[user_id, company] = (updated_rating(rating, difficulty, accuracy), attempts + 1)
+        replayed += 1
+
+    rebuilt = [
+        AbilityEstimate(user_id=user_id, company=company, rating=rating, attempts=attempts)
+        for (user_id, company), (rating, attempts) in ratings.items()
+    ]
+    with transaction.atomic():
+        estimates.delete()
+        AbilityEstimate.objects.bulk_create(rebuilt, batch_size=batch_size)
+    return replayed, len(rebuilt)
@@ -1,7 +1,7 @@
 """Admin registrations for the accounts app (single, cleaned version)."""
 from django.contrib import admin
 from django.contrib.auth.models import User
-from .models import OTP, Video, PDF, UserProfile
+from .models import OTP, Video, PDF, UserProfile, Entitlement
 from .models import Item, Mock, PurchasedItem, AttemptedMock, TestResult
 
 
@@ -23,18 +23,31 @@ class PDFAdmin(admin.ModelAdmin):
     search_fields = ('company', 'title')
 
 
+class EntitlementInline(admin.TabularInline):
+    model = Entitlement
+    extra = 0
+
+
 # ✅ UserProfile को admin में register करो
 @admin.register(UserProfile)
 class UserProfileAdmin(admin.ModelAdmin):
-    list_display = ('get_email', 'phone', 'has_paid', 'created_at')
+    list_display = ('get_email', 'phone', 'created_at')
     search_fields = ('auth_user__email', 'phone')
     readonly_fields = ('created_at',)
+    inlines = [EntitlementInline]
     
     def get_email(self, obj):
         return obj.auth_user.email if obj.auth_user else "N/A"
     get_email.short_description = "Email"
 
 
+@admin.register(Entitlement)
+class EntitlementAdmin(admin.ModelAdmin):
+    list_display = ('user', 'scope', 'company', 'granted_at', 'expires_at')
+    search_fields = ('company', 'user__phone', 'user__auth_user__email')
+    list_filter = ('scope',)
+
+
 @admin.register(Item)
 class ItemAdmin(admin.ModelAdmin):
     list_display = ('title', 'item_type', 'price', 'created_at')
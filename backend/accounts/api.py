@@ -1,11 +1,13 @@
 import json
-from django.http import JsonResponse, HttpResponseBadRequest, HttpResponseForbidden
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, HttpResponseBadRequest, HttpResponseForbidden, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST, require_GET
 from django.utils import timezone
-from .models import Item, Mock, PurchasedItem, AttemptedMock, User, Question
+from .models import Item, Mock, PurchasedItem, AttemptedMock, User, UserProfile
 from .jwt_utils import verify_token, create_token
-import socketio
+from . import ability, catalog, company_directory, entitlements, event_stream, pagination, papers, pdf_search, profile_cache, profile_events, question_history, question_payloads, question_search, scoring
 
 
 def _get_user_from_request(request, data=None):
@@ -44,20 +46,23 @@ def _get_user_from_request(request, data=None):
     return None, JsonResponse({'ok': False, 'error': 'authentication_required'}, status=401)
 
 
-def _emit_profile_updated(user_id, profile):
-    """Emit profileUpdated via Socket.IO to server on localhost:3000.
+def _session_user(request):
+    """The signed-in auth user, or None.
 
-    This uses a short-lived Socket.IO client connection.
+    The login pages keep the user in the session (`user_id`, or `phone` for
+    OTP logins) rather than calling `auth.login()`, so `request.user` is
+    only consulted first.
     """
-    try:
-        sio = socketio.Client()
-        sio.connect('http://localhost:3000', namespaces=['/'])
-        # emit to server which will forward to room
-        sio.emit('server_emit', {'to': str(user_id), 'event': 'profileUpdated', 'payload': profile})
-        sio.disconnect()
-    except Exception:
-        # In production log the error; for demo we ignore
-        pass
+    if request.user.is_authenticated:
+        return request.user
+    phone = request.session.get('phone')
+    if phone:
+        profile = UserProfile.objects.select_related('auth_user').filter(phone=phone).first()
+        return profile.auth_user if profile else None
+    uid = request.session.get('user_id')
+    if uid:
+        return User.objects.filter(pk=uid).first()
+    return None
 
 
 @csrf_exempt
@@ -84,7 +89,8 @@ def purchase(request):
     except Item.DoesNotExist:
         return JsonResponse({'ok': False, 'error': 'item_not_found'}, status=404)
 
-    # create PurchasedItem record
+    # create PurchasedItem record; the post_save handler publishes the
+    # purchaseAdded event (see accounts.profile_events)
     pi = PurchasedItem.objects.create(
         user=user,
         item=item,
@@ -93,19 +99,7 @@ def purchase(request):
         purchased_at=timezone.now(),
     )
 
-    # Build updated profile payload
-    purchased = [p.as_dict() for p in user.purchased_items.all().order_by('-purchased_at')]
-    attempted = [a.as_dict() for a in user.attempted_mocks.all().order_by('-attempt_date')]
-    profile = {
-        'userInfo': {'id': str(user.id), 'phone': getattr(user, 'phone', None)},
-        'purchasedItems': purchased,
-        'attemptedMocks': attempted,
-    }
-
-    # emit realtime
-    _emit_profile_updated(user.id, profile)
-
-    return JsonResponse({'ok': True, 'user': profile})
+    return JsonResponse({'ok': True, 'event': profile_events.PURCHASE_ADDED, **pi.profile_event})
 
 
 @csrf_exempt
@@ -134,38 +128,74 @@ def mock_attempt(request):
     except Mock.DoesNotExist:
         return JsonResponse({'ok': False, 'error': 'mock_not_found'}, status=404)
 
+    # publishes attemptAdded (see accounts.profile_events)
     am = AttemptedMock.objects.create(user=user, mock=mock, score=int(score), attempt_date=timezone.now())
 
-    purchased = [p.as_dict() for p in user.purchased_items.all().order_by('-purchased_at')]
-    attempted = [a.as_dict() for a in user.attempted_mocks.all().order_by('-attempt_date')]
-    profile = {
-        'userInfo': {'id': str(user.id), 'phone': getattr(user, 'phone', None)},
-        'purchasedItems': purchased,
-        'attemptedMocks': attempted,
-    }
+    return JsonResponse({'ok': True, 'event': profile_events.ATTEMPT_ADDED, **am.profile_event})
 
-    _emit_profile_updated(user.id, profile)
 
-    return JsonResponse({'ok': True, 'user': profile})
+@require_GET
+async def events(request):
+    """GET /api/events/
+
+    Server-sent events for the session's user: the profile events of
+    accounts.profile_events, coalesced like the Socket.IO path (see
+    accounts.event_stream). Answers 503 unless the 'sse' transport is
+    enabled and the project runs under ASGI: a WSGI server would consume
+    the endless body before sending anything, holding a worker forever.
+    """
+    if 'sse' not in settings.REALTIME_TRANSPORTS:
+        return JsonResponse({'ok': False, 'error': 'event_stream_disabled'}, status=503)
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({'ok': False, 'error': 'asgi_required'}, status=503)
+    phone = await request.session.aget('phone')
+    room = await request.session.aget('user_id')
+    if phone:
+        room = await UserProfile.objects.filter(phone=phone).values_list('auth_user_id', flat=True).afirst()
+    if not room:
+        return JsonResponse({'ok': False, 'error': 'not_authenticated'}, status=401)
+
+    subscription = event_stream.get_broker().subscribe(room)
+    response = StreamingHttpResponse(
+        event_stream.stream(subscription, settings.REALTIME_COALESCE_WINDOW),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    # Tell nginx not to buffer the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
 
 
 @require_GET
 def user_profile(request, user_id):
+    """GET /user/<user_id>/profile/?purchased_cursor=&attempted_cursor=&page_size=
+
+    Both lists are cursor-paginated independently (see accounts.pagination).
+    """
     try:
-        user = User.objects.get(pk=user_id)
-    except User.DoesNotExist:
+        purchased_cursor, page_size = pagination.page_params(request, 'purchased_')
+        attempted_cursor, _ = pagination.page_params(request, 'attempted_')
+    except pagination.InvalidCursor as e:
+        return JsonResponse({'ok': False, 'error': str(e)}, status=400)
+
+    # Header from the cached aggregate (see accounts.profile_cache), read
+    # before the lists: a change in between arrives as the next event
+    aggregate = profile_cache.get(user_id)
+    if aggregate is None:
         return JsonResponse({'ok': False, 'error': 'user_not_found'}, status=404)
-
-    purchased = [p.as_dict() for p in user.purchased_items.all().order_by('-purchased_at')]
-    attempted = [a.as_dict() for a in user.attempted_mocks.all().order_by('-attempt_date')]
+    purchased = pagination.paginate(PurchasedItem.objects.filter(user_id=user_id), 'purchased_at', purchased_cursor, page_size)
+    attempted = pagination.paginate(AttemptedMock.objects.filter(user_id=user_id), 'attempt_date', attempted_cursor, page_size)
 
     profile = {
         'userInfo': {
-            'id': str(user.id),
-            'phone': getattr(user, 'phone', None),
+            'id': str(aggregate['user']['id']),
+            'phone': None,  # auth users have no phone
         },
-        'purchasedItems': purchased,
-        'attemptedMocks': attempted,
+        'purchasedItems': [p.as_dict() for p in purchased.items],
+        'attemptedMocks': [a.as_dict() for a in attempted.items],
+        'purchasedItemsNextCursor': purchased.next_cursor,
+        'attemptedMocksNextCursor': attempted.next_cursor,
+        'version': aggregate['version'],
     }
 
     return JsonResponse({'ok': True, 'profile': profile})
@@ -229,6 +259,10 @@ def get_questions(request):
     
     Returns 20 questions for the specified company and difficulty level.
     If fewer than 20 questions exist, returns all available.
+    `difficulty=adaptive` picks the level from the user's ability estimate
+    (see `accounts.ability`); the chosen level is returned as `difficulty`.
+    The response includes a `paper_id` from which the same paper can be
+    rebuilt later (see `accounts.papers`).
     """
     company = request.GET.get('company', 'google')
     difficulty = request.GET.get('difficulty', 'medium')
@@ -243,38 +277,79 @@ def get_questions(request):
             status=400
         )
 
+    user = _session_user(request)
+    if difficulty == ability.ADAPTIVE:
+        if user is not None:
+            difficulty = ability.choose_difficulty(user, company)
+        else:
+            difficulty = 'medium'
+
     if difficulty not in valid_difficulties:
         return JsonResponse(
-            {'ok': False, 'error': f'Invalid difficulty. Valid options: {", ".join(valid_difficulties)}'}, 
+            {'ok': False, 'error': f'Invalid difficulty. Valid options: {", ".join(valid_difficulties + [ability.ADAPTIVE])}'}, 
             status=400
         )
 
     try:
-        # Fetch questions matching company and difficulty
-        questions = Question.objects.filter(
-            company=company,
-            difficulty=difficulty
-        ).order_by('?')[:20]  # Shuffle and limit to 20
+        # Signed-in users skip questions they were already served
+        seen = None
+        if user is not None:
+            seen = question_history.load(user)
+
+        # Draw a seeded paper of 20 ids from the in-memory pool
+        paper = papers.issue(company, difficulty, 20, seen=seen)
+        if seen is not None and paper.question_ids:
+            question_history.record(user, seen, paper.question_ids)
 
-        if not questions.exists():
+        # Pre-encoded JSON per question; only cache misses hit the ORM
+        fragments = question_payloads.get_fragments(paper.question_ids)
+
+        if not fragments:
             return JsonResponse(
                 {'ok': True, 'questions': [], 'count': 0},
                 status=200
             )
 
-        # Serialize questions
-        questions_data = [q.as_dict() for q in questions]
+        body = question_payloads.build_body(
+            fragments,
+            company=company,
+            difficulty=difficulty,
+            paper_id=paper.paper_id,
+        )
+        return HttpResponse(body, content_type='application/json', status=200)
 
+    except Exception as e:
         return JsonResponse(
-            {
-                'ok': True,
-                'questions': questions_data,
-                'count': len(questions_data),
-                'company': company,
-                'difficulty': difficulty
-            },
-            status=200
+            {'ok': False, 'error': str(e)},
+            status=500
+        )
+
+
+@require_GET
+def get_paper(request):
+    """GET /api/paper/?paper_id=<id>
+
+    Rebuilds a paper previously issued by `get_questions` (same questions,
+    same order) for review pages. No paper contents are stored server-side.
+    """
+    paper_id = request.GET.get('paper_id')
+    if not paper_id:
+        return JsonResponse({'ok': False, 'error': 'paper_id required'}, status=400)
+
+    try:
+        paper = papers.rebuild(paper_id)
+    except papers.InvalidPaper as e:
+        return JsonResponse({'ok': False, 'error': str(e)}, status=400)
+
+    try:
+        fragments = question_payloads.get_fragments(paper.question_ids)
+        body = question_payloads.build_body(
+            fragments,
+            company=paper.company,
+            difficulty=paper.difficulty,
+            paper_id=paper.paper_id,
         )
+        return HttpResponse(body, content_type='application/json', status=200)
 
     except Exception as e:
         return JsonResponse(
@@ -283,45 +358,173 @@ def get_questions(request):
         )
 
 
+@require_GET
+def search_questions(request):
+    """GET /api/questions/search/?q=binary+search&company=google&difficulty=easy&page=1&page_size=20
+
+    Returns ranked, paginated question hits with highlighted snippets.
+    """
+    query = request.GET.get('q', '').strip()
+    company = request.GET.get('company') or None
+    difficulty = request.GET.get('difficulty') or None
+    if not query:
+        return JsonResponse({'ok': False, 'error': 'q required'}, status=400)
+
+    try:
+        page = int(request.GET.get('page', 1))
+        page_size = int(request.GET.get('page_size', question_search.DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return JsonResponse({'ok': False, 'error': 'page and page_size must be integers'}, status=400)
+
+    hits, has_more = question_search.search(query, company, difficulty, page, page_size)
+    return JsonResponse({
+        'ok': True,
+        'results': hits,
+        'count': len(hits),
+        'page': max(page, 1),
+        'has_more': has_more,
+    })
+
+
+@require_GET
+def search_pdfs(request):
+    """GET /api/pdfs/search/?q=time+and+work&company=TCS&page=1&page_size=20
+
+    Ranked page-level hits inside the PDFs the session's user has access to
+    (all PDFs with full access, otherwise the purchased companies').
+    """
+    query = request.GET.get('q', '').strip()
+    company = request.GET.get('company') or None
+    if not query:
+        return JsonResponse({'ok': False, 'error': 'q required'}, status=400)
+
+    try:
+        page = int(request.GET.get('page', 1))
+        page_size = int(request.GET.get('page_size', pdf_search.DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return JsonResponse({'ok': False, 'error': 'page and page_size must be integers'}, status=400)
+
+    profile = entitlements.profile_for(request)
+    if profile is None:
+        return JsonResponse({'ok': False, 'error': 'not_authenticated'}, status=401)
+    companies = None if entitlements.has_access(profile) else entitlements.companies(profile)
+
+    hits, has_more = pdf_search.search(query, companies, company, page, page_size)
+    return JsonResponse({
+        'ok': True,
+        'results': hits,
+        'count': len(hits),
+        'page': max(page, 1),
+        'has_more': has_more,
+    })
+
+
+@require_GET
+def list_companies(request):
+    """GET /api/companies/
+
+    Companies that have PDFs, with display name, PDF count and latest upload.
+    Read from the company directory and served as an ETag'd catalog snapshot.
+    """
+    def build():
+        companies = [entry.as_dict() for entry in company_directory.entries()]
+        return question_payloads.encode({'ok': True, 'companies': companies, 'count': len(companies)})
+
+    try:
+        snapshot = catalog.get_snapshot('companies', None, build)
+    except Exception as e:
+        return JsonResponse({'ok': False, 'error': str(e)}, status=500)
+
+    return catalog.respond(request, snapshot)
+
+
+MAX_BULK_SUBMISSIONS = 10000
+
+
+@csrf_exempt
+@require_POST
+def score_submissions(request):
+    """POST /api/score-bulk/  (staff only)
+
+    Body: { submissions: [{ paper_id, answers }, ...] }
+
+    Scores many submissions in one call, e.g. when replaying imported
+    attempts. Submissions of the same paper are scored together.
+    """
+    if not request.user.is_authenticated or not request.user.is_staff:
+        return HttpResponseForbidden('staff only')
+
+    try:
+        data = json.loads(request.body.decode('utf-8'))
+    except Exception:
+        return HttpResponseBadRequest('invalid json')
+
+    submissions = data.get('submissions')
+    if not isinstance(submissions, list):
+        return HttpResponseBadRequest('submissions list required')
+    if len(submissions) > MAX_BULK_SUBMISSIONS:
+        return JsonResponse({'ok': False, 'error': f'at most {MAX_BULK_SUBMISSIONS} submissions per call'}, status=400)
+
+    items = [
+        (s.get('paper_id'), s.get('answers')) if isinstance(s, dict) else (None, None)
+        for s in submissions
+    ]
+    results = []
+    for result in scoring.score_bulk(items):
+        if isinstance(result, scoring.Score):
+            results.append({'ok': True, **result._asdict()})
+        else:
+            results.append({'ok': False, 'error': result})
+
+    return JsonResponse({'ok': True, 'results': results, 'count': len(results)})
+
+
 @require_GET
 def get_user_purchased_items(request, user_id):
-    """GET /user/<user_id>/purchased-items/
+    """GET /user/<user_id>/purchased-items/?cursor=&page_size=
     
-    Returns all purchased items for a user.
+    Returns a user's purchased items, newest first, one cursor page at a time.
     """
     try:
-        user = User.objects.get(pk=user_id)
-    except User.DoesNotExist:
-        return JsonResponse({'ok': False, 'error': 'user_not_found'}, status=404)
+        cursor, page_size = pagination.page_params(request)
+    except pagination.InvalidCursor as e:
+        return JsonResponse({'ok': False, 'error': str(e)}, status=400)
 
-    from .models import PurchasedItem
-    purchased_items = PurchasedItem.objects.filter(user=user).order_by('-purchased_at')
-    items_data = [item.as_dict() for item in purchased_items]
+    # The cached profile aggregate doubles as the user lookup (see accounts.profile_cache)
+    if profile_cache.get(user_id) is None:
+        return JsonResponse({'ok': False, 'error': 'user_not_found'}, status=404)
+    page = pagination.paginate(PurchasedItem.objects.filter(user_id=user_id), 'purchased_at', cursor, page_size)
+    items_data = [item.as_dict() for item in page.items]
     
     return JsonResponse({
         'ok': True,
         'purchased_items': items_data,
-        'count': len(items_data)
+        'count': len(items_data),
+        'next_cursor': page.next_cursor,
     })
 
 
 @require_GET
 def get_user_test_results(request, user_id):
-    """GET /user/<user_id>/test-results/
+    """GET /user/<user_id>/test-results/?cursor=&page_size=
     
-    Returns all test results for a user.
+    Returns a user's test results, newest first, one cursor page at a time.
     """
     try:
-        user = User.objects.get(pk=user_id)
-    except User.DoesNotExist:
-        return JsonResponse({'ok': False, 'error': 'user_not_found'}, status=404)
+        cursor, page_size = pagination.page_params(request)
+    except pagination.InvalidCursor as e:
+        return JsonResponse({'ok': False, 'error': str(e)}, status=400)
 
+    # The cached profile aggregate doubles as the user lookup (see accounts.profile_cache)
+    if profile_cache.get(user_id) is None:
+        return JsonResponse({'ok': False, 'error': 'user_not_found'}, status=404)
     from .models import TestResult
-    test_results = TestResult.objects.filter(user=user).order_by('-attempt_date')
-    results_data = [result.as_dict() for result in test_results]
+    page = pagination.paginate(TestResult.objects.filter(user_id=user_id), 'attempt_date', cursor, page_size)
+    results_data = [result.as_dict() for result in page.items]
     
     return JsonResponse({
         'ok': True,
         'test_results': results_data,
-        'count': len(results_data)
+        'count': len(results_data),
+        'next_cursor': page.next_cursor,
     })
@@ -11,3 +11,7 @@ from django.apps import AppConfig
 class AccountsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'accounts'
+
+    def ready(self):
+        # Register model signal handlers (cache invalidation etc.)
+        from . import signals  # noqa: F401
@@ -0,0 +1,100 @@
+"""Versioned snapshots of the PDF and video catalog endpoints.
+
+The catalog changes rarely, but `list_pdfs` and `list_videos` used to query
+and serialize every row on every page load. Here each response body is
+built once per catalog version and kept, with a strong ETag derived from
+its bytes, per (endpoint, company filter).
+
+The version is a timestamp in the Django cache that `accounts.signals`
+moves after any `PDF`/`Video` save or delete commits (earlier, a reader
+could rebuild from pre-commit rows and cache them under the new version).
+Snapshots live in a
+process-local dict in front of the shared cache; both are keyed by the
+version, so a bump makes every old snapshot unreachable without deleting
+anything. Serving a snapshot, or a 304 for a matching ``If-None-Match``,
+needs no database access and no JSON encoding.
+"""
+import hashlib
+import threading
+import time
+from collections import namedtuple
+
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+
+VERSION_KEY = 'catalog:version'
+CACHE_TIMEOUT = 7 * 24 * 3600
+# Company filters come from the query string; bound what one process keeps
+MAX_LOCAL_SNAPSHOTS = 256
+
+Snapshot = namedtuple('Snapshot', ['etag', 'body'])
+
+_lock = threading.Lock()
+_local = {}
+_local_version = None
+
+
+def current_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(VERSION_KEY, version, None):
+            version = cache.get(VERSION_KEY, version)
+    return version
+
+
+def bump():
+    """Start a new catalog version; called when a PDF or video changes."""
+    cache.set(VERSION_KEY, time.time_ns(), None)
+    with _lock:
+        _local.clear()
+
+
+def _cache_key(version, key):
+    return f'catalog:{version}:' + ':'.join(str(part) for part in key)
+
+
+def get_snapshot(endpoint, company, build, *extra):
+    """Return the `Snapshot` for (endpoint, company), calling `build()` on a miss.
+
+    `build` must return the encoded response body as bytes. `extra` key
+    parts (e.g. a page cursor and size) select further variants.
+    """
+    global _local_version
+    version = current_version()
+    key = (endpoint, company or '', *extra)
+    with _lock:
+        if version != _local_version:
+            _local.clear()
+            _local_version = version
+        snapshot = _local.get(key)
+    if snapshot is not None:
+        return snapshot
+
+    shared_key = _cache_key(version, key)
+    snapshot = cache.get(shared_key)
+    if snapshot is None:
+        body = build()
+        snapshot = Snapshot('"%s"' % hashlib.sha256(body).hexdigest()[:32], body)
+        cache.set(shared_key, snapshot, CACHE_TIMEOUT)
+
+    with _lock:
+        if _local_version == version:
+            if len(_local) >= MAX_LOCAL_SNAPSHOTS:
+                _local.clear()
+            _local[key] = snapshot
+    return snapshot
+
+
+def respond(request, snapshot):
+    """Serve `snapshot`, or a 304 when the client already holds it."""
+    etags = parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))
+    if snapshot.etag in etags or '*' in etags:
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(snapshot.body, content_type='application/json')
+    response['ETag'] = snapshot.etag
+    # Let browsers keep the body but revalidate every time (cheap 304s)
+    response['Cache-Control'] = 'no-cache'
+    return response
@@ -0,0 +1,70 @@
+"""Materialized directory of companies that have PDFs.
+
+`dashboard` used to load every `PDF` row to collect company names and
+`home` ran a DISTINCT over the PDF table on every hit. Instead each
+company has one `CompanyDirectory` row (slug, display name, PDF count and
+latest upload), refreshed by the PDF signal handlers in `accounts.signals`.
+A refresh aggregates only the affected company's PDFs, using the
+(company, created_at) index, so readers cost O(companies) and writers
+O(PDFs of one company).
+"""
+from django.db.models import Count, Max
+from django.utils.text import slugify
+
+from .models import CompanyDirectory, PDF
+
+
+def display_name(company):
+    """'capgemini' -> 'Capgemini'; names with capitals are kept as typed."""
+    return company.title() if company.islower() else company
+
+
+def refresh(company):
+    """Recompute the directory row for one PDF.company value."""
+    if not company:
+        return
+    stats = PDF.objects.filter(company=company).aggregate(count=Count('id'), latest=Max('created_at'))
+    if not stats['count']:
+        CompanyDirectory.objects.filter(company=company).delete()
+        return
+    CompanyDirectory.objects.update_or_create(
+        company=company,
+        defaults={
+            'slug': slugify(company),
+            'name': display_name(company),
+            'pdf_count': stats['count'],
+            'latest_upload': stats['latest'],
+        },
+    )
+
+
+def rebuild():
+    """Recompute the whole directory from the PDF table; returns the row count."""
+    rows = (
+        PDF.objects.exclude(company='')
+        .values('company')
+        .annotate(count=Count('id'), latest=Max('created_at'))
+    )
+    entries = [
+        CompanyDirectory(
+            company=row['company'],
+            slug=slugify(row['company']),
+            name=display_name(row['company']),
+            pdf_count=row['count'],
+            latest_upload=row['latest'],
+        )
+        for row in rows
+    ]
+    CompanyDirectory.objects.all().delete()
+    CompanyDirectory.objects.bulk_create(entries)
+    return len(entries)
+
+
+def entries():
+    return list(CompanyDirectory.objects.all())
+
+
+def company_names(limit=None):
+    """Sorted PDF.company values that have at least one PDF."""
+    names = CompanyDirectory.objects.values_list('company', flat=True)
+    return list(names[:limit] if limit else names)
@@ -0,0 +1,159 @@
+"""Company knowledge base: profile lookup, fuzzy slug resolution, page cache.
+
+Company profiles used to be one large dict literal in `accounts.views`,
+built at import in every worker and searched with a linear partial-match
+loop on a miss. They now live in the `CompanyProfile` table (seeded from
+``data/company_profiles.json``), and this module keeps a small sorted index
+of normalized lookup keys (slug, name and aliases, lowercased with
+punctuation removed) per process:
+
+* exact match: one bisect, O(log n)
+* query is a prefix of a key ("goldm" -> goldman-sachs): one bisect
+* a key is a prefix of the query ("tcs-placement" -> tcs): one bisect per
+  candidate prefix length, O(len(query) * log n)
+
+Profiles and rendered pages are cached in the Django cache under a version
+that `accounts.signals` bumps on any `CompanyProfile` change; the
+process-local index is rebuilt when that version moves.
+"""
+import json
+import threading
+import time
+from bisect import bisect_left
+
+from django.core.cache import cache
+from django.db import transaction
+from django.template.loader import render_to_string
+from django.utils.text import slugify
+
+from .models import CompanyProfile
+
+VERSION_KEY = 'company_kb:version'
+TEMPLATE = 'company-details.html'
+# Shorter fuzzy matches are too ambiguous to resolve
+MIN_PREFIX = 2
+CACHE_TIMEOUT = 24 * 3600
+
+_lock = threading.Lock()
+_index = None  # (version, keys, slugs)
+
+
+def normalize(text):
+    return ''.join(ch for ch in str(text).lower() if ch.isalnum())
+
+
+def current_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(VERSION_KEY, version, None):
+            version = cache.get(VERSION_KEY, version)
+    return version
+
+
+def bump():
+    """Invalidate cached profiles, pages and every process's index."""
+    global _index
+    cache.set(VERSION_KEY, time.time_ns(), None)
+    with _lock:
+        _index = None
+
+
+def _build_index():
+    pairs = {}
+    for slug, name, aliases in CompanyProfile.objects.values_list('slug', 'name', 'aliases'):
+        for alias in [slug, name, *(aliases or [])]:
+            key = normalize(alias)
+            # First writer wins so an alias cannot hijack another company's slug
+            if key and (key not in pairs or key == normalize(slug)):
+                pairs[key] = slug
+    keys = sorted(pairs)
+    return keys, [pairs[key] for key in keys]
+
+
+def _get_index():
+    global _index
+    version = current_version()
+    with _lock:
+        if _index is not None and _index[0] == version:
+            return _index[1], _index[2]
+    keys, slugs = _build_index()
+    with _lock:
+        _index = (version, keys, slugs)
+    return keys, slugs
+
+
+def resolve(query):
+    """Return the slug best matching `query`, or None."""
+    q = normalize(query or '')
+    if not q:
+        return None
+    keys, slugs = _get_index()
+
+    i = bisect_left(keys, q)
+    if i < len(keys) and keys[i].startswith(q) and (keys[i] == q or len(q) >= MIN_PREFIX):
+        return slugs[i]
+
+    # Longest key that is a prefix of the query
+    for length in range(len(q) - 1, MIN_PREFIX - 1, -1):
+        j = bisect_left(keys, q[:length])
+        if j < len(keys) and keys[j] == q[:length]:
+            return slugs[j]
+    return None
+
+
+def get_profile(slug):
+    """Return the profile dict for `slug` (as the template expects) or None."""
+    key = f'company_kb:{current_version()}:profile:{slug}'
+    profile = cache.get(key)
+    if profile is None:
+        company = CompanyProfile.objects.filter(slug=slug).first()
+        if company is None:
+            return None
+        profile = company.as_dict()
+        cache.set(key, profile, CACHE_TIMEOUT)
+    return profile
+
+
+def render_page(request, slug, use_cache=True):
+    """Return the rendered company details page for `slug`.
+
+    The template only varies by login state, so two variants are cached.
+    `use_cache=False` forces a fresh render (used by `accounts.prerender`).
+    """
+    authenticated = bool(getattr(request, 'user', None) and request.user.is_authenticated)
+    key = f'company_kb:{current_version()}:page:{slug}:{int(authenticated)}'
+    html = cache.get(key) if use_cache else None
+    if html is None:
+        profile = get_profile(slug)
+        if profile is None:
+            raise CompanyProfile.DoesNotExist(slug)
+        html = render_to_string(TEMPLATE, {
+            'company': profile,
+            'page_title': f'{profile["name"]} - Interview Preparation Guide',
+        }, request)
+        cache.set(key, html, CACHE_TIMEOUT)
+    return html
+
+
+def read_profiles(fh):
+    """Parse a JSON list of profiles: {slug, name, aliases?, ...page fields}."""
+    return json.load(fh)
+
+
+def upsert_profiles(entries):
+    """Create or update profiles from parsed entries; returns the count."""
+    count = 0
+    with transaction.atomic():
+        for entry in entries:
+            entry = dict(entry)
+            slug = slugify(entry.pop('slug', '') or entry.get('name', ''))
+            name = entry.pop('name', '')
+            if not slug or not name:
+                continue
+            CompanyProfile.objects.update_or_create(
+                slug=slug,
+                defaults={'name': name, 'aliases': entry.pop('aliases', []), 'profile': entry},
+            )
+            count += 1
+    return count
@@ -0,0 +1,56 @@
+"""Short-lived signed PDF download URLs.
+
+`pdf_download` resolves the session to a `UserProfile` and checks its paid
+companies on every request, and a PDF viewer fetching byte ranges repeats
+that for each chunk. Instead, the entitlement is checked once when a link
+is issued (`pdf_link`, the profile page) and the result is carried in the
+URL::
+
+    /pdf/s/<pdf id>/<profile id>/<expires>/<signature>/<asset path>
+
+The signature is an HMAC-SHA256 (keyed from ``SECRET_KEY``) over all other
+parts, so `verify` needs no database or session access and compares in
+constant time. Expiry is rounded up to `GRANULARITY` seconds so links issued
+close together are identical and stay cacheable by the browser.
+"""
+import base64
+import time
+
+from django.conf import settings
+from django.urls import reverse
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+SALT = 'accounts.download_links'
+GRANULARITY = 60
+# 128 bits of the HMAC, base64url without padding
+SIGNATURE_LENGTH = 22
+
+
+def signature(pdf_id, user_id, expires, name):
+    message = f'{pdf_id}:{user_id}:{expires}:{name}'
+    digest = salted_hmac(SALT, message, algorithm='sha256').digest()
+    return base64.urlsafe_b64encode(digest).decode()[:SIGNATURE_LENGTH]
+
+
+def expiry(now=None):
+    now = int(time.time() if now is None else now)
+    deadline = now + settings.PDF_LINK_TTL
+    return -(-deadline // GRANULARITY) * GRANULARITY
+
+
+def signed_url(pdf_id, user_id, name, now=None):
+    """URL for asset `name` (relative to MEDIA_ROOT) that `user_id` may fetch."""
+    expires = expiry(now)
+    return reverse('accounts:pdf_signed_download', kwargs={
+        'pdf_id': pdf_id,
+        'user_id': user_id,
+        'expires': expires,
+        'signature': signature(pdf_id, user_id, expires, name),
+        'name': name,
+    }), expires
+
+
+def verify(pdf_id, user_id, expires, sig, name, now=None):
+    if expires < (time.time() if now is None else now):
+        return False
+    return constant_time_compare(sig, signature(pdf_id, user_id, expires, name))
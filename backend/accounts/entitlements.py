@@ -0,0 +1,146 @@
+"""Access grants (`Entitlement` rows) with a per-user cache.
+
+Purchases used to live in `UserProfile.has_paid` and the `paid_companies`
+JSON blob, so every purchase rewrote the blob and "who bought company X"
+meant decoding every profile. Each grant is now one indexed row, and this
+module is the only place that reads or writes them.
+
+A user's grants are loaded with one query into a small dict
+``{(scope, company): expires_at}`` and kept in a process-local dict. Each
+user has a version stamp in the Django cache, moved by `invalidate()` (the
+`Entitlement` signal handlers call it on every save and delete), so a grant
+or revoke in one worker is seen by the others on their next check. Expiry is
+evaluated at check time, so cached grants lapse on schedule.
+"""
+import threading
+import time
+
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Entitlement, UserProfile
+
+ALL = Entitlement.SCOPE_ALL
+COMPANY = Entitlement.SCOPE_COMPANY
+# Bound the process-local tier; it is simply emptied when full
+MAX_LOCAL_USERS = 4096
+
+_lock = threading.Lock()
+_local = {}  # user id -> (version, grants)
+
+
+def _version_key(user_id):
+    return f'entitlements:{user_id}:version'
+
+
+def _version(user_id):
+    version = cache.get(_version_key(user_id))
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(_version_key(user_id), version, None):
+            version = cache.get(_version_key(user_id), version)
+    return version
+
+
+def invalidate(user_id):
+    cache.set(_version_key(user_id), time.time_ns(), None)
+    with _lock:
+        _local.pop(user_id, None)
+
+
+def profile_for(request):
+    """The session's UserProfile (phone login or linked auth user), or None."""
+    phone = request.session.get('phone')
+    uid = request.session.get('user_id')
+    if phone:
+        return UserProfile.objects.filter(phone=phone).first()
+    if uid:
+        return UserProfile.objects.filter(auth_user_id=uid).first()
+    return None
+
+
+def grants(user):
+    """{(scope, company): expires_at or None} for a `UserProfile`."""
+    version = _version(user.pk)
+    cached = _local.get(user.pk)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    rows = Entitlement.objects.filter(user_id=user.pk).values_list('scope', 'company', 'expires_at')
+    loaded = {(scope, company): expires_at for scope, company, expires_at in rows}
+    with _lock:
+        if len(_local) >= MAX_LOCAL_USERS:
+            _local.clear()
+        _local[user.pk] = (version, loaded)
+    return loaded
+
+
+def _active(expires_at, now):
+    return expires_at is None or expires_at > now
+
+
+def has_access(user, company=None):
+    """True if `user` may open everything, or `company`'s PDFs when given."""
+    if user is None:
+        return False
+    held = grants(user)
+    now = timezone.now()
+    if (ALL, '') in held and _active(held[(ALL, '')], now):
+        return True
+    return bool(company) and (COMPANY, company) in held and _active(held[(COMPANY, company)], now)
+
+
+def companies(user):
+    """Sorted companies whose PDFs `user` has bought (not counting ALL)."""
+    now = timezone.now()
+    return sorted(
+        company for (scope, company), expires_at in grants(user).items()
+        if scope == COMPANY and _active(expires_at, now)
+    )
+
+
+def summary(user):
+    """The legacy `has_paid` / `paid_companies` shape used in API responses."""
+    return {
+        'has_paid': has_access(user),
+        'paid_companies': {company: True for company in companies(user)},
+    }
+
+
+def grant(user, scope, company='', expires_at=None):
+    """Create or extend a grant; returns the `Entitlement`."""
+    entitlement, _ = Entitlement.objects.update_or_create(
+        user=user, scope=scope, company=company if scope == COMPANY else '',
+        defaults={'granted_at': timezone.now(), 'expires_at': expires_at},
+    )
+    return entitlement
+
+
+def revoke(user, scope, company=''):
+    """Remove a grant; returns True if one existed."""
+    entitlement = Entitlement.objects.filter(
+        user=user, scope=scope, company=company if scope == COMPANY else '',
+    ).first()
+    if entitlement is None:
+        return False
+    entitlement.delete()
+    return True
+
+
+def _unexpired():
+    return Q(expires_at__isnull=True) | Q(expires_at__gt=timezone.now())
+
+
+def with_full_access(user_ids):
+    """The subset of profile ids holding an active ALL grant (one query)."""
+    return set(
+        Entitlement.objects.filter(user_id__in=list(user_ids), scope=ALL)
+        .filter(_unexpired())
+        .values_list('user_id', flat=True)
+    )
+
+
+def holders(company):
+    """Profiles with an active grant for `company` (uses the (scope, company) index)."""
+    active = Entitlement.objects.filter(scope=COMPANY, company=company).filter(_unexpired())
+    return UserProfile.objects.filter(pk__in=active.values('user_id'))
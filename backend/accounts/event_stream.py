@@ -0,0 +1,222 @@
+"""In-process pub/sub behind the ``/api/events/`` server-sent-events stream.
+
+Profile events used to reach the browser only through the Node Socket.IO
+server: Django → python-socketio → Node → browser. `api.events` serves
+them straight from Django instead, as an ``text/event-stream`` response (run
+the project under ASGI, ``djproject.asgi``, so the stream does not hold a
+worker thread). `accounts.realtime.emit` publishes to it when ``'sse'`` is in
+``settings.REALTIME_TRANSPORTS``.
+
+Rooms are user ids. The broker is chosen by ``settings.EVENT_STREAM_BACKEND``
+(a dotted path), and anything with the same two methods can replace it, e.g.
+a Redis pub/sub client:
+
+``publish(room, event, payload)``
+    callable from any thread, never blocks on subscribers
+``subscribe(room)``
+    called on the event loop; returns a `Subscription` (``await get()``,
+    ``close()``)
+
+`LocalBroker`
+    asyncio queues in this process; enough for a single ASGI process.
+`SQLiteBroker`
+    for several processes: publishers append to a small SQLite file
+    (``settings.EVENT_STREAM_SQLITE_PATH``, WAL mode) and each process polls
+    it every `POLL_INTERVAL` seconds for its local subscribers.
+
+Each subscription has a bounded queue; a slow client loses its oldest
+events, which the versioned profile protocol turns into a refetch.
+"""
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.module_loading import import_string
+
+# Events buffered per connected client
+SUBSCRIPTION_SIZE = 256
+POLL_INTERVAL = 0.1
+# How long published rows stay in the SQLite file
+RETENTION = 60
+
+
+class Subscription:
+    """One client's queue; fed from any thread, read on its event loop."""
+
+    def __init__(self, broker, room, loop):
+        self.broker = broker
+        self.room = room
+        self.loop = loop
+        self.queue = asyncio.Queue(SUBSCRIPTION_SIZE)
+        self.dropped = 0
+
+    def deliver(self, message):
+        try:
+            self.loop.call_soon_threadsafe(self._put, message)
+        except RuntimeError:
+            pass  # loop closed; the stream is gone
+
+    def _put(self, message):
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(message)
+
+    async def get(self, timeout=None):
+        """The next (event, payload); raises `asyncio.TimeoutError` on timeout."""
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class LocalBroker:
+    """Subscribers of this process only."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rooms = {}  # room -> set of Subscription
+
+    def publish(self, room, event, payload):
+        self._dispatch(str(room), (event, payload))
+
+    def _dispatch(self, room, message):
+        with self._lock:
+            subscriptions = list(self._rooms.get(room, ()))
+        for subscription in subscriptions:
+            subscription.deliver(message)
+
+    def subscribe(self, room):
+        subscription = Subscription(self, str(room), asyncio.get_running_loop())
+        with self._lock:
+            self._rooms.setdefault(subscription.room, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._rooms.get(subscription.room)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._rooms[subscription.room]
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(subscriptions) for subscriptions in self._rooms.values())
+
+
+class SQLiteBroker(LocalBroker):
+    """Cross-process fan-out through a shared SQLite file, polled per process."""
+
+    def __init__(self, path=None):
+        super().__init__()
+        self.path = str(path or settings.EVENT_STREAM_SQLITE_PATH)
+        self._local = threading.local()
+        self._poller = None  # (loop, task)
+        self._last_prune = 0.0
+        with self._connection() as db:
+            db.execute(
+                'CREATE TABLE IF NOT EXISTS events ('
+                ' id INTEGER PRIMARY KEY AUTOINCREMENT, room TEXT NOT NULL,'
+                ' message TEXT NOT NULL, created REAL NOT NULL)'
+            )
+
+    def _connection(self):
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            db = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            db.execute('PRAGMA journal_mode=WAL')
+            self._local.db = db
+        return db
+
+    def publish(self, room, event, payload):
+        now = time.time()
+        message = json.dumps([event, payload], cls=DjangoJSONEncoder)
+        with self._connection() as db:
+            db.execute('INSERT INTO events (room, message, created) VALUES (?, ?, ?)', (str(room), message, now))
+            if now - self._last_prune > RETENTION:
+                self._last_prune = now
+                db.execute('DELETE FROM events WHERE created < ?', (now - RETENTION,))
+
+    def _fetch(self, after):
+        db = self._connection()
+        if after is None:
+            return db.execute('SELECT COALESCE(MAX(id), 0) FROM events').fetchone()[0], []
+        rows = db.execute('SELECT id, room, message FROM events WHERE id > ? ORDER BY id', (after,)).fetchall()
+        return (rows[-1][0] if rows else after), rows
+
+    async def _poll(self):
+        last, _ = await asyncio.to_thread(self._fetch, None)
+        while self.subscriber_count():
+            await asyncio.sleep(POLL_INTERVAL)
+            last, rows = await asyncio.to_thread(self._fetch, last)
+            for _, room, message in rows:
+                self._dispatch(room, tuple(json.loads(message)))
+
+    def subscribe(self, room):
+        subscription = super().subscribe(room)
+        loop = subscription.loop
+        if self._poller is None or self._poller[0] is not loop or self._poller[1].done():
+            self._poller = (loop, loop.create_task(self._poll()))
+        return subscription
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(settings.EVENT_STREAM_BACKEND)()
+    return _broker
+
+
+def publish(room, event, payload):
+    get_broker().publish(room, event, payload)
+
+
+def format_event(messages):
+    """One SSE frame for one or more (event, payload) messages; several are
+    sent as one ``eventBatch``, as accounts.realtime does for Socket.IO."""
+    if len(messages) == 1:
+        event, payload = messages[0]
+    else:
+        event = 'eventBatch'
+        payload = {'events': [{'event': name, 'payload': data} for name, data in messages]}
+    return f'event: {event}\ndata: {json.dumps(payload, cls=DjangoJSONEncoder)}\n\n'
+
+
+async def stream(subscription, window=0, heartbeat=15):
+    """SSE body for `subscription`: events arriving within `window` seconds of
+    each other's first are sent as one frame, with a comment line every
+    `heartbeat` idle seconds to keep proxies from closing the connection."""
+    loop = asyncio.get_running_loop()
+    try:
+        yield 'retry: 3000\n\n'
+        while True:
+            try:
+                messages = [await subscription.get(heartbeat)]
+            except asyncio.TimeoutError:
+                yield ': keepalive\n\n'
+                continue
+            deadline = loop.time() + window
+            while window:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    messages.append(await subscription.get(remaining))
+                except asyncio.TimeoutError:
+                    break
+            yield format_event(messages)
+    finally:
+        subscription.close()
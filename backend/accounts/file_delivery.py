@@ -0,0 +1,204 @@
+"""File delivery for PDFs and other `/assets/` files.
+
+Django decides whether a file may be served; the transfer itself is done by
+the backend selected with ``settings.FILE_DELIVERY``:
+
+``x-accel-redirect``
+    nginx serves the file from an ``internal`` location mapped to
+    `MEDIA_ROOT` (``settings.FILE_DELIVERY_ACCEL_PREFIX``), e.g.::
+
+        location /protected-assets/ {
+            internal;
+            alias /srv/studyprohub/frontend/assets/;
+        }
+
+``x-sendfile``
+    Apache (mod_xsendfile) / lighttpd serve the absolute path.
+
+``python`` (default)
+    Django answers itself, with ETag/Last-Modified validators, 304s and
+    single ``Range`` requests (honouring ``If-Range``). The body is a
+    `FileResponse` over the open file descriptor, so servers that provide
+    ``wsgi.file_wrapper`` with sendfile support (gunicorn) stream it
+    zero-copy with ``os.sendfile`` from the requested offset.
+
+In the first two modes the web server handles ranges and conditional
+requests, and the Python worker is released as soon as headers are sent.
+"""
+import mimetypes
+import os
+import re
+from urllib.parse import quote, unquote, urlsplit
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date, url_has_allowed_host_and_scheme
+from django.views.static import was_modified_since
+
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class _RangeFile:
+    """Read-only view of `length` bytes of `fh` starting at its current offset.
+
+    Keeps `fileno()` so wsgi.file_wrapper can sendfile() from the descriptor's
+    offset for exactly Content-Length bytes; `read()` stops at the range end
+    for servers that iterate instead.
+    """
+
+    def __init__(self, fh, length):
+        self._fh = fh
+        self._remaining = length
+        self.name = fh.name
+
+    def read(self, size=-1):
+        if self._remaining <= 0:
+            return b''
+        if size is None or size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._fh.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self._fh.fileno()
+
+    def close(self):
+        self._fh.close()
+
+
+def etag_for(stat):
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def parse_range(header, size):
+    """Return (start, end) inclusive for a single byte range, 'unsatisfiable',
+    or None when the header is absent, malformed or asks for several ranges
+    (the whole file is sent then, as RFC 9110 allows)."""
+    match = _RANGE_RE.match((header or '').replace(' ', ''))
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first:
+        if not last:
+            return None
+        length = int(last)
+        if not length:
+            return 'unsatisfiable'
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        return 'unsatisfiable'
+    return start, end
+
+
+def _matches(header, etag):
+    if header is None:
+        return False
+    tags = [tag.strip() for tag in header.split(',')]
+    return '*' in tags or etag in tags or f'W/{etag}' in tags
+
+
+def asset_name(request, url):
+    """Map a PDF URL that points at our own `/assets/` to its name under
+    MEDIA_ROOT, or None for external links and missing files."""
+    if not url or not url_has_allowed_host_and_scheme(url, allowed_hosts={request.get_host()}):
+        return None
+    return media_name(url)
+
+
+def media_name(url):
+    """Name under MEDIA_ROOT of an existing file whose URL path is below
+    MEDIA_URL, whatever the host; None otherwise."""
+    path = unquote(urlsplit(url or '').path)
+    if not path.startswith(settings.MEDIA_URL):
+        return None
+    name = path[len(settings.MEDIA_URL):]
+    try:
+        full = safe_join(settings.MEDIA_ROOT, name)
+    except SuspiciousFileOperation:
+        return None
+    return name if os.path.isfile(full) else None
+
+
+def serve_file(request, path, content_type=None, offload=True):
+    """Deliver the file at `path` (access must already be checked).
+
+    `offload=False` answers from Python whatever ``FILE_DELIVERY`` says, for
+    files outside MEDIA_ROOT.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        raise Http404('File not found')
+    content_type = content_type or mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    backend = settings.FILE_DELIVERY if offload else 'python'
+    if backend == 'x-accel-redirect':
+        relative = os.path.relpath(path, settings.MEDIA_ROOT).replace(os.sep, '/')
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = settings.FILE_DELIVERY_ACCEL_PREFIX + quote(relative)
+        return response
+    if backend == 'x-sendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = os.path.abspath(path)
+        return response
+    return _serve_python(request, path, stat, content_type)
+
+
+def _serve_python(request, path, stat, content_type):
+    etag = etag_for(stat)
+    last_modified = http_date(stat.st_mtime)
+
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match is not None:
+        not_modified = _matches(if_none_match, etag)
+    else:
+        not_modified = not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), stat.st_mtime)
+    if not_modified:
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        response['Last-Modified'] = last_modified
+        return response
+
+    byte_range = None
+    if request.method in ('GET', 'HEAD'):
+        byte_range = parse_range(request.META.get('HTTP_RANGE'), stat.st_size)
+        if_range = request.META.get('HTTP_IF_RANGE')
+        if byte_range and if_range is not None and if_range not in (etag, last_modified):
+            byte_range = None
+
+    if byte_range == 'unsatisfiable':
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{stat.st_size}'
+        response['Accept-Ranges'] = 'bytes'
+        return response
+
+    fh = open(path, 'rb')
+    if byte_range:
+        start, end = byte_range
+        fh.seek(start)
+        response = FileResponse(_RangeFile(fh, end - start + 1), status=206, content_type=content_type)
+        response['Content-Length'] = end - start + 1
+        response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+    else:
+        response = FileResponse(fh, content_type=content_type)
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = last_modified
+    return response
+
+
+def serve_under(request, root, relative):
+    """Deliver `relative` below `root`; 404 for missing files and directories."""
+    try:
+        path = safe_join(root, relative)
+    except SuspiciousFileOperation:
+        raise Http404('File not found')
+    if not os.path.isfile(path):
+        raise Http404('File not found')
+    return serve_file(request, path)
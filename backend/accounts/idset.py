@@ -0,0 +1,157 @@
+"""Compact compressed sets of integer ids (a small roaring bitmap).
+
+Ids are split into a high part (``id >> 16``) selecting a container and a
+16-bit low part stored in it. Sparse containers are sorted ``array('H')``
+(2 bytes per id); once a container holds more than 4096 ids it switches to
+a fixed 8 KiB bitmap. Serialized sets are a few bytes per id for the
+sizes we keep per user, and membership tests are O(log 4096) at worst.
+"""
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+
+ARRAY_MAX = 4096
+BITMAP_BYTES = 8192
+
+_HEADER = struct.Struct('<I')
+_CONTAINER = struct.Struct('<IBH')  # high bits, kind, cardinality - 1
+_KIND_ARRAY, _KIND_BITMAP = 0, 1
+
+
+def _bitmap_from(values):
+    bits = bytearray(BITMAP_BYTES)
+    for v in values:
+        bits[v >> 3] |= 1 << (v & 7)
+    return bits
+
+
+def _bitmap_values(bits):
+    for byte_index, byte in enumerate(bits):
+        while byte:
+            low = byte & -byte
+            yield (byte_index << 3) | (low.bit_length() - 1)
+            byte ^= low
+
+
+class IdSet:
+    """A set of non-negative integer ids with roaring-style containers."""
+
+    __slots__ = ('_containers', '_sizes')
+
+    def __init__(self, ids=()):
+        self._containers = {}
+        self._sizes = {}
+        self.update(ids)
+
+    def __len__(self):
+        return sum(self._sizes.values())
+
+    def __bool__(self):
+        return bool(self._sizes)
+
+    def __contains__(self, value):
+        container = self._containers.get(value >> 16)
+        if container is None:
+            return False
+        low = value & 0xFFFF
+        if isinstance(container, array):
+            i = bisect_left(container, low)
+            return i < len(container) and container[i] == low
+        return bool(container[low >> 3] & (1 << (low & 7)))
+
+    def __iter__(self):
+        for high in sorted(self._containers):
+            container = self._containers[high]
+            base = high << 16
+            values = container if isinstance(container, array) else _bitmap_values(container)
+            for low in values:
+                yield base | low
+
+    def add(self, value):
+        high, low = value >> 16, value & 0xFFFF
+        container = self._containers.get(high)
+        if container is None:
+            self._containers[high] = array('H', [low])
+            self._sizes[high] = 1
+            return
+        if isinstance(container, array):
+            i = bisect_left(container, low)
+            if i < len(container) and container[i] == low:
+                return
+            container.insert(i, low)
+            self._sizes[high] += 1
+            if self._sizes[high] > ARRAY_MAX:
+                self._containers[high] = _bitmap_from(container)
+            return
+        mask = 1 << (low & 7)
+        if not container[low >> 3] & mask:
+            container[low >> 3] |= mask
+            self._sizes[high] += 1
+
+    def discard(self, value):
+        high, low = value >> 16, value & 0xFFFF
+        container = self._containers.get(high)
+        if container is None:
+            return
+        if isinstance(container, array):
+            i = bisect_left(container, low)
+            if i == len(container) or container[i] != low:
+                return
+            del container[i]
+        else:
+            mask = 1 << (low & 7)
+            if not container[low >> 3] & mask:
+                return
+            container[low >> 3] &= ~mask & 0xFF
+        self._sizes[high] -= 1
+        if not self._sizes[high]:
+            del self._containers[high], self._sizes[high]
+        elif not isinstance(container, array) and self._sizes[high] <= ARRAY_MAX:
+            self._containers[high] = array('H', _bitmap_values(container))
+
+    def update(self, values):
+        for value in values:
+            self.add(value)
+
+    def difference_update(self, values):
+        for value in values:
+            self.discard(value)
+
+    def to_bytes(self):
+        parts = [_HEADER.pack(len(self._containers))]
+        for high in sorted(self._containers):
+            container = self._containers[high]
+            kind = _KIND_ARRAY if isinstance(container, array) else _KIND_BITMAP
+            parts.append(_CONTAINER.pack(high, kind, self._sizes[high] - 1))
+            if kind == _KIND_ARRAY:
+                data = array('H', container)
+                if sys.byteorder == 'big':
+                    data.byteswap()
+                parts.append(data.tobytes())
+            else:
+                parts.append(bytes(container))
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, blob, offset=0):
+        """Decode a set written by `to_bytes`; returns (IdSet, next_offset)."""
+        idset = cls()
+        (count,) = _HEADER.unpack_from(blob, offset)
+        offset += _HEADER.size
+        for _ in range(count):
+            high, kind, size = _CONTAINER.unpack_from(blob, offset)
+            offset += _CONTAINER.size
+            size += 1
+            if kind == _KIND_ARRAY:
+                data = array('H')
+                data.frombytes(bytes(blob[offset:offset + 2 * size]))
+                if sys.byteorder == 'big':
+                    data.byteswap()
+                offset += 2 * size
+            else:
+                data = bytearray(blob[offset:offset + BITMAP_BYTES])
+                offset += BITMAP_BYTES
+            idset._containers[high] = data
+            idset._sizes[high] = size
+        return idset, offset
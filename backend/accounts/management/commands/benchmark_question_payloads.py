@@ -0,0 +1,119 @@
+"""
+Benchmark the test-start serialization path.
+
+Compares the original `get_questions` path (ORDER BY RANDOM(), model
+hydration, `as_dict()` and `JsonResponse` encoding) against the pooled
+sampler plus pre-encoded JSON fragments, for several paper sizes.
+
+Synthetic questions are inserted inside a transaction that is rolled back,
+so the command is safe to run against a development database.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.http import HttpResponse, JsonResponse
+
+from accounts.models import Question
+from accounts import question_pool, question_payloads
+
+BENCH_COMPANY = '__bench__'
+BENCH_DIFFICULTY = 'medium'
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmark pre-encoded question payloads against the ORM + JsonResponse path'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='20,100,500', help='comma separated paper sizes')
+        parser.add_argument('--bank', type=int, default=5000, help='synthetic questions to insert')
+        parser.add_argument('--repeat', type=int, default=50, help='requests timed per measurement')
+
+    def handle(self, *args, **options):
+        sizes = [int(s) for s in options['sizes'].split(',') if s.strip()]
+        bank = max(options['bank'], max(sizes))
+        repeat = options['repeat']
+
+        try:
+            with transaction.atomic():
+                self._seed(bank)
+                for size in sizes:
+                    self._run(size, repeat)
+                raise _Rollback()
+        except _Rollback:
+            pass
+        finally:
+            self._cleanup()
+
+    def _seed(self, bank):
+        Question.objects.bulk_create(
+            [
+                Question(
+                    company=BENCH_COMPANY,
+                    difficulty=BENCH_DIFFICULTY,
+                    question_text=f'Benchmark question {n}: which option is correct?',
+                    option_a='Option A', option_b='Option B',
+                    option_c='Option C', option_d='Option D',
+                    correct_answer='ABCD'[n % 4],
+                    explanation='Synthetic explanation text used for benchmarking.',
+                )
+                for n in range(bank)
+            ],
+            batch_size=500,
+        )
+        self._ids = list(
+            Question.objects.filter(company=BENCH_COMPANY).values_list('id', flat=True)
+        )
+        question_pool.invalidate()
+        # Steady state: every question's fragment has been encoded once
+        question_payloads.get_fragments(self._ids)
+        self.stdout.write(f'Seeded {bank} synthetic questions')
+
+    def _old_path(self, size):
+        questions = Question.objects.filter(
+            company=BENCH_COMPANY,
+            difficulty=BENCH_DIFFICULTY,
+        ).order_by('?')[:size]
+        data = [q.as_dict() for q in questions]
+        return JsonResponse({
+            'ok': True,
+            'questions': data,
+            'count': len(data),
+            'company': BENCH_COMPANY,
+            'difficulty': BENCH_DIFFICULTY,
+        }).content
+
+    def _new_path(self, size):
+        ids = question_pool.sample_ids(BENCH_COMPANY, BENCH_DIFFICULTY, size)
+        fragments = question_payloads.get_fragments(ids)
+        body = question_payloads.build_body(fragments, company=BENCH_COMPANY, difficulty=BENCH_DIFFICULTY)
+        return HttpResponse(body, content_type='application/json').content
+
+    def _time(self, fn, size, repeat):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn(size)
+        return (time.perf_counter() - start) / repeat * 1000
+
+    def _run(self, size, repeat):
+        # Warm both paths (id pool, query plans)
+        self._old_path(size)
+        for _ in range(3):
+            self._new_path(size)
+
+        old_ms = self._time(self._old_path, size, repeat)
+        new_ms = self._time(self._new_path, size, repeat)
+        self.stdout.write(
+            f'{size:>4} questions: orm+JsonResponse {old_ms:8.2f} ms | '
+            f'pool+fragments {new_ms:8.2f} ms | speedup x{old_ms / new_ms:.1f}'
+        )
+
+    def _cleanup(self):
+        # Rolled-back ids may be reused; drop their cached fragments
+        question_pool.invalidate()
+        for question_id in getattr(self, '_ids', []):
+            question_payloads.invalidate(question_id)
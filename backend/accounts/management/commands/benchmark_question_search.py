@@ -0,0 +1,91 @@
+"""
+Benchmark question search latency on a large synthetic bank.
+
+Inserts --rows synthetic questions (indexed by the FTS5 triggers) inside a
+transaction that is rolled back, then times FTS5 queries of different
+selectivity against the icontains scan they replace. SQLite only.
+"""
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from accounts.models import Question
+from accounts import question_search
+
+TOPICS = [
+    'binary', 'search', 'tree', 'graph', 'hash', 'queue', 'stack', 'heap', 'sorting',
+    'recursion', 'dynamic', 'programming', 'database', 'index', 'network', 'protocol',
+    'thread', 'process', 'memory', 'cache', 'latency', 'complexity', 'pointer', 'array',
+]
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmark FTS5 question search against an icontains scan'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        if not question_search.fts_available():
+            raise CommandError('FTS5 search is only available on SQLite')
+        try:
+            with transaction.atomic():
+                self._seed(options['rows'])
+                self._run(options['repeat'])
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+    def _seed(self, rows):
+        rng = random.Random(42)
+        vocabulary = TOPICS + [f'term{n}' for n in range(20000)]
+        companies = [key for key, _ in Question.COMPANY_CHOICES]
+        difficulties = [key for key, _ in Question.DIFFICULTY_CHOICES]
+        started = time.perf_counter()
+        batch = []
+        for n in range(rows):
+            words = rng.choices(vocabulary, k=12)
+            batch.append(Question(
+                company=companies[n % len(companies)],
+                difficulty=difficulties[n % len(difficulties)],
+                question_text=f'Q{n}: ' + ' '.join(words) + '?',
+                option_a='a', option_b='b', option_c='c', option_d='d',
+                correct_answer='A',
+                explanation=' '.join(rng.choices(vocabulary, k=8)),
+            ))
+            if len(batch) == 5000:
+                Question.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            Question.objects.bulk_create(batch)
+        self.stdout.write(f'Seeded and indexed {rows} questions in {time.perf_counter() - started:.1f}s')
+
+    def _time(self, fn, repeat):
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - start) * 1000)
+        return statistics.median(samples)
+
+    def _run(self, repeat):
+        cases = [
+            ('rare term', 'term12345', None),
+            ('two terms', 'binary tree', None),
+            ('prefix', 'recurs', None),
+            ('common term + filter', 'cache', 'google'),
+        ]
+        for label, query, company in cases:
+            fts_ms = self._time(lambda: question_search.search(query, company=company), repeat)
+            scan_ms = self._time(lambda: question_search.search_scan(query, company), 1)
+            self.stdout.write(
+                f'{label:<22} fts5 {fts_ms:8.2f} ms | icontains {scan_ms:9.2f} ms'
+            )
@@ -0,0 +1,29 @@
+"""
+Create or update company profiles from a JSON file.
+
+The file is a list of objects shaped like accounts/data/company_profiles.json:
+{ "slug", "name", "aliases": [...], ...fields used by company-details.html }.
+Existing profiles with the same slug are replaced field by field.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts import company_kb
+
+
+class Command(BaseCommand):
+    help = 'Import company knowledge-base profiles from a JSON file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='JSON file with a list of profiles')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['path'], encoding='utf-8') as fh:
+                entries = company_kb.read_profiles(fh)
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Could not read {options["path"]}: {e}')
+        if not isinstance(entries, list):
+            raise CommandError('Expected a JSON list of profiles')
+
+        count = company_kb.upsert_profiles(entries)
+        self.stdout.write(self.style.SUCCESS(f'Imported {count} company profiles'))
@@ -0,0 +1,57 @@
+"""
+Stream a question bank from JSONL or CSV files into the database.
+
+Each file is read lazily in chunks; every chunk is upserted with one
+bulk statement inside its own transaction, matching existing rows on
+(company, difficulty, question_text) so question ids survive re-imports.
+
+Expected fields per row: company, difficulty, question_text, option_a,
+option_b, option_c, option_d, correct_answer, explanation (optional).
+"""
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts import question_import
+
+
+class Command(BaseCommand):
+    help = 'Upsert questions from JSONL/CSV files in batched transactions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help='.jsonl or .csv files')
+        parser.add_argument('--chunk-size', type=int, default=500)
+        parser.add_argument('--format', choices=['jsonl', 'csv'], help='override detection by extension')
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        total_written = total_skipped = 0
+        started = time.perf_counter()
+
+        try:
+            for raw_path in options['paths']:
+                path = Path(raw_path)
+                fmt = options['format'] or ('csv' if path.suffix.lower() == '.csv' else 'jsonl')
+                reader = question_import.read_csv if fmt == 'csv' else question_import.read_jsonl
+                if not path.exists():
+                    raise CommandError(f'File not found: {path}')
+
+                with path.open(newline='', encoding='utf-8') as fh:
+                    for chunk in question_import.chunked(reader(fh), chunk_size):
+                        written, skipped = question_import.upsert_chunk(chunk)
+                        total_written += written
+                        total_skipped += skipped
+                        elapsed = max(time.perf_counter() - started, 1e-9)
+                        self.stdout.write(
+                            f'{path.name}: {total_written} rows upserted '
+                            f'({total_written / elapsed:,.0f} rows/s)'
+                        )
+        finally:
+            question_import.finish_import()
+
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {total_written} questions in {elapsed:.2f}s '
+            f'({total_written / elapsed:,.0f} rows/s), skipped {total_skipped} invalid rows'
+        ))
@@ -0,0 +1,29 @@
+"""
+Extract page-level text of the PDF library into the full-text index used
+by /api/pdfs/search/ (see accounts.pdf_search).
+
+Incremental by content hash: PDFs whose file hash matches the indexed one
+are skipped, and changed files are extracted in a pool of --workers
+processes. Needs PyMuPDF or pypdf for text extraction.
+"""
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts import pdf_search
+
+
+class Command(BaseCommand):
+    help = 'Index the text of every local PDF page for /api/pdfs/search/'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+        parser.add_argument('--force', action='store_true', help='re-extract every PDF')
+
+    def handle(self, *args, **options):
+        if not pdf_search.EXTRACTION_AVAILABLE:
+            raise CommandError('Install PyMuPDF or pypdf to extract PDF text')
+        indexed, unchanged, removed = pdf_search.index(workers=options['workers'], force=options['force'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Indexed {indexed} PDFs ({unchanged} unchanged, {removed} removed)'
+        ))
@@ -0,0 +1,37 @@
+"""
+Pre-render context-free pages into a static directory for the web server.
+
+Walks the URL conf (see accounts.prerender), renders every page that does
+not depend on the visitor, and writes it under --output (default
+settings.PRERENDER_ROOT) with prerender-manifest.json. Re-runs only render
+pages whose templates or data changed; use --force for a full rebuild.
+
+Each manifest entry has a `mode`. "static" pages can be served to every
+GET; "anonymous" pages only to requests without a session cookie or query
+string. Serving the whole tree under the stricter rule is safe, e.g. with
+nginx:
+
+    set $prerendered /prerendered;
+    if ($cookie_sessionid != "") { set $prerendered /nonexistent; }
+    if ($args != "") { set $prerendered /nonexistent; }
+    try_files $prerendered$uri $prerendered${uri}index.html @django;
+"""
+from django.core.management.base import BaseCommand
+
+from accounts import prerender
+
+
+class Command(BaseCommand):
+    help = 'Render context-free pages to static files with a manifest'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help='output directory (default: settings.PRERENDER_ROOT)')
+        parser.add_argument('--force', action='store_true', help='re-render every page')
+
+    def handle(self, *args, **options):
+        log = self.stdout.write if options['verbosity'] > 1 else None
+        result = prerender.build(options['output'], force=options['force'], log=log)
+        self.stdout.write(self.style.SUCCESS(
+            f'Pre-rendered {result.rendered} pages ({result.unchanged} unchanged, '
+            f'{result.skipped} skipped as per-request, {result.removed} removed)'
+        ))
@@ -0,0 +1,25 @@
+"""
+Rebuild AbilityEstimate rows by replaying stored test results.
+
+New results update estimates incrementally (see accounts.ability); this is
+for backfilling history recorded before adaptive tests existed, or after
+tuning the rating constants. Only server-scored (verified) results count;
+client-reported scores are kept for history but never rate a user. Results
+are replayed oldest first in a single pass and estimates are written in bulk.
+"""
+from django.core.management.base import BaseCommand
+
+from accounts import ability
+
+
+class Command(BaseCommand):
+    help = 'Recompute adaptive-difficulty ability estimates from TestResult history'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        replayed, estimates = ability.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Replayed {replayed} results into {estimates} ability estimates'
+        ))
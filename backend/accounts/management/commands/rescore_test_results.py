@@ -0,0 +1,83 @@
+"""
+Re-score stored test results against the current answer key.
+
+Useful after an answer-key fix: every TestResult that kept its `paper_id`
+and packed `answers` is rebuilt and scored in bulk (see accounts.scoring).
+Results whose paper can no longer be rebuilt are left untouched.
+
+The bulk update skips the model signals, so afterwards each affected user
+gets what a save would have done: a profile version bump (a
+``profileChanged`` event and a refreshed profile aggregate) and rebuilt
+ability estimates.
+"""
+from functools import partial
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from accounts.models import TestResult
+from accounts import ability, profile_cache, profile_events, scoring
+
+
+class Command(BaseCommand):
+    help = 'Re-score TestResult rows that carry a paper_id and packed answers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--dry-run', action='store_true', help='report changes without saving')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        dry_run = options['dry_run']
+
+        qs = (
+            TestResult.objects.exclude(paper_id='').exclude(answers='')
+            .only('id', 'user_id', 'paper_id', 'answers', 'total_questions', 'correct_answers', 'score')
+            .order_by('id')
+        )
+
+        seen = changed = skipped = 0
+        users = set()
+        batch = []
+        for result in qs.iterator(chunk_size=batch_size):
+            batch.append(result)
+            if len(batch) >= batch_size:
+                c, k = self._rescore(batch, dry_run, users)
+                seen, changed, skipped = seen + len(batch), changed + c, skipped + k
+                batch = []
+        if batch:
+            c, k = self._rescore(batch, dry_run, users)
+            seen, changed, skipped = seen + len(batch), changed + c, skipped + k
+        if users:
+            self._refresh_users(sorted(users), batch_size)
+
+        verb = 'would change' if dry_run else 'changed'
+        self.stdout.write(self.style.SUCCESS(
+            f'Rescored {seen} results: {changed} {verb}, {skipped} skipped (paper expired)'
+        ))
+
+    def _rescore(self, batch, dry_run, users):
+        scores = scoring.score_bulk([(r.paper_id, r.answers) for r in batch])
+        updated = []
+        skipped = 0
+        for result, score in zip(batch, scores):
+            if not isinstance(score, scoring.Score):
+                skipped += 1
+                continue
+            new = (score.total, score.correct, score.percentage)
+            if new != (result.total_questions, result.correct_answers, result.score):
+                result.total_questions, result.correct_answers, result.score = new
+                updated.append(result)
+        if updated and not dry_run:
+            TestResult.objects.bulk_update(updated, ['total_questions', 'correct_answers', 'score'])
+            users.update(result.user_id for result in updated)
+        return len(updated), skipped
+
+    def _refresh_users(self, user_ids, batch_size):
+        for start in range(0, len(user_ids), batch_size):
+            chunk = user_ids[start:start + batch_size]
+            with transaction.atomic():
+                for user_id in chunk:
+                    event = profile_events.publish(user_id, profile_events.PROFILE_CHANGED)
+                    transaction.on_commit(partial(profile_cache.apply, user_id, TestResult, event['version']))
+                ability.rebuild(user_ids=chunk, batch_size=batch_size)
@@ -1,13 +1,13 @@
 """
 Django management command to seed sample questions for the interview test system.
-Creates 20 questions for each (company, difficulty) combination.
+Upserts 20 questions for each (company, difficulty) combination.
 Companies: Google, OpenAI, Uber, Microsoft
 Difficulties: Easy, Medium, Hard
 Total: 240 questions (4 companies × 3 difficulties × 20 questions)
 """
 
 from django.core.management.base import BaseCommand
-from accounts.models import Question
+from accounts import question_import
 
 QUESTIONS_DATA = {
     ('google', 'easy'): [
@@ -1343,34 +1343,22 @@ class Command(BaseCommand):
     help = 'Seed sample questions for interview tests'
 
     def handle(self, *args, **options):
-        # Clear existing questions if needed
-        Question.objects.all().delete()
-        
-        total_created = 0
-        
-        for (company, difficulty), questions_list in QUESTIONS_DATA.items():
-            for idx, q_data in enumerate(questions_list, 1):
-                question = Question.objects.create(
-                    company=company,
-                    difficulty=difficulty,
-                    question_text=q_data['question_text'],
-                    option_a=q_data['option_a'],
-                    option_b=q_data['option_b'],
-                    option_c=q_data['option_c'],
-                    option_d=q_data['option_d'],
-                    correct_answer=q_data['correct_answer'],
-                    explanation=q_data['explanation']
-                )
-                total_created += 1
-                self.stdout.write(
-                    self.style.SUCCESS(
-                        f'✓ Created: {company.upper()} ({difficulty.upper()}) - Q{idx}'
-                    )
-                )
-        
+        # Upsert instead of delete + recreate so question ids (and issued papers) survive
+        rows = [
+            dict(q_data, company=company, difficulty=difficulty)
+            for (company, difficulty), questions_list in QUESTIONS_DATA.items()
+            for q_data in questions_list
+        ]
+        try:
+            total_created, skipped = question_import.upsert_chunk(rows)
+        finally:
+            question_import.finish_import()
+
         self.stdout.write(
-            self.style.SUCCESS(f'\n✅ Successfully created {total_created} questions!')
+            self.style.SUCCESS(f'\n✅ Successfully seeded {total_created} questions!')
         )
+        if skipped:
+            self.stdout.write(self.style.WARNING(f'Skipped {skipped} invalid rows'))
         self.stdout.write(self.style.SUCCESS('Questions available for:'))
         self.stdout.write(self.style.SUCCESS('  - Google (Easy, Medium, Hard)'))
         self.stdout.write(self.style.SUCCESS('  - OpenAI (Easy, Medium, Hard)'))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0009_useractivity"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="testresult",
+            name="paper_id",
+            field=models.CharField(blank=True, max_length=32),
+        ),
+    ]
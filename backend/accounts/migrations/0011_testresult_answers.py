@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0010_testresult_paper_id"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="testresult",
+            name="answers",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+    ]
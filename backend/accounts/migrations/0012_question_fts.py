@@ -0,0 +1,68 @@
+# SQLite FTS5 index over accounts_question (question_text, explanation).
+#
+# External-content table kept in sync by triggers, so bulk_create/upserts
+# (which skip model signals) are indexed too. Other database backends skip
+# this migration and fall back to icontains search (see accounts.question_search).
+
+from django.db import migrations
+
+
+FORWARD_SQL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS accounts_question_fts USING fts5(
+        question_text,
+        explanation,
+        content='accounts_question',
+        content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS accounts_question_fts_ai AFTER INSERT ON accounts_question BEGIN
+        INSERT INTO accounts_question_fts(rowid, question_text, explanation)
+        VALUES (new.id, new.question_text, new.explanation);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS accounts_question_fts_ad AFTER DELETE ON accounts_question BEGIN
+        INSERT INTO accounts_question_fts(accounts_question_fts, rowid, question_text, explanation)
+        VALUES ('delete', old.id, old.question_text, old.explanation);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS accounts_question_fts_au AFTER UPDATE ON accounts_question BEGIN
+        INSERT INTO accounts_question_fts(accounts_question_fts, rowid, question_text, explanation)
+        VALUES ('delete', old.id, old.question_text, old.explanation);
+        INSERT INTO accounts_question_fts(rowid, question_text, explanation)
+        VALUES (new.id, new.question_text, new.explanation);
+    END
+    """,
+    "INSERT INTO accounts_question_fts(accounts_question_fts) VALUES ('rebuild')",
+]
+
+BACKWARD_SQL = [
+    "DROP TRIGGER IF EXISTS accounts_question_fts_au",
+    "DROP TRIGGER IF EXISTS accounts_question_fts_ad",
+    "DROP TRIGGER IF EXISTS accounts_question_fts_ai",
+    "DROP TABLE IF EXISTS accounts_question_fts",
+]
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != "sqlite":
+            return
+        for sql in statements:
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0011_testresult_answers"),
+    ]
+
+    operations = [
+        migrations.RunPython(_run(FORWARD_SQL), _run(BACKWARD_SQL)),
+    ]
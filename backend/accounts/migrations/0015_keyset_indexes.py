@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0014_abilityestimate"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="attemptedmock",
+            index=models.Index(fields=["user", "-attempt_date", "-id"], name="accounts_at_user_id_d94cb9_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="pdf",
+            index=models.Index(fields=["-created_at", "-id"], name="accounts_pd_created_24469f_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="purchaseditem",
+            index=models.Index(fields=["user", "-purchased_at", "-id"], name="accounts_pu_user_id_9c5a39_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="testresult",
+            index=models.Index(fields=["user", "-attempt_date", "-id"], name="accounts_te_user_id_d49bc6_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="video",
+            index=models.Index(fields=["-created_at", "-id"], name="accounts_vi_created_3352d5_idx"),
+        ),
+    ]
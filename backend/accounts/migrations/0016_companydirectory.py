@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:53
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+from django.utils.text import slugify
+
+
+def build_directory(apps, schema_editor):
+    PDF = apps.get_model("accounts", "PDF")
+    CompanyDirectory = apps.get_model("accounts", "CompanyDirectory")
+    rows = (
+        PDF.objects.exclude(company="")
+        .values("company")
+        .annotate(count=Count("id"), latest=Max("created_at"))
+    )
+    CompanyDirectory.objects.bulk_create([
+        CompanyDirectory(
+            company=row["company"],
+            slug=slugify(row["company"]),
+            name=row["company"].title() if row["company"].islower() else row["company"],
+            pdf_count=row["count"],
+            latest_upload=row["latest"],
+        )
+        for row in rows
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0015_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CompanyDirectory",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("company", models.CharField(max_length=100, unique=True)),
+                ("slug", models.SlugField(max_length=100)),
+                ("name", models.CharField(max_length=100)),
+                ("pdf_count", models.IntegerField(default=0)),
+                ("latest_upload", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name_plural": "Company directory",
+                "ordering": ["company"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="pdf",
+            index=models.Index(fields=["company", "-created_at"], name="accounts_pd_company_13042d_idx"),
+        ),
+        migrations.RunPython(build_directory, migrations.RunPython.noop),
+    ]
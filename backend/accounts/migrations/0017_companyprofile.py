@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:54
+
+import json
+from pathlib import Path
+
+from django.db import migrations, models
+
+# Seed data moved out of the former COMPANY_DATABASE dict in accounts/views.py
+SEED_FILE = Path(__file__).resolve().parent.parent / "data" / "company_profiles.json"
+
+
+def load_profiles(apps, schema_editor):
+    CompanyProfile = apps.get_model("accounts", "CompanyProfile")
+    with open(SEED_FILE, encoding="utf-8") as fh:
+        entries = json.load(fh)
+    profiles = []
+    for entry in entries:
+        entry = dict(entry)
+        slug, name, aliases = entry.pop("slug"), entry.pop("name"), entry.pop("aliases", [])
+        profiles.append(CompanyProfile(slug=slug, name=name, aliases=aliases, profile=entry))
+    CompanyProfile.objects.bulk_create(profiles)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0016_companydirectory"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CompanyProfile",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("slug", models.SlugField(max_length=100, unique=True)),
+                ("name", models.CharField(max_length=255)),
+                ("aliases", models.JSONField(blank=True, default=list)),
+                ("profile", models.JSONField(blank=True, default=dict)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "ordering": ["slug"],
+            },
+        ),
+        migrations.RunPython(load_profiles, migrations.RunPython.noop),
+    ]
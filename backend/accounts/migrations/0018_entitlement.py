@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:05
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def copy_grants(apps, schema_editor):
+    UserProfile = apps.get_model("accounts", "UserProfile")
+    Entitlement = apps.get_model("accounts", "Entitlement")
+    grants = []
+    for profile in UserProfile.objects.all():
+        if profile.has_paid:
+            grants.append(Entitlement(user=profile, scope="all", company=""))
+        for company, paid in (profile.paid_companies or {}).items():
+            if paid and company:
+                grants.append(Entitlement(user=profile, scope="company", company=company[:100]))
+    Entitlement.objects.bulk_create(grants, ignore_conflicts=True)
+
+
+def restore_grants(apps, schema_editor):
+    UserProfile = apps.get_model("accounts", "UserProfile")
+    Entitlement = apps.get_model("accounts", "Entitlement")
+    for profile in UserProfile.objects.filter(entitlements__isnull=False).distinct():
+        grants = Entitlement.objects.filter(user=profile)
+        profile.has_paid = grants.filter(scope="all").exists()
+        profile.paid_companies = {g.company: True for g in grants.filter(scope="company")}
+        profile.save(update_fields=["has_paid", "paid_companies"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0017_companyprofile"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Entitlement",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("scope", models.CharField(choices=[("all", "All content"), ("company", "Company PDFs")], max_length=20)),
+                ("company", models.CharField(blank=True, max_length=100)),
+                ("granted_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("expires_at", models.DateTimeField(blank=True, null=True)),
+                ("user", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="entitlements", to="accounts.userprofile")),
+            ],
+            options={
+                "indexes": [models.Index(fields=["scope", "company"], name="accounts_en_scope_4ab7a0_idx")],
+                "constraints": [models.UniqueConstraint(fields=("user", "scope", "company"), name="entitlement_unique")],
+            },
+        ),
+        migrations.RunPython(copy_grants, restore_grants),
+        migrations.RemoveField(
+            model_name="userprofile",
+            name="has_paid",
+        ),
+        migrations.RemoveField(
+            model_name="userprofile",
+            name="paid_companies",
+        ),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# SQLite FTS5 index over accounts_pdfpage.text, kept in sync by triggers like
+# accounts_question_fts (0012). Other backends skip it (see accounts.pdf_search).
+FORWARD_SQL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS accounts_pdfpage_fts USING fts5(
+        text,
+        content='accounts_pdfpage',
+        content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS accounts_pdfpage_fts_ai AFTER INSERT ON accounts_pdfpage BEGIN
+        INSERT INTO accounts_pdfpage_fts(rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS accounts_pdfpage_fts_ad AFTER DELETE ON accounts_pdfpage BEGIN
+        INSERT INTO accounts_pdfpage_fts(accounts_pdfpage_fts, rowid, text) VALUES ('delete', old.id, old.text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS accounts_pdfpage_fts_au AFTER UPDATE ON accounts_pdfpage BEGIN
+        INSERT INTO accounts_pdfpage_fts(accounts_pdfpage_fts, rowid, text) VALUES ('delete', old.id, old.text);
+        INSERT INTO accounts_pdfpage_fts(rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+]
+
+BACKWARD_SQL = [
+    "DROP TRIGGER IF EXISTS accounts_pdfpage_fts_au",
+    "DROP TRIGGER IF EXISTS accounts_pdfpage_fts_ad",
+    "DROP TRIGGER IF EXISTS accounts_pdfpage_fts_ai",
+    "DROP TABLE IF EXISTS accounts_pdfpage_fts",
+]
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != "sqlite":
+            return
+        for sql in statements:
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0018_entitlement"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PdfText",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("sha256", models.CharField(max_length=64)),
+                ("pages", models.IntegerField(default=0)),
+                ("indexed_at", models.DateTimeField(auto_now=True)),
+                ("pdf", models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name="text_index", to="accounts.pdf")),
+            ],
+        ),
+        migrations.CreateModel(
+            name="PdfPage",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("number", models.IntegerField()),
+                ("text", models.TextField()),
+                ("pdf", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="text_pages", to="accounts.pdf")),
+            ],
+            options={
+                "constraints": [models.UniqueConstraint(fields=("pdf", "number"), name="pdfpage_unique")],
+            },
+        ),
+        migrations.RunPython(_run(FORWARD_SQL), _run(BACKWARD_SQL)),
+    ]
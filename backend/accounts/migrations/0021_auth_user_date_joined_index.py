@@ -0,0 +1,28 @@
+from django.db import migrations, models
+
+
+# Keyset index for the newest-first user list (views.view_all_users pages on
+# (date_joined, id)). auth_user belongs to django.contrib.auth, so the index is
+# added through the schema editor here rather than in a model Meta.
+INDEX = models.Index(fields=["date_joined", "id"], name="accounts_auth_user_joined_idx")
+
+
+def add_index(apps, schema_editor):
+    schema_editor.add_index(apps.get_model("auth", "User"), INDEX)
+
+
+def remove_index(apps, schema_editor):
+    schema_editor.remove_index(apps.get_model("auth", "User"), INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0020_profile_version"),
+        # After the last auth migration: SQLite table remakes drop indexes they don't know about
+        ("auth", "0012_alter_user_first_name_max_length"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_index, remove_index),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:00
+
+from django.db import migrations, models
+
+
+def mark_scored_results(apps, schema_editor):
+    # Only server-scored submissions were ever stored with a paper_id
+    TestResult = apps.get_model("accounts", "TestResult")
+    TestResult.objects.exclude(paper_id="").update(verified=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0021_auth_user_date_joined_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="testresult",
+            name="verified",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(mark_scored_results, migrations.RunPython.noop),
+    ]
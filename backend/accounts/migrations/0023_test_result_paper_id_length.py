@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0022_test_result_verified"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="testresult",
+            name="paper_id",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+    ]
@@ -19,10 +19,99 @@ class PDF(models.Model):
     company = models.CharField(max_length=100, blank=True)
     created_at = models.DateTimeField(default=timezone.now)
 
+    class Meta:
+        # Keyset pagination order (see accounts.pagination)
+        indexes = [
+            models.Index(fields=['-created_at', '-id']),
+            models.Index(fields=['company', '-created_at']),
+        ]
+
     def __str__(self):
         return f"{self.title} ({self.company})"
 
 
+class PdfText(models.Model):
+    """Content version of a PDF whose pages are in the search index.
+
+    `sha256` is the file hash the `PdfPage` rows were extracted from; see
+    `accounts.pdf_search`.
+    """
+    pdf = models.OneToOneField(PDF, on_delete=models.CASCADE, related_name='text_index')
+    sha256 = models.CharField(max_length=64)
+    pages = models.IntegerField(default=0)
+    indexed_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.pdf} @ {self.sha256[:12]}"
+
+
+class PdfPage(models.Model):
+    """Extracted text of one PDF page (mirrored into accounts_pdfpage_fts)."""
+    pdf = models.ForeignKey(PDF, on_delete=models.CASCADE, related_name='text_pages')
+    number = models.IntegerField()  # 1-based
+    text = models.TextField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['pdf', 'number'], name='pdfpage_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.pdf} p.{self.number}"
+
+
+class CompanyDirectory(models.Model):
+    """One row per company that has PDFs, maintained on PDF save/delete.
+
+    Lets pages list companies without scanning the PDF table; see
+    `accounts.company_directory`.
+    """
+    company = models.CharField(max_length=100, unique=True)  # as stored on PDF.company
+    slug = models.SlugField(max_length=100)
+    name = models.CharField(max_length=100)
+    pdf_count = models.IntegerField(default=0)
+    latest_upload = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['company']
+        verbose_name_plural = 'Company directory'
+
+    def __str__(self):
+        return f"{self.name} ({self.pdf_count} PDFs)"
+
+    def as_dict(self):
+        return {
+            'slug': self.slug,
+            'company': self.company,
+            'name': self.name,
+            'pdfCount': self.pdf_count,
+            'latestUpload': self.latest_upload.isoformat() if self.latest_upload else None,
+        }
+
+
+class CompanyProfile(models.Model):
+    """Interview-preparation profile shown on the company details page.
+
+    `profile` holds the page fields (tagline, description, hiring_roles,
+    interview_process, ...) as used by `company-details.html`. Lookups by
+    slug, name or alias go through `accounts.company_kb`.
+    """
+    slug = models.SlugField(max_length=100, unique=True)
+    name = models.CharField(max_length=255)
+    aliases = models.JSONField(default=list, blank=True)
+    profile = models.JSONField(default=dict, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['slug']
+
+    def __str__(self):
+        return self.name
+
+    def as_dict(self):
+        return {**self.profile, 'slug': self.slug, 'name': self.name}
+
+
 class UserProfile(models.Model):
     phone = models.CharField(max_length=20, unique=True, null=True, blank=True)
     auth_user = models.OneToOneField(
@@ -33,14 +122,42 @@ class UserProfile(models.Model):
         related_name='profile'
     )
     created_at = models.DateTimeField(default=timezone.now)
-    has_paid = models.BooleanField(default=False)
-    paid_companies = models.JSONField(default=dict, blank=True)
     test_results = models.JSONField(default=list, blank=True)
 
     def __str__(self):
         return self.phone or f"UserProfile {self.id}"
 
 
+class Entitlement(models.Model):
+    """One access grant: everything ('all', formerly `has_paid`) or one
+    company's PDFs ('company', formerly a `paid_companies` key).
+
+    Read through `accounts.entitlements`, which caches each user's grants.
+    """
+    SCOPE_ALL = 'all'
+    SCOPE_COMPANY = 'company'
+    SCOPE_CHOICES = [
+        (SCOPE_ALL, 'All content'),
+        (SCOPE_COMPANY, 'Company PDFs'),
+    ]
+
+    user = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='entitlements')
+    scope = models.CharField(max_length=20, choices=SCOPE_CHOICES)
+    company = models.CharField(max_length=100, blank=True)  # '' for SCOPE_ALL
+    granted_at = models.DateTimeField(default=timezone.now)
+    expires_at = models.DateTimeField(null=True, blank=True)  # None: never
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'scope', 'company'], name='entitlement_unique'),
+        ]
+        # "Who bought company X"
+        indexes = [models.Index(fields=['scope', 'company'])]
+
+    def __str__(self):
+        return f"{self.user} - {self.scope}:{self.company}"
+
+
 class OTP(models.Model):
     phone = models.CharField(max_length=20)
     code = models.CharField(max_length=6)
@@ -59,6 +176,9 @@ class Video(models.Model):
     video_id = models.CharField(max_length=64, unique=True)
     created_at = models.DateTimeField(default=timezone.now)
 
+    class Meta:
+        indexes = [models.Index(fields=['-created_at', '-id'])]
+
     def thumbnail_url(self):
         return f"https://img.youtube.com/vi/{self.video_id}/hqdefault.jpg"
 
@@ -118,6 +238,7 @@ class PurchasedItem(models.Model):
 
     class Meta:
         ordering = ['-purchased_at']
+        indexes = [models.Index(fields=['user', '-purchased_at', '-id'])]
 
     def __str__(self):
         return f"{self.title} - {self.user.username} ({self.purchased_at.date()})"
@@ -125,7 +246,7 @@ class PurchasedItem(models.Model):
     def as_dict(self):
         return {
             'id': self.id,
-            'itemId': self.item.id if self.item else None,
+            'itemId': self.item_id,
             'itemType': self.item_type,
             'title': self.title,
             'amountPaid': float(self.amount_paid) if self.amount_paid else 0,
@@ -140,15 +261,32 @@ class AttemptedMock(models.Model):
     score = models.IntegerField()
     attempt_date = models.DateTimeField(default=timezone.now)
 
+    class Meta:
+        indexes = [models.Index(fields=['user', '-attempt_date', '-id'])]
+
     def as_dict(self):
         return {
             'id': self.id,
-            'mockId': self.mock.id,
+            'mockId': self.mock_id,
             'score': self.score,
             'attemptDate': self.attempt_date.isoformat(),
         }
 
 
+class ProfileVersion(models.Model):
+    """Counter moved by every change to a user's purchases, mock attempts or
+    test results.
+
+    Realtime profile events carry it so clients can apply deltas in order and
+    refetch the profile when they see a gap (see accounts.profile_events).
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile_version')
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user_id} v{self.version}"
+
+
 class UserActivity(models.Model):
     """Track all user activities - logins, purchases, quiz attempts, etc."""
     
@@ -202,10 +340,14 @@ class TestResult(models.Model):
     correct_answers = models.IntegerField()
     score = models.IntegerField()  # Percentage or raw score
     time_taken = models.CharField(max_length=20, blank=True)  # e.g., "15:30"
+    paper_id = models.CharField(max_length=255, blank=True)  # see accounts.papers; grows with the selection
+    answers = models.CharField(max_length=255, blank=True)  # packed, e.g. "AB-D" (see accounts.scoring)
+    verified = models.BooleanField(default=False)  # scored server-side; False means client-reported numbers
     attempt_date = models.DateTimeField(default=timezone.now)
     
     class Meta:
         ordering = ['-attempt_date']
+        indexes = [models.Index(fields=['user', '-attempt_date', '-id'])]
 
     def __str__(self):
         return f"{self.test_name} - {self.user.username} ({self.attempt_date.date()})"
@@ -220,9 +362,46 @@ class TestResult(models.Model):
             'correctAnswers': self.correct_answers,
             'score': self.score,
             'timeTaken': self.time_taken,
+            'paperId': self.paper_id,
+            'verified': self.verified,
             'attemptDate': self.attempt_date.isoformat(),
         }
 
+
+class QuestionHistory(models.Model):
+    """Questions already served to a user, as compressed id sets.
+
+    The encoding lives in `accounts.question_history`; one row per user so
+    the test-start path reads it with a single primary-key lookup.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='question_history')
+    data = models.BinaryField(default=bytes, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Question history - {self.user.username}"
+
+
+class AbilityEstimate(models.Model):
+    """Running per-company ability of a user, updated on each saved result.
+
+    `rating` is on the same scale as the difficulty levels in
+    `accounts.ability`; adaptive tests read this single row instead of the
+    user's full `TestResult` history.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='ability_estimates')
+    company = models.CharField(max_length=50)
+    rating = models.FloatField(default=0.0)
+    attempts = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['user', 'company']
+
+    def __str__(self):
+        return f"{self.user.username} - {self.company}: {self.rating:.2f}"
+
+
 class Question(models.Model):
     """Questions organized by company and difficulty level."""
     
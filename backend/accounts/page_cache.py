@@ -0,0 +1,194 @@
+"""Rendered-page cache for the `dynamic_html` catch-all route.
+
+Most pages served by `dynamic_html` (``company-pdfs/pdf-*.html``,
+``tests/*``...) have no per-user content, yet each hit ran the template
+loader's filesystem search and a full render. Here the rendered HTML is
+kept per process, keyed on the template path and the mtimes of the
+template and every template it statically extends or includes, so editing
+any of those files is picked up on the next request (the engine's cached
+loaders are reset when that happens).
+
+A template is rendered on every request, never cached, if it or one of its
+dependencies refers to per-request context (``user``, ``request``,
+``perms``, ``messages``, ``csrf_token``...) or pulls in a template whose
+name is not a string literal. The check is a conservative scan of the
+template source, done once per template version.
+
+The one exception is login state: ``{% if %}`` conditions on
+``request.session.user_id``, ``request.session.phone`` or
+``user.is_authenticated`` (the site header's Login/Logout link) only make
+the page vary by `login_state`, and one copy is cached per state, as
+`accounts.company_kb` does for its pages.
+
+Paths that do not resolve to a template are remembered for
+`NEGATIVE_TTL` seconds, so repeated 404 probes skip the loader entirely.
+"""
+import os
+import re
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import Http404, HttpResponse
+from django.template import TemplateDoesNotExist
+from django.template.autoreload import reset_loaders
+from django.template.loader import get_template
+from django.template.loaders import cached
+
+NEGATIVE_TTL = 300
+MAX_PAGES = 512
+MAX_MISSING = 4096
+
+_REQUEST_CONTEXT = ('user', 'request', 'perms', 'messages', 'csrf_token', 'debug', 'sql_queries')
+_TAG_RE = re.compile(r'\{[{%].*?[}%]\}', re.S)
+_REQUEST_CONTEXT_RE = re.compile(r'\b(?:' + '|'.join(_REQUEST_CONTEXT) + r')\b')
+_DEPENDENCY_RE = re.compile(r'\{%\s*(?:extends|include)\s+(\S+)')
+_LITERAL_RE = re.compile(r'^(["\'])(.+)\1$')
+_CONDITION_RE = re.compile(r'^\{%\s*(?:el)?if\b')
+_LOGIN_STATE_RE = re.compile(r'\b(?:request\.session\.(?:user_id|phone)|user\.is_authenticated)\b')
+
+# html: {login state (None unless varies_by_login): html}, or None for a per-request page
+_Page = namedtuple('_Page', ['files', 'signature', 'varies_by_login', 'html'])
+
+_lock = threading.Lock()
+_pages = {}
+_missing = {}
+_recorded = ContextVar('accounts.page_cache.recorded', default=None)
+
+
+class RecordingLoader(cached.Loader):
+    """The engine's cached loader (see TEMPLATES in settings), which also
+    reports each template it hands out to an active `recording()` block."""
+
+    def get_template(self, template_name, skip=None):
+        template = super().get_template(template_name, skip)
+        used = _recorded.get()
+        if used is not None:
+            used.append(template)
+        return template
+
+
+@contextmanager
+def recording():
+    """Collect the templates loaded in this thread or task inside the block,
+    including those pulled in by ``{% extends %}`` and ``{% include %}``."""
+    used = []
+    token = _recorded.set(used)
+    try:
+        yield used
+    finally:
+        _recorded.reset(token)
+
+
+def _signature(files):
+    try:
+        return tuple(os.stat(name).st_mtime_ns for name in files)
+    except OSError:
+        return None
+
+
+def request_context_names(source):
+    """Per-request context variables referenced by template tags in `source`."""
+    return {name for tag in _TAG_RE.findall(source) for name in _REQUEST_CONTEXT_RE.findall(tag)}
+
+
+def login_state(request):
+    """The login flags a cached page may branch on (see `_LOGIN_STATE_RE`)."""
+    session = getattr(request, 'session', {})
+    user = getattr(request, 'user', None)
+    return (
+        bool(session.get('user_id')),
+        bool(session.get('phone')),
+        bool(user is not None and user.is_authenticated),
+    )
+
+
+def _scan(template):
+    """Return (files, per_request, varies_by_login) for a loaded template
+    and its dependencies."""
+    files = []
+    per_request = varies_by_login = False
+    pending = [template]
+    seen = set()
+    while pending:
+        current = pending.pop()
+        origin = current.origin.name
+        if origin in seen:
+            continue
+        seen.add(origin)
+        files.append(origin)
+        source = current.template.source
+        for tag in _TAG_RE.findall(source):
+            if _CONDITION_RE.match(tag):
+                condition = _LOGIN_STATE_RE.sub('', tag)
+                varies_by_login = varies_by_login or condition != tag
+                tag = condition
+            if _REQUEST_CONTEXT_RE.search(tag):
+                per_request = True
+        for argument in _DEPENDENCY_RE.findall(source):
+            literal = _LITERAL_RE.match(argument)
+            if not literal:
+                per_request = True
+                continue
+            try:
+                pending.append(get_template(literal.group(2)))
+            except TemplateDoesNotExist:
+                per_request = True
+    return files, per_request, varies_by_login
+
+
+def _remember_missing(path):
+    with _lock:
+        if len(_missing) >= MAX_MISSING:
+            _missing.clear()
+        _missing[path] = time.monotonic() + NEGATIVE_TTL
+
+
+def render_page(request, path):
+    """Return an HttpResponse for template `path`; raises Http404 if missing."""
+    expires = _missing.get(path)
+    if expires is not None:
+        if expires > time.monotonic():
+            raise Http404(f"Template not found: {path}")
+        with _lock:
+            _missing.pop(path, None)
+
+    page = _pages.get(path)
+    stale = page is not None and _signature(page.files) != page.signature
+    if page is not None and page.html is not None and not stale:
+        html = page.html.get(login_state(request) if page.varies_by_login else None)
+        if html is not None:
+            return HttpResponse(html)
+    if stale:
+        # The engine's cached loader would still hand back the old template
+        reset_loaders()
+
+    try:
+        template = get_template(path)
+    except (TemplateDoesNotExist, SuspiciousFileOperation):
+        _remember_missing(path)
+        raise Http404(f"Template not found: {path}")
+
+    html = template.render(request=request)
+    if page is None or stale:
+        files, per_request, varies_by_login = _scan(template)
+        signature = _signature(files)
+        cacheable = not per_request and signature is not None
+        page = _Page(files, signature, varies_by_login, {} if cacheable else None)
+        with _lock:
+            if len(_pages) >= MAX_PAGES:
+                _pages.clear()
+            _pages[path] = page
+    if page.html is not None:
+        with _lock:
+            page.html[login_state(request) if page.varies_by_login else None] = html
+    return HttpResponse(html)
+
+
+def clear():
+    with _lock:
+        _pages.clear()
+        _missing.clear()
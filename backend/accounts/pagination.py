@@ -0,0 +1,81 @@
+"""Keyset (cursor) pagination for list endpoints.
+
+Lists are ordered newest first by ``(timestamp, id)``. A page is fetched
+with ``WHERE (ts, id) < (cursor_ts, cursor_id)`` and a LIMIT, so with an
+index on those columns page N costs the same as page 1, unlike OFFSET.
+The id breaks ties between rows sharing a timestamp.
+
+Cursors are opaque to clients: the last row's timestamp (microseconds since
+the epoch) and id packed into a short urlsafe base64 string. A tampered
+cursor can only move the page window; it cannot reveal other rows.
+
+Page sizes default to ``settings.LIST_PAGE_SIZE`` and are capped at
+``settings.LIST_MAX_PAGE_SIZE``.
+"""
+import base64
+import struct
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Q
+
+_CURSOR = struct.Struct('>qQ')
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+Page = namedtuple('Page', ['items', 'next_cursor'])
+
+
+class InvalidCursor(ValueError):
+    """Raised for malformed cursors or page sizes."""
+
+
+def encode_cursor(timestamp, pk):
+    micros = (timestamp - _EPOCH) // timedelta(microseconds=1)
+    return base64.urlsafe_b64encode(_CURSOR.pack(micros, pk)).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return (timestamp, pk) for a cursor made by `encode_cursor`."""
+    try:
+        blob = base64.urlsafe_b64decode((cursor + '=' * (-len(cursor) % 4)).encode('ascii'))
+        micros, pk = _CURSOR.unpack(blob)
+        return _EPOCH + timedelta(microseconds=micros), pk
+    except (ValueError, TypeError, AttributeError, struct.error, OverflowError):
+        raise InvalidCursor('invalid cursor')
+
+
+def page_params(request, prefix=''):
+    """Read ``<prefix>cursor`` and ``page_size`` from the query string.
+
+    Returns (cursor, page_size); raises `InvalidCursor` on bad input.
+    """
+    cursor = request.GET.get(f'{prefix}cursor') or None
+    try:
+        page_size = int(request.GET.get('page_size', settings.LIST_PAGE_SIZE))
+    except ValueError:
+        raise InvalidCursor('page_size must be an integer')
+    if cursor is not None:
+        decode_cursor(cursor)
+    return cursor, min(max(page_size, 1), settings.LIST_MAX_PAGE_SIZE)
+
+
+def paginate(queryset, field, cursor=None, page_size=None):
+    """Return one newest-first `Page` of `queryset`, keyed on (`field`, id)."""
+    if page_size is None:
+        page_size = settings.LIST_PAGE_SIZE
+    page_size = min(max(int(page_size), 1), settings.LIST_MAX_PAGE_SIZE)
+
+    queryset = queryset.order_by(f'-{field}', '-id')
+    if cursor:
+        timestamp, pk = decode_cursor(cursor)
+        queryset = queryset.filter(Q(**{f'{field}__lt': timestamp}) | Q(**{field: timestamp, 'id__lt': pk}))
+
+    # One extra row tells us whether there is a next page without COUNT(*)
+    items = list(queryset[:page_size + 1])
+    if len(items) <= page_size:
+        return Page(items, None)
+    items = items[:page_size]
+    last = items[-1]
+    return Page(items, encode_cursor(getattr(last, field), last.pk))
+
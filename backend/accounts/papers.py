@@ -0,0 +1,212 @@
+"""Seeded, reproducible test papers.
+
+A paper is the ordered list of questions served by `get_questions`. Rather
+than storing that list, we hand the client a compact `paper_id` that
+encodes everything needed to rebuild it deterministically:
+
+    company, difficulty, pool version, paper size and RNG seed
+
+The pool version is the highest question id in the (company, difficulty)
+pool when the paper was issued plus the number of ids up to it. Question
+ids only grow (and survive re-imports), so the issued pool is always the
+prefix of the current pool up to that id; if a question inside that
+prefix was deleted the size no longer matches and the paper is reported
+as expired instead of silently changing.
+
+The seed drives a lazily generated permutation of pool positions. A plain
+paper is the first `size` positions of that stream. When questions the
+user has already seen are skipped (see `accounts.question_history`), the id
+also carries the selection: the stream indexes actually used, as ascending
+deltas in varints. Its length follows the paper size, not how far into the
+stream the draw had to go, so the paper stays rebuildable without knowing
+the user's history even when a large, mostly seen pool is scanned to the
+end.
+
+The id is a urlsafe base64 string of a packed struct, the optional
+selection and a truncated HMAC, so clients cannot forge papers they were
+never issued.
+"""
+import base64
+import random
+import secrets
+import struct
+from bisect import bisect_right
+from collections import namedtuple
+
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+from .models import Question
+from . import question_pool
+
+# company idx, difficulty idx, paper size, watermark id, pool size, seed
+_STRUCT = struct.Struct('>BBBIII')
+_MAC_BYTES = 6
+_SALT = 'accounts.papers'
+
+COMPANIES = [key for key, _ in Question.COMPANY_CHOICES]
+DIFFICULTIES = [key for key, _ in Question.DIFFICULTY_CHOICES]
+
+Paper = namedtuple('Paper', ['paper_id', 'company', 'difficulty', 'question_ids'])
+
+
+class InvalidPaper(ValueError):
+    """Raised when a paper id is malformed, forged or no longer rebuildable."""
+
+
+def _mac(raw):
+    return salted_hmac(_SALT, raw, algorithm='sha256').digest()[:_MAC_BYTES]
+
+
+def encode_paper_id(company, difficulty, size, watermark, pool_size, seed, selection=()):
+    raw = _STRUCT.pack(
+        COMPANIES.index(company),
+        DIFFICULTIES.index(difficulty),
+        size, watermark, pool_size, seed,
+    ) + _pack_selection(selection)
+    return base64.urlsafe_b64encode(raw + _mac(raw)).decode('ascii').rstrip('=')
+
+
+def decode_paper_id(paper_id):
+    """Return (company, difficulty, size, watermark, pool_size, seed, selection)."""
+    try:
+        padded = paper_id + '=' * (-len(paper_id) % 4)
+        blob = base64.urlsafe_b64decode(padded.encode('ascii'))
+    except (ValueError, TypeError, AttributeError):
+        raise InvalidPaper('malformed paper_id')
+    if len(blob) < _STRUCT.size + _MAC_BYTES:
+        raise InvalidPaper('malformed paper_id')
+    raw, mac = blob[:-_MAC_BYTES], blob[-_MAC_BYTES:]
+    if not constant_time_compare(mac, _mac(raw)):
+        raise InvalidPaper('bad paper_id signature')
+    company_idx, difficulty_idx, size, watermark, pool_size, seed = _STRUCT.unpack_from(raw)
+    try:
+        company, difficulty = COMPANIES[company_idx], DIFFICULTIES[difficulty_idx]
+    except IndexError:
+        raise InvalidPaper('unknown company or difficulty')
+    return company, difficulty, size, watermark, pool_size, seed, _unpack_selection(raw[_STRUCT.size:])
+
+
+def _stream(pool_size, seed):
+    """Yield a seeded random permutation of range(pool_size), lazily.
+
+    Fisher-Yates with the swaps kept in a dict, so taking m positions costs
+    O(m) regardless of the pool size.
+    """
+    rng = random.Random(seed)
+    swaps = {}
+    for i in range(pool_size):
+        j = rng.randrange(i, pool_size)
+        picked = swaps.get(j, j)
+        swaps[j] = swaps.pop(i, i)
+        yield picked
+
+
+def _pack_selection(indexes):
+    """Ascending stream indexes as varint gaps (7 bits per byte, high bit set
+    on all but the last byte of each number)."""
+    out = bytearray()
+    previous = -1
+    for index in indexes:
+        gap = index - previous - 1
+        previous = index
+        while gap > 0x7F:
+            out.append(0x80 | (gap & 0x7F))
+            gap >>= 7
+        out.append(gap)
+    return bytes(out)
+
+
+def _unpack_selection(data):
+    indexes = []
+    previous = -1
+    gap = shift = 0
+    for byte in data:
+        gap |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        previous += gap + 1
+        indexes.append(previous)
+        gap = shift = 0
+    if shift:
+        raise InvalidPaper('malformed paper_id')
+    return tuple(indexes)
+
+
+def _select(pool, pool_size, size, seed, seen):
+    """Draw up to `size` positions, skipping ids in `seen` while possible.
+
+    Returns (question_ids, selection); the selection (used stream indexes)
+    is empty when nothing was skipped.
+    When every unseen question is used up, the remainder is filled with the
+    least recently seen ones (oldest `seen.age()` first).
+    """
+    k = min(size, pool_size)
+    picked = []
+    passed = []
+    for stream_index, position in enumerate(_stream(pool_size, seed)):
+        question_id = pool[position]
+        if question_id in seen:
+            passed.append((stream_index, question_id))
+            continue
+        picked.append((stream_index, question_id))
+        if len(picked) == k:
+            break
+
+    if len(picked) < k:
+        # Pool exhausted: top up with the least recently seen questions
+        passed.sort(key=lambda item: -seen.age(item[1]))
+        picked.extend(passed[:k - len(picked)])
+        picked.sort()
+
+    question_ids = [question_id for _, question_id in picked]
+    if not passed:
+        return question_ids, ()
+    return question_ids, tuple(stream_index for stream_index, _ in picked)
+
+
+def _draw(pool, pool_size, size, seed, selection=()):
+    """Rebuild the ids selected from the first `pool_size` entries of `pool`."""
+    k = min(size, pool_size)
+    ids = []
+    if not selection:
+        for position in _stream(pool_size, seed):
+            if len(ids) == k:
+                break
+            ids.append(pool[position])
+        return ids
+    wanted = set(selection[:k])
+    last = max(wanted)
+    for stream_index, position in enumerate(_stream(pool_size, seed)):
+        if stream_index > last:
+            break
+        if stream_index in wanted:
+            ids.append(pool[position])
+    return ids
+
+
+def issue(company, difficulty, size=question_pool.DEFAULT_PAPER_SIZE, seen=None):
+    """Draw a new paper from the current pool and return it as a `Paper`.
+
+    `seen` is an optional `question_history.SeenQuestions`; its ids are
+    avoided until the pool runs out.
+    """
+    pool = question_pool.get_pool(company, difficulty)
+    if not pool:
+        return Paper(None, company, difficulty, [])
+    seed = secrets.randbits(32)
+    if seen:
+        question_ids, selection = _select(pool, len(pool), size, seed, seen)
+    else:
+        question_ids, selection = _draw(pool, len(pool), size, seed), ()
+    paper_id = encode_paper_id(company, difficulty, size, pool[-1], len(pool), seed, selection)
+    return Paper(paper_id, company, difficulty, question_ids)
+
+
+def rebuild(paper_id):
+    """Rebuild the exact question order of a previously issued paper."""
+    company, difficulty, size, watermark, pool_size, seed, selection = decode_paper_id(paper_id)
+    pool = question_pool.get_pool(company, difficulty)
+    if bisect_right(pool, watermark) != pool_size:
+        raise InvalidPaper('paper expired: question pool changed')
+    return Paper(paper_id, company, difficulty, _draw(pool, pool_size, size, seed, selection))
@@ -0,0 +1,271 @@
+"""PDF metadata and first-page thumbnails for the catalog.
+
+For every PDF under MEDIA_ROOT this records the page count, file size, a
+SHA-256 content hash and (when PyMuPDF is installed) a small PNG of the
+first page, so `list_pdfs` can describe a document before anyone downloads
+it. Everything lives in ``settings.PDF_META_ROOT``:
+
+``<sha256>.json`` / ``<sha256>.png``
+    metadata and thumbnail, named by content so identical files share them
+    and a re-upload under a new name costs nothing
+``index.json``
+    ``{asset name: {"size", "mtime_ns", "sha256"}}``; rewritten under an
+    exclusive lock on ``index.lock``, merging into the current file, so
+    concurrent updates keep each other's entries
+
+`update()` skips files whose size and mtime match the index without reading
+them, and files whose hash already has metadata without parsing them; the
+rest are extracted in a process pool (`manage.py build_pdf_meta`). The
+`PDF` signal handler updates a single file after the save commits.
+
+Without PyMuPDF the page count comes from scanning the file for page
+objects (including compressed object streams) and no thumbnail is made.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.urls import reverse
+
+from . import file_delivery
+
+try:
+    import fitz  # PyMuPDF
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    fitz = None
+    PYMUPDF_AVAILABLE = False
+try:
+    import fcntl
+except ImportError:  # Windows: index writes are only serialised within a process
+    fcntl = None
+
+INDEX_NAME = 'index.json'
+LOCK_NAME = 'index.lock'
+THUMBNAIL_WIDTH = 160
+HASH_CHUNK = 1 << 20
+
+_PAGE_RE = re.compile(rb'/Type\s*/Page(?![A-Za-z])')
+_PAGES_COUNT_RE = re.compile(rb'/Type\s*/Pages\b[^>]*?/Count\s+(\d+)|/Count\s+(\d+)[^>]*?/Type\s*/Pages\b')
+_STREAM_RE = re.compile(rb'<<((?:(?!<<|>>).)*?/Type\s*/ObjStm(?:(?!>>).)*?)>>\s*stream\r?\n', re.S)
+
+_lock = threading.Lock()
+_write_lock = threading.Lock()
+_index = None  # ((index path, mtime_ns), entries)
+_meta = {}  # sha256 -> metadata
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _scan_page_count(data):
+    """Page count from the page tree, or by counting page objects."""
+    counts = [int(a or b) for a, b in _PAGES_COUNT_RE.findall(data)]
+    if counts:
+        return max(counts)
+    pages = len(_PAGE_RE.findall(data))
+    for match in _STREAM_RE.finditer(data):
+        if b'/FlateDecode' not in match.group(1):
+            continue
+        try:
+            pages += len(_PAGE_RE.findall(zlib.decompressobj().decompress(data[match.end():])))
+        except zlib.error:
+            continue
+    return pages or None
+
+
+def _inspect(path, thumbnail_path):
+    """Return (pages, thumbnail written)."""
+    if PYMUPDF_AVAILABLE:
+        try:
+            with fitz.open(path) as doc:
+                pages = doc.page_count
+                if pages:
+                    page = doc[0]
+                    zoom = THUMBNAIL_WIDTH / page.rect.width
+                    page.get_pixmap(matrix=fitz.Matrix(zoom, zoom)).save(thumbnail_path)
+                    return pages, True
+                return pages, False
+        except Exception:
+            pass  # damaged or unsupported file: fall back to the byte scan
+    with open(path, 'rb') as fh:
+        return _scan_page_count(fh.read()), False
+
+
+def _write_json(path, data):
+    tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as fh:
+        json.dump(data, fh, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def extract(path, root, force=False):
+    """Metadata for the file at `path`, extracting it into `root` if new.
+
+    Module-level so it can run in a worker process; results are keyed by
+    content hash, so concurrent workers never write the same file twice
+    with different data.
+    """
+    digest = file_sha256(path)
+    meta_path = os.path.join(root, digest + '.json')
+    if not force:
+        try:
+            with open(meta_path, encoding='utf-8') as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            pass
+    thumbnail_path = os.path.join(root, digest + '.png')
+    pages, thumbnail = _inspect(path, thumbnail_path)
+    meta = {
+        'sha256': digest,
+        'bytes': os.path.getsize(path),
+        'pages': pages,
+        'thumbnail': thumbnail,
+    }
+    _write_json(meta_path, meta)
+    return meta
+
+
+def _root():
+    return str(settings.PDF_META_ROOT)
+
+
+def load_index():
+    try:
+        with open(os.path.join(_root(), INDEX_NAME), encoding='utf-8') as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+@contextmanager
+def _index_locked(root):
+    """Hold the index lock (threads of this process, then other processes)."""
+    with _write_lock, open(os.path.join(root, LOCK_NAME), 'a') as fh:
+        if fcntl is not None:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def update(names=None, workers=None, force=False):
+    """Extract metadata for `names` (default: every PDF under MEDIA_ROOT).
+
+    Returns (extracted or re-indexed, unchanged). `workers` > 1 uses a
+    process pool; files missing from disk are dropped from the index.
+    `force` re-extracts even files whose hash already has metadata.
+
+    Extraction runs without the index lock; only the final merge into
+    ``index.json`` holds it.
+    """
+    root = _root()
+    os.makedirs(root, exist_ok=True)
+    index = load_index()
+    missing = set()
+    if names is None:
+        names = list(_media_pdfs())
+        missing.update(set(index) - set(names))
+
+    todo = {}
+    unchanged = 0
+    for name in names:
+        path = os.path.join(settings.MEDIA_ROOT, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            missing.add(name)
+            continue
+        entry = index.get(name)
+        if not force and entry and (entry['size'], entry['mtime_ns']) == (stat.st_size, stat.st_mtime_ns):
+            unchanged += 1
+            continue
+        todo[name] = (path, stat)
+
+    if workers and workers > 1 and len(todo) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {name: pool.submit(extract, path, root, force) for name, (path, _) in todo.items()}
+            results = {name: future.result() for name, future in futures.items()}
+    else:
+        results = {name: extract(path, root, force) for name, (path, _) in todo.items()}
+
+    if results or missing:
+        with _index_locked(root):
+            index = load_index()
+            for name in missing:
+                if not os.path.exists(os.path.join(settings.MEDIA_ROOT, name)):
+                    index.pop(name, None)
+            for name, meta in results.items():
+                stat = todo[name][1]
+                index[name] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': meta['sha256']}
+            _write_json(os.path.join(root, INDEX_NAME), index)
+    return len(results), unchanged
+
+
+def _media_pdfs():
+    media_root = str(settings.MEDIA_ROOT)
+    for directory, _, files in os.walk(media_root):
+        for name in files:
+            if name.lower().endswith('.pdf'):
+                yield os.path.relpath(os.path.join(directory, name), media_root).replace(os.sep, '/')
+
+
+def _cached_index():
+    global _index
+    path = os.path.join(_root(), INDEX_NAME)
+    try:
+        stamp = (path, os.stat(path).st_mtime_ns)
+    except OSError:
+        return {}
+    with _lock:
+        if _index is not None and _index[0] == stamp:
+            return _index[1]
+    entries = load_index()
+    with _lock:
+        _index = (stamp, entries)
+    return entries
+
+
+def for_url(url):
+    """Metadata dict for a PDF URL under MEDIA_URL, or None if not extracted.
+
+    Includes ``thumbnail_url`` when a thumbnail exists.
+    """
+    name = file_delivery.media_name(url)
+    entry = _cached_index().get(name) if name else None
+    if entry is None:
+        return None
+    digest = entry['sha256']
+    meta = _meta.get(digest)
+    if meta is None:
+        try:
+            with open(os.path.join(_root(), digest + '.json'), encoding='utf-8') as fh:
+                meta = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        with _lock:
+            _meta[digest] = meta
+    result = {'pages': meta['pages'], 'bytes': meta['bytes'], 'sha256': digest, 'thumbnail_url': None}
+    if meta.get('thumbnail'):
+        result['thumbnail_url'] = reverse('accounts:pdf_thumbnail', args=[digest])
+    return result
+
+
+def refresh_url(url):
+    """Update the metadata of one PDF (from the `PDF` post_save handler);
+    True if its index entry changed."""
+    name = file_delivery.media_name(url)
+    return bool(name) and update([name])[0] > 0
@@ -0,0 +1,187 @@
+"""Full-text search inside the PDF library, one hit per page.
+
+`index()` extracts the text of every local PDF page by page into `PdfPage`
+rows, which SQLite mirrors into the `accounts_pdfpage_fts` FTS5 table
+(migration 0019). Each PDF's `PdfText` row records the content hash it was
+extracted from; hashes come from `accounts.pdf_meta`, which only re-reads
+files whose size or mtime moved, so an unchanged library re-indexes in one
+stat per file. Changed files are extracted in a process pool, once per
+distinct content.
+
+Text extraction needs PyMuPDF or pypdf (the library's PDFs use
+Identity-encoded fonts, so raw content streams hold glyph ids rather than
+text); without either, `index()` leaves the index untouched.
+
+Querying, ranking, snippets and paging are shared with
+`accounts.question_search`; other database backends fall back to an
+``icontains`` scan.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from html import escape
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import PDF, PdfPage, PdfText
+from . import file_delivery, pdf_meta, question_search
+from .question_search import DEFAULT_PAGE_SIZE
+
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+try:
+    import pypdf
+except ImportError:
+    pypdf = None
+
+EXTRACTION_AVAILABLE = fitz is not None or pypdf is not None
+
+
+def extract_pages(path):
+    """Text of each page of the PDF at `path` (run in worker processes)."""
+    if fitz is not None:
+        with fitz.open(path) as doc:
+            return [page.get_text() for page in doc]
+    reader = pypdf.PdfReader(path)
+    return [page.extract_text() or '' for page in reader.pages]
+
+
+def _store(pdf_id, digest, texts):
+    with transaction.atomic():
+        PdfPage.objects.filter(pdf_id=pdf_id).delete()
+        PdfPage.objects.bulk_create([
+            PdfPage(pdf_id=pdf_id, number=number, text=text)
+            for number, text in enumerate(texts, 1)
+            if text.strip()
+        ])
+        PdfText.objects.update_or_create(pdf_id=pdf_id, defaults={'sha256': digest, 'pages': len(texts)})
+
+
+def index(workers=None, force=False):
+    """Bring the page index up to date; returns (indexed, unchanged, removed).
+
+    PDFs that are external links or whose file is gone are dropped from the
+    index. Files that fail to parse are skipped and retried next run.
+    """
+    if not EXTRACTION_AVAILABLE:
+        return 0, 0, 0
+    names = {}
+    for pdf_id, url in PDF.objects.values_list('id', 'url'):
+        name = file_delivery.media_name(url)
+        if name:
+            names[pdf_id] = name
+    pdf_meta.update(sorted(set(names.values())))
+    hashes = pdf_meta.load_index()
+    indexed = dict(PdfText.objects.values_list('pdf_id', 'sha256'))
+
+    todo = {}  # sha256 -> (path, [pdf ids])
+    unchanged = 0
+    for pdf_id, name in names.items():
+        entry = hashes.get(name)
+        if entry is None:
+            continue
+        if not force and indexed.get(pdf_id) == entry['sha256']:
+            unchanged += 1
+            continue
+        path = os.path.join(settings.MEDIA_ROOT, name)
+        todo.setdefault(entry['sha256'], (path, []))[1].append(pdf_id)
+
+    removed = [pdf_id for pdf_id in indexed if names.get(pdf_id) not in hashes]
+    if removed:
+        PdfPage.objects.filter(pdf_id__in=removed).delete()
+        PdfText.objects.filter(pdf_id__in=removed).delete()
+
+    results = _extract_all({digest: path for digest, (path, _) in todo.items()}, workers)
+    count = 0
+    for digest, texts in results.items():
+        for pdf_id in todo[digest][1]:
+            _store(pdf_id, digest, texts)
+            count += 1
+    return count, unchanged, len(removed)
+
+
+def _extract_all(paths, workers):
+    """{sha256: page texts} for {sha256: path}; unreadable files are left out."""
+    results = {}
+    if workers and workers > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {digest: pool.submit(extract_pages, path) for digest, path in paths.items()}
+            for digest, future in futures.items():
+                try:
+                    results[digest] = future.result()
+                except Exception:
+                    continue
+    else:
+        for digest, path in paths.items():
+            try:
+                results[digest] = extract_pages(path)
+            except Exception:
+                continue
+    return results
+
+
+def _search_fts(expression, companies, company, limit, offset):
+    filters = []
+    if companies is not None:
+        filters.append(('d.company IN (%s)' % ', '.join(['%s'] * len(companies)), list(companies)))
+    if company:
+        filters.append(('d.company = %s', [company]))
+    rows = question_search.fts_rows(
+        'accounts_pdfpage_fts',
+        ['d.id', 'd.title', 'd.company', 'p.number'],
+        [
+            'JOIN accounts_pdfpage p ON p.id = accounts_pdfpage_fts.rowid',
+            'JOIN accounts_pdf d ON d.id = p.pdf_id',
+        ],
+        expression, filters, limit, offset,
+    )
+    return [
+        {
+            'pdfId': pdf_id,
+            'title': title,
+            'company': d_company,
+            'page': number,
+            'snippet': snippet,
+            'rank': rank,
+        }
+        for pdf_id, title, d_company, number, snippet, rank in rows
+    ]
+
+
+def _search_scan(query, companies, company, limit, offset):
+    qs = PdfPage.objects.filter(text__icontains=query)
+    if companies is not None:
+        qs = qs.filter(pdf__company__in=companies)
+    if company:
+        qs = qs.filter(pdf__company=company)
+    rows = question_search.scan_rows(
+        qs, ['pdf_id', 'number'], ['pdf_id', 'pdf__title', 'pdf__company', 'number', 'text'], limit, offset,
+    )
+    return [
+        {
+            'pdfId': pdf_id,
+            'title': title,
+            'company': d_company,
+            'page': number,
+            'snippet': escape(text[:200]),
+            'rank': None,
+        }
+        for pdf_id, title, d_company, number, text in rows
+    ]
+
+
+def search(query, companies=None, company=None, page=1, page_size=DEFAULT_PAGE_SIZE):
+    """Return ``(hits, has_more)`` for one page of ranked page hits.
+
+    `companies` limits hits to those companies' PDFs (None: no limit), which
+    is how entitlements are applied; `company` is the user's own filter.
+    """
+    if companies is not None and not companies:
+        return [], False
+    return question_search.paged_search(
+        query, page, page_size,
+        lambda expression, limit, offset: _search_fts(expression, companies, company, limit, offset),
+        lambda text, limit, offset: _search_scan(text, companies, company, limit, offset),
+    )
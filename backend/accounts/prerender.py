@@ -0,0 +1,226 @@
+"""Pre-render context-free pages to static files (see `prerender_site`).
+
+Pages are discovered by walking the URL conf:
+
+* parameterless routes of plain template views (`PAGE_VIEWS`)
+* `company_details`, once per `CompanyProfile` slug
+* the `dynamic_html` catch-all, once per ``*.html`` file in the template
+  dirs (minus fragment folders) that no explicit route shadows
+
+Each URL is rendered through its real view with an anonymous GET request,
+bypassing the page caches. The templates actually used are recorded by the
+template loader (`accounts.page_cache.recording`) and their tag sources
+scanned (`accounts.page_cache.request_context_names`) to
+classify the page:
+
+``static``
+    no per-request context; identical for every visitor.
+``anonymous``
+    reads only session/user state (e.g. the login link in the site header);
+    valid for visitors without a session cookie and without a query string.
+
+Pages that need a CSRF token, debug context, or did not answer 200
+``text/html`` are skipped.
+
+`build()` is incremental: the manifest stores each page's template mtimes
+and a data fingerprint, and only pages where either moved are rendered
+again. Pages that disappeared are deleted.
+"""
+import hashlib
+import json
+import os
+import re
+from collections import namedtuple
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.test.client import RequestFactory
+from django.urls import URLPattern, URLResolver, get_resolver, resolve
+
+from .models import CompanyProfile
+from . import company_kb, page_cache, views
+
+MANIFEST_NAME = 'prerender-manifest.json'
+MANIFEST_VERSION = 1
+
+# Template views that render without per-request input
+PAGE_VIEWS = {
+    views.index, views.videos_page, views.pdfs_page, views.quiz_page, views.BTech_page,
+    views.interview_page, views.contect_page, views.select_difficulty, views.test_result,
+    views.company_test,
+}
+# Template folders holding partials and emails rather than pages
+FRAGMENT_DIRS = ('includes/', 'emails/', 'registration/')
+# Session-derived context; anonymous renders of these are shared by all anonymous visitors
+SESSION_CONTEXT = {'user', 'request', 'perms', 'messages'}
+
+Result = namedtuple('Result', ['rendered', 'unchanged', 'skipped', 'removed'])
+
+_PARAMETER_RE = re.compile(r'<[^>]+>')
+
+
+def _walk(patterns, prefix=''):
+    for entry in patterns:
+        if isinstance(entry, URLResolver):
+            yield from _walk(entry.url_patterns, prefix + str(entry.pattern))
+        elif isinstance(entry, URLPattern):
+            yield prefix, entry
+
+
+def _template_pages():
+    for directory in settings.TEMPLATES[0]['DIRS']:
+        directory = str(directory)
+        for root, _, files in os.walk(directory):
+            for name in files:
+                if not name.endswith('.html'):
+                    continue
+                relative = os.path.relpath(os.path.join(root, name), directory).replace(os.sep, '/')
+                if not relative.startswith(FRAGMENT_DIRS):
+                    yield '/' + relative
+
+
+def discover():
+    """Return {url: data fingerprint} for every candidate page."""
+    pages = {}
+    for prefix, pattern in _walk(get_resolver().url_patterns):
+        callback = pattern.callback
+        route = prefix + str(pattern.pattern)
+        if callback in PAGE_VIEWS and not pattern.pattern.converters:
+            pages.setdefault('/' + route, '')
+        elif callback is views.company_details:
+            for slug, updated_at in CompanyProfile.objects.values_list('slug', 'updated_at'):
+                pages['/' + _PARAMETER_RE.sub(slug, route)] = updated_at.isoformat()
+        elif callback is views.dynamic_html:
+            for url in _template_pages():
+                if resolve(url).func is views.dynamic_html:
+                    pages.setdefault(url, '')
+    return pages
+
+
+def _anonymous_request(url):
+    request = RequestFactory().get(url)
+    request.user = AnonymousUser()
+    request.session = import_module(settings.SESSION_ENGINE).SessionStore()
+    return request
+
+
+def render(url):
+    """Render `url` anonymously.
+
+    Returns (response, {template file: mtime_ns}, templates used).
+    """
+    match = resolve(url)
+    request = _anonymous_request(url)
+    # A cache hit would hide which templates the page is built from
+    page_cache.clear()
+    with page_cache.recording() as used:
+        if match.func is views.company_details:
+            slug = company_kb.resolve(match.kwargs['company'])
+            response = HttpResponse(company_kb.render_page(request, slug, use_cache=False))
+        else:
+            response = match.func(request, *match.args, **match.kwargs)
+        if hasattr(response, 'render'):
+            response = response.render()
+    files = {}
+    for template in used:
+        name = template.origin.name
+        if os.path.isfile(name):
+            files[name] = os.stat(name).st_mtime_ns
+    return response, files, used
+
+
+def classify(templates):
+    """Return 'static', 'anonymous' or None (not pre-renderable)."""
+    names = set()
+    for template in templates:
+        names |= page_cache.request_context_names(template.source)
+    if not names:
+        return 'static'
+    if names <= SESSION_CONTEXT:
+        return 'anonymous'
+    return None
+
+
+def output_name(url):
+    path = url.lstrip('/')
+    if not path or path.endswith('/'):
+        path += 'index.html'
+    return path
+
+
+def _unchanged(entry, data, output_dir):
+    if not entry or entry.get('data') != data:
+        return False
+    if not os.path.isfile(os.path.join(output_dir, entry['file'])):
+        return False
+    for name, mtime in entry['templates'].items():
+        try:
+            if os.stat(name).st_mtime_ns != mtime:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def load_manifest(output_dir):
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), encoding='utf-8') as fh:
+            manifest = json.load(fh)
+    except (OSError, ValueError):
+        return {}
+    return manifest.get('pages', {}) if manifest.get('version') == MANIFEST_VERSION else {}
+
+
+def build(output_dir=None, force=False, log=None):
+    """Render changed pages into `output_dir` and rewrite the manifest."""
+    output_dir = str(output_dir or settings.PRERENDER_ROOT)
+    old = {} if force else load_manifest(output_dir)
+    pages = {}
+    rendered = unchanged = skipped = 0
+
+    for url, data in sorted(discover().items()):
+        entry = old.get(url)
+        if _unchanged(entry, data, output_dir):
+            pages[url] = entry
+            unchanged += 1
+            continue
+
+        response, files, used = render(url)
+        mode = classify(used)
+        content_type = response.get('Content-Type', '')
+        if response.status_code != 200 or not content_type.startswith('text/html') or mode is None:
+            skipped += 1
+            if log:
+                log(f'skip {url} (status {response.status_code}, {mode or "per-request"})')
+            continue
+
+        name = output_name(url)
+        path = os.path.join(output_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as fh:
+            fh.write(response.content)
+        pages[url] = {
+            'file': name,
+            'mode': mode,
+            'templates': files,
+            'data': data,
+            'sha256': hashlib.sha256(response.content).hexdigest(),
+            'bytes': len(response.content),
+        }
+        rendered += 1
+
+    removed = 0
+    for url, entry in old.items():
+        if url not in pages:
+            try:
+                os.remove(os.path.join(output_dir, entry['file']))
+                removed += 1
+            except OSError:
+                pass
+
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, MANIFEST_NAME), 'w', encoding='utf-8') as fh:
+        json.dump({'version': MANIFEST_VERSION, 'pages': pages}, fh, indent=1, sort_keys=True)
+    return Result(rendered, unchanged, skipped, removed)
@@ -0,0 +1,159 @@
+"""Per-user profile header, kept in the cache and updated in place.
+
+The profile endpoints (`user_profile`, `get_user_purchased_items`,
+`get_user_test_results`, `api_get_user_profile_data` and the `profile`
+page) all show the same per-user header: account fields, counts and score
+stats. Each used to recompute it from several tables on every request. The
+aggregate holds it under one cache key::
+
+    {'version': 12,                       # the user's ProfileVersion
+     'user': {...},                       # basic account fields
+     'stats': {'totalPurchases': 3, 'averageTestScore': 71.5, ...}}
+
+so a header read is a single cache get whatever the length of the user's
+history. The lists themselves are not cached: list pages are keyset pages
+over the per-user indexes (see accounts.pagination), which cost the same
+for page 1 and page N.
+
+Writes are applied in place rather than invalidating. The model signal
+handlers call `record_changed` for every saved or deleted purchase, attempt
+or test result, whichever view wrote it. After the transaction commits, the
+stats of that section are recomputed with one aggregate query. An update is
+only applied when the cached version is exactly one behind the change's
+`ProfileVersion` (see accounts.profile_events). Otherwise a change was
+missed, and the aggregate is dropped and rebuilt on the next read. Updates
+for one user are serialised with a short cache lock.
+
+The aggregate must live in a cache shared by all workers (``CACHE_BACKEND``),
+as the other version-stamped caches do.
+"""
+import time
+from contextlib import contextmanager
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Avg, Count, Max
+
+from .models import AttemptedMock, PurchasedItem, TestResult, User
+from . import profile_events
+
+# Bounds how long an aggregate can outlive a missed update
+TTL = 24 * 3600
+LOCK_TIMEOUT = 5
+LOCK_WAIT = 1.0
+
+# model -> aggregate stats section
+SECTIONS = {
+    PurchasedItem: 'purchases',
+    AttemptedMock: 'attempts',
+    TestResult: 'testResults',
+}
+# section -> {stat: aggregate over the user's rows}
+STATS = {
+    'purchases': {'totalPurchases': Count('id')},
+    'attempts': {'totalMockAttempts': Count('id'), 'averageMockScore': Avg('score')},
+    'testResults': {
+        'totalTests': Count('id'), 'averageTestScore': Avg('score'), 'bestTestScore': Max('score'),
+    },
+}
+
+
+def _key(user_id):
+    return f'profile:{user_id}'
+
+
+def _lock_key(user_id):
+    return f'profile:{user_id}:lock'
+
+
+def _user_info(user):
+    return {
+        'id': user.id,
+        'email': user.email,
+        'firstName': user.first_name,
+        'lastName': user.last_name,
+        'username': user.username,
+        'joinedDate': user.date_joined.isoformat(),
+    }
+
+
+def _section_stats(model, user_id):
+    stats = model.objects.filter(user_id=user_id).aggregate(**STATS[SECTIONS[model]])
+    return {name: 0 if value is None else round(value, 2) for name, value in stats.items()}
+
+
+def build(user):
+    """Build and cache the aggregate for `user` from the database."""
+    version = profile_events.current(user.pk)
+    stats = {}
+    for model in SECTIONS:
+        stats.update(_section_stats(model, user.pk))
+    aggregate = {'version': version, 'user': _user_info(user), 'stats': stats}
+    # A write that committed while the stats were read is not in them
+    if profile_events.current(user.pk) == version:
+        cache.set(_key(user.pk), aggregate, TTL)
+    return aggregate
+
+
+def get(user_id, user=None):
+    """The aggregate for `user_id`, or None if there is no such user."""
+    aggregate = cache.get(_key(user_id))
+    if aggregate is not None:
+        return aggregate
+    if user is None:
+        user = User.objects.filter(pk=user_id).first()
+        if user is None:
+            return None
+    return build(user)
+
+
+def invalidate(user_id):
+    cache.delete(_key(user_id))
+
+
+@contextmanager
+def _locked(user_id):
+    deadline = time.monotonic() + LOCK_WAIT
+    acquired = cache.add(_lock_key(user_id), 1, LOCK_TIMEOUT)
+    while not acquired and time.monotonic() < deadline:
+        time.sleep(0.005)
+        acquired = cache.add(_lock_key(user_id), 1, LOCK_TIMEOUT)
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            cache.delete(_lock_key(user_id))
+
+
+def apply(user_id, model, version):
+    """Recompute the `model` stats of a cached aggregate at `version`."""
+    with _locked(user_id) as locked:
+        aggregate = cache.get(_key(user_id))
+        if aggregate is None:
+            return
+        if not locked or version is None or aggregate['version'] != version - 1:
+            invalidate(user_id)
+            return
+        aggregate['stats'].update(_section_stats(model, user_id))
+        aggregate['version'] = version
+        cache.set(_key(user_id), aggregate, TTL)
+
+
+def record_changed(instance, event):
+    """Schedule `apply` for after commit; `event` is the profile_events payload."""
+    model, user_id = type(instance), instance.user_id
+    version = event['version'] if event else None
+    transaction.on_commit(lambda: apply(user_id, model, version))
+
+
+def user_saved(user):
+    """Refresh the account fields of a cached aggregate."""
+    with _locked(user.pk) as locked:
+        aggregate = cache.get(_key(user.pk))
+        if aggregate is None:
+            return
+        if not locked:
+            invalidate(user.pk)
+            return
+        aggregate['user'] = _user_info(user)
+        cache.set(_key(user.pk), aggregate, TTL)
@@ -0,0 +1,86 @@
+"""Versioned realtime profile events.
+
+After each purchase or mock attempt the API used to re-read and serialize
+the user's whole purchase and attempt history and push it to the browser.
+Now each change moves the user's `ProfileVersion` counter by one and emits
+only what changed, to the user's Socket.IO room:
+
+``purchaseAdded``   ``{"version": 7, "purchase": {...}}``
+``attemptAdded``    ``{"version": 8, "attempt": {...}}``
+``testResultAdded`` ``{"version": 9, "testResult": {...}}``
+``profileChanged``  ``{"version": 10}`` (records edited or deleted)
+
+A client applies an event only when its version is exactly one more than
+the version it holds; on any gap (a missed event, a reconnect) it refetches
+``/user/<id>/profile/``, which reports the current ``version``.
+
+Events are published from the model signal handlers, so every writer
+(payment verification, admin) is covered, and are sent only after the
+transaction commits.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .models import AttemptedMock, ProfileVersion, PurchasedItem, TestResult
+from . import realtime
+
+PURCHASE_ADDED = 'purchaseAdded'
+ATTEMPT_ADDED = 'attemptAdded'
+TEST_RESULT_ADDED = 'testResultAdded'
+PROFILE_CHANGED = 'profileChanged'
+
+# model -> (event, payload key) for newly created records
+_ADDED = {
+    PurchasedItem: (PURCHASE_ADDED, 'purchase'),
+    AttemptedMock: (ATTEMPT_ADDED, 'attempt'),
+    TestResult: (TEST_RESULT_ADDED, 'testResult'),
+}
+
+
+def current(user_id):
+    """The user's profile version (0 before the first change)."""
+    return ProfileVersion.objects.filter(user_id=user_id).values_list('version', flat=True).first() or 0
+
+
+def _bump(user_id, create=True):
+    with transaction.atomic():
+        if not ProfileVersion.objects.filter(user_id=user_id).update(version=F('version') + 1):
+            if not create:
+                return None
+            try:
+                with transaction.atomic():
+                    ProfileVersion.objects.create(user_id=user_id, version=1)
+                return 1
+            except IntegrityError:
+                # created concurrently
+                ProfileVersion.objects.filter(user_id=user_id).update(version=F('version') + 1)
+        return current(user_id)
+
+
+def publish(user_id, event, create=True, **data):
+    """Move the user's version and emit `event` after commit; returns the payload."""
+    version = _bump(user_id, create)
+    if version is None:
+        return None
+    payload = dict(data, version=version)
+    transaction.on_commit(lambda: realtime.emit(user_id, event, payload))
+    return payload
+
+
+def record_saved(instance, created):
+    """Publish a delta for a new record, or a bare version bump for an edit.
+
+    The payload is left on ``instance.profile_event`` for the API response.
+    """
+    if created:
+        event, key = _ADDED[type(instance)]
+        instance.profile_event = publish(instance.user_id, event, **{key: instance.as_dict()})
+    else:
+        instance.profile_event = publish(instance.user_id, PROFILE_CHANGED)
+
+
+def record_deleted(instance):
+    """Publish a bare version bump; returns the payload (None if unversioned)."""
+    # No version row is created here: when a user is deleted their records
+    # cascade after the row is gone.
+    return publish(instance.user_id, PROFILE_CHANGED, create=False)
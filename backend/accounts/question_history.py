@@ -0,0 +1,79 @@
+"""Per-user memory of served questions, so retakes avoid repeats.
+
+Each user has one `QuestionHistory` row holding a few compressed id sets
+(`accounts.idset.IdSet`) ordered newest first. Every served paper is added
+to the newest bucket (and removed from older ones, so each id sits in the
+bucket of its latest sighting). When the newest bucket fills up a new one
+is started and the oldest is dropped, which makes its questions eligible
+again. Bucket index doubles as a coarse "last seen" age, used by
+`accounts.papers` to fall back to the least recently seen questions once a
+pool is exhausted.
+
+Loading is one primary-key lookup; no attempt history is joined.
+"""
+import struct
+
+from .idset import IdSet
+from .models import QuestionHistory
+
+BUCKET_SIZE = 200
+MAX_BUCKETS = 16
+
+_COUNT = struct.Struct('<B')
+
+
+class SeenQuestions:
+    """Recently served question ids, bucketed by recency (newest first)."""
+
+    def __init__(self, buckets=None):
+        self.buckets = buckets or [IdSet()]
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self.buckets)
+
+    def __contains__(self, question_id):
+        return any(question_id in bucket for bucket in self.buckets)
+
+    def age(self, question_id):
+        """Bucket index of the last sighting (0 = newest), None if unseen."""
+        for index, bucket in enumerate(self.buckets):
+            if question_id in bucket:
+                return index
+        return None
+
+    def mark(self, question_ids):
+        question_ids = list(question_ids)
+        for bucket in self.buckets[1:]:
+            bucket.difference_update(question_ids)
+        self.buckets[0].update(question_ids)
+        if len(self.buckets[0]) >= BUCKET_SIZE:
+            self.buckets.insert(0, IdSet())
+            del self.buckets[MAX_BUCKETS:]
+
+    def to_bytes(self):
+        return _COUNT.pack(len(self.buckets)) + b''.join(b.to_bytes() for b in self.buckets)
+
+    @classmethod
+    def from_bytes(cls, blob):
+        if not blob:
+            return cls()
+        blob = bytes(blob)
+        (count,) = _COUNT.unpack_from(blob)
+        offset = _COUNT.size
+        buckets = []
+        for _ in range(count):
+            bucket, offset = IdSet.from_bytes(blob, offset)
+            buckets.append(bucket)
+        return cls(buckets)
+
+
+def load(user):
+    """Return the `SeenQuestions` for `user` (empty if none recorded)."""
+    data = QuestionHistory.objects.filter(user=user).values_list('data', flat=True).first()
+    return SeenQuestions.from_bytes(data)
+
+
+def record(user, seen, question_ids):
+    """Mark `question_ids` as served and persist the history."""
+    seen.mark(question_ids)
+    QuestionHistory.objects.update_or_create(user=user, defaults={'data': seen.to_bytes()})
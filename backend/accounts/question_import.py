@@ -0,0 +1,109 @@
+"""Bulk upsert helpers for the question bank.
+
+Rows are matched on the model's ``unique_together`` key
+(company, difficulty, question_text) and written with
+``bulk_create(update_conflicts=True)``, so existing questions keep their ids
+across re-imports and issued papers (see `accounts.papers`) stay valid.
+
+``bulk_create`` does not send model signals, so callers must call
+`finish_import()` once they are done to refresh the sampled pools.
+"""
+import csv
+import json
+from itertools import islice
+
+from django.db import transaction
+
+from .models import Question
+from . import question_pool, question_payloads
+
+KEY_FIELDS = ['company', 'difficulty', 'question_text']
+UPDATE_FIELDS = ['option_a', 'option_b', 'option_c', 'option_d', 'correct_answer', 'explanation']
+
+COMPANIES = {key for key, _ in Question.COMPANY_CHOICES}
+DIFFICULTIES = {key for key, _ in Question.DIFFICULTY_CHOICES}
+ANSWERS = {'A', 'B', 'C', 'D'}
+
+
+def read_jsonl(fh):
+    for line in fh:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def read_csv(fh):
+    yield from csv.DictReader(fh)
+
+
+def chunked(rows, size):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def build_question(row):
+    """Return an unsaved `Question` for a row, or None if the row is invalid."""
+    company = str(row.get('company') or '').strip().lower()
+    difficulty = str(row.get('difficulty') or '').strip().lower()
+    text = str(row.get('question_text') or '').strip()
+    answer = str(row.get('correct_answer') or '').strip().upper()
+    if company not in COMPANIES or difficulty not in DIFFICULTIES or not text or answer not in ANSWERS:
+        return None
+    return Question(
+        company=company,
+        difficulty=difficulty,
+        question_text=text,
+        option_a=str(row.get('option_a') or ''),
+        option_b=str(row.get('option_b') or ''),
+        option_c=str(row.get('option_c') or ''),
+        option_d=str(row.get('option_d') or ''),
+        correct_answer=answer,
+        explanation=str(row.get('explanation') or ''),
+    )
+
+
+def upsert_chunk(rows):
+    """Upsert one chunk of rows in a single transaction.
+
+    Returns (written, skipped). Later duplicates inside the chunk win.
+    """
+    questions = {}
+    skipped = 0
+    for row in rows:
+        question = build_question(row)
+        if question is None:
+            skipped += 1
+            continue
+        questions[(question.company, question.difficulty, question.question_text)] = question
+
+    if questions:
+        with transaction.atomic():
+            Question.objects.bulk_create(
+                list(questions.values()),
+                update_conflicts=True,
+                unique_fields=KEY_FIELDS,
+                update_fields=UPDATE_FIELDS,
+            )
+            _invalidate_payloads(questions.keys())
+    return len(questions), skipped
+
+
+def _invalidate_payloads(keys):
+    """Drop cached JSON for rows that may have been updated in place."""
+    by_pool = {}
+    for company, difficulty, text in keys:
+        by_pool.setdefault((company, difficulty), []).append(text)
+    for (company, difficulty), texts in by_pool.items():
+        ids = Question.objects.filter(
+            company=company, difficulty=difficulty, question_text__in=texts,
+        ).values_list('id', flat=True)
+        question_payloads.invalidate_many(ids)
+
+
+def finish_import():
+    """Refresh the sampled question pools after a bulk import."""
+    question_pool.invalidate()
@@ -0,0 +1,118 @@
+"""Pre-encoded JSON fragments for `Question` rows.
+
+Questions almost never change, yet every test start used to hydrate model
+instances, call `Question.as_dict()` and re-encode the list. Here each
+question's JSON is encoded once and kept in the Django cache as bytes,
+keyed by question id and `PAYLOAD_VERSION`. A response body is then put
+together by joining cached fragments; only cache misses touch the ORM.
+
+Fragments live in two tiers: a process-local dict (no unpickling on the
+hot path) in front of the shared Django cache. The local tier is flushed
+whenever the question pool generation moves (see `accounts.question_pool`),
+and single entries are dropped from both tiers by the
+`post_save`/`post_delete` handlers in `accounts.signals`. Bump
+`PAYLOAD_VERSION` whenever `Question.as_dict()` changes shape so old
+fragments are never served.
+"""
+import json
+import threading
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Question
+from . import question_pool
+
+PAYLOAD_VERSION = 1
+CACHE_TIMEOUT = None  # questions are invalidated explicitly
+
+_lock = threading.Lock()
+_local = {}
+_local_generation = None
+
+
+def cache_key(question_id):
+    return f'question_json:v{PAYLOAD_VERSION}:{question_id}'
+
+
+def encode(data):
+    """Encode like `JsonResponse` does so joined fragments match its output."""
+    return json.dumps(data, cls=DjangoJSONEncoder).encode('utf-8')
+
+
+def _local_tier():
+    """Return the process-local fragment dict, flushed on generation change."""
+    global _local_generation
+    generation = question_pool.current_generation()
+    with _lock:
+        if generation != _local_generation:
+            _local.clear()
+            _local_generation = generation
+        return _local
+
+
+def get_fragments(ids):
+    """Return encoded question fragments for `ids`, in order.
+
+    Ids that no longer exist are skipped.
+    """
+    local = _local_tier()
+    fragments = {question_id: local[question_id] for question_id in ids if question_id in local}
+
+    missing = [question_id for question_id in ids if question_id not in fragments]
+    if missing:
+        keys = {question_id: cache_key(question_id) for question_id in missing}
+        cached = cache.get_many(keys.values())
+        for question_id, key in keys.items():
+            if key in cached:
+                fragments[question_id] = cached[key]
+        missing = [question_id for question_id in missing if question_id not in fragments]
+
+    if missing:
+        fresh = {}
+        for question in Question.objects.filter(pk__in=missing):
+            fragment = encode(question.as_dict())
+            fragments[question.id] = fragment
+            fresh[cache_key(question.id)] = fragment
+        cache.set_many(fresh, CACHE_TIMEOUT)
+
+    with _lock:
+        local.update(fragments)
+
+    return [fragments[question_id] for question_id in ids if question_id in fragments]
+
+
+def join_fragments(fragments):
+    """Join fragments into the bytes of a JSON array."""
+    return b'[' + b', '.join(fragments) + b']'
+
+
+def build_body(fragments, **fields):
+    """Build a ``{"ok": true, "questions": [...], "count": n, ...}`` body.
+
+    Extra keyword fields are encoded after `count`, in the order given.
+    """
+    parts = [
+        b'{"ok": true, "questions": ',
+        join_fragments(fragments),
+        b', "count": ',
+        str(len(fragments)).encode('ascii'),
+    ]
+    for name, value in fields.items():
+        parts += [b', ', encode(name), b': ', encode(value)]
+    parts.append(b'}')
+    return b''.join(parts)
+
+
+def invalidate(question_id):
+    cache.delete(cache_key(question_id))
+    with _lock:
+        _local.pop(question_id, None)
+
+
+def invalidate_many(question_ids):
+    question_ids = list(question_ids)
+    cache.delete_many([cache_key(question_id) for question_id in question_ids])
+    with _lock:
+        for question_id in question_ids:
+            _local.pop(question_id, None)
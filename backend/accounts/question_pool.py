@@ -0,0 +1,86 @@
+"""In-memory question pool index used by the test-start path.
+
+`get_questions` used to run ``ORDER BY RANDOM()`` over every matching
+`Question` row. Instead we keep, per (company, difficulty), a sorted array
+of question ids in process memory. Sampling a paper picks k random
+positions from that array and fetches the rows with one primary-key
+``IN`` query, so the cost is O(k) no matter how large the bank grows.
+
+Pools are rebuilt lazily. Any `Question` save/delete moves a generation
+marker stored in the Django cache (see `accounts.signals`); a process
+notices the new generation on its next lookup and drops its pools. With a
+shared cache backend this keeps every worker in step; with the default
+local-memory cache it still covers the process that made the change.
+"""
+import random
+import threading
+import time
+from array import array
+
+from django.core.cache import cache
+
+from .models import Question
+
+GENERATION_KEY = 'question_pool:generation'
+DEFAULT_PAPER_SIZE = 20
+
+_lock = threading.Lock()
+_pools = {}
+_generation = None
+
+
+def current_generation():
+    """Return the pool generation shared through the cache (0 if unset)."""
+    return cache.get(GENERATION_KEY, 0)
+
+
+def invalidate():
+    """Move the shared generation so every process rebuilds its pools.
+
+    A fresh timestamp is used rather than a counter so that a generation
+    evicted from the cache can never be re-issued with an old value.
+    """
+    cache.set(GENERATION_KEY, time.time_ns(), None)
+    with _lock:
+        _pools.clear()
+
+
+def _load_pool(company, difficulty):
+    ids = Question.objects.filter(
+        company=company,
+        difficulty=difficulty,
+    ).order_by('id').values_list('id', flat=True)
+    return array('q', ids)
+
+
+def get_pool(company, difficulty):
+    """Return the sorted id array for a (company, difficulty) pair."""
+    global _generation
+    generation = current_generation()
+    key = (company, difficulty)
+    with _lock:
+        if generation != _generation:
+            _pools.clear()
+            _generation = generation
+        pool = _pools.get(key)
+    if pool is None:
+        # Build outside the lock; a concurrent duplicate build is harmless.
+        pool = _load_pool(company, difficulty)
+        with _lock:
+            if _generation == generation:
+                _pools[key] = pool
+    return pool
+
+
+def sample_ids(company, difficulty, k=DEFAULT_PAPER_SIZE, rng=None):
+    """Pick up to `k` distinct question ids from the pool in O(k)."""
+    pool = get_pool(company, difficulty)
+    rng = rng or random
+    k = min(k, len(pool))
+    return [pool[i] for i in rng.sample(range(len(pool)), k)]
+
+
+def fetch_questions(ids):
+    """Fetch questions by id with one ``IN`` query, preserving `ids` order."""
+    by_id = Question.objects.in_bulk(ids)
+    return [by_id[i] for i in ids if i in by_id]
@@ -0,0 +1,161 @@
+"""Full-text search over the question bank.
+
+On SQLite the `accounts_question_fts` FTS5 table (migration 0012, kept in
+sync by triggers) is queried with bm25 ranking and snippets. Other database
+backends fall back to an ``icontains`` scan so the endpoint keeps working.
+
+User input is never passed to MATCH verbatim: it is split into word tokens,
+each token is quoted, and the last one is searched as a prefix, so stray
+quotes or operators cannot produce FTS syntax errors.
+"""
+import re
+from html import escape
+
+from django.db import connection
+from django.db.models import Q
+
+from .models import Question
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 50
+SNIPPET_TOKENS = 16
+
+# Private-use markers survive snippet() and are swapped for <mark> after escaping
+HL_START, HL_END = '\x02', '\x03'
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def match_expression(query):
+    """Turn free text into a safe FTS5 MATCH expression ('' if no tokens)."""
+    tokens = _TOKEN_RE.findall(query or '')[:12]
+    if not tokens:
+        return ''
+    terms = [f'"{t}"' for t in tokens]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def highlight(snippet):
+    return escape(snippet).replace(HL_START, '<mark>').replace(HL_END, '</mark>')
+
+
+def fts_available():
+    return connection.vendor == 'sqlite'
+
+
+def fts_rows(table, columns, joins, expression, filters, limit, offset):
+    """bm25-ranked rows of FTS5 `table` matching `expression`.
+
+    Each row is the selected `columns` followed by the highlighted snippet
+    and the rank. `filters` are ``(sql, params)`` pairs AND-ed onto the
+    MATCH; shared with `accounts.pdf_search`.
+    """
+    sql = [
+        'SELECT ' + ', '.join(columns) + ',',
+        f"  snippet({table}, -1, %s, %s, '…', {SNIPPET_TOKENS}),",
+        f'  bm25({table}) AS rank',
+        f'FROM {table}',
+        *joins,
+        f'WHERE {table} MATCH %s',
+    ]
+    params = [HL_START, HL_END, expression]
+    for clause, clause_params in filters:
+        sql.append(f'AND {clause}')
+        params += clause_params
+    sql.append('ORDER BY rank LIMIT %s OFFSET %s')
+    params += [limit, offset]
+
+    with connection.cursor() as cursor:
+        cursor.execute('\n'.join(sql), params)
+        rows = cursor.fetchall()
+    return [row[:-2] + (highlight(row[-2]), round(row[-1], 4)) for row in rows]
+
+
+def scan_rows(qs, order, fields, limit, offset):
+    """One page of `fields` tuples for the ``icontains`` fallback."""
+    return qs.order_by(*order).values_list(*fields)[offset:offset + limit]
+
+
+def paged_search(query, page, page_size, search_fts, search_scan):
+    """Return ``(hits, has_more)`` for one page.
+
+    Calls ``search_fts(expression, limit, offset)`` on SQLite and
+    ``search_scan(query, limit, offset)`` elsewhere.
+    """
+    page = max(int(page), 1)
+    page_size = min(max(int(page_size), 1), MAX_PAGE_SIZE)
+    offset = (page - 1) * page_size
+    # Fetch one extra row to learn whether another page exists without COUNT(*)
+    limit = page_size + 1
+
+    if fts_available():
+        expression = match_expression(query)
+        if not expression:
+            return [], False
+        hits = search_fts(expression, limit, offset)
+    else:
+        query = (query or '').strip()
+        if not query:
+            return [], False
+        hits = search_scan(query, limit, offset)
+    return hits[:page_size], len(hits) > page_size
+
+
+def _filters(company, difficulty):
+    filters = []
+    if company:
+        filters.append(('q.company = %s', [company]))
+    if difficulty:
+        filters.append(('q.difficulty = %s', [difficulty]))
+    return filters
+
+
+def _search_fts(expression, company, difficulty, limit, offset):
+    rows = fts_rows(
+        'accounts_question_fts',
+        ['q.id', 'q.company', 'q.difficulty', 'q.question_text'],
+        ['JOIN accounts_question q ON q.id = accounts_question_fts.rowid'],
+        expression, _filters(company, difficulty), limit, offset,
+    )
+    return [
+        {
+            'id': question_id,
+            'company': q_company,
+            'difficulty': q_difficulty,
+            'questionText': text,
+            'snippet': snippet,
+            'rank': rank,
+        }
+        for question_id, q_company, q_difficulty, text, snippet, rank in rows
+    ]
+
+
+def search_scan(query, company=None, difficulty=None, limit=DEFAULT_PAGE_SIZE + 1, offset=0):
+    """The ``icontains`` scan used on other backends (and as the benchmark
+    baseline in ``benchmark_question_search``)."""
+    qs = Question.objects.filter(Q(question_text__icontains=query) | Q(explanation__icontains=query))
+    if company:
+        qs = qs.filter(company=company)
+    if difficulty:
+        qs = qs.filter(difficulty=difficulty)
+    rows = scan_rows(qs, ['id'], ['id', 'company', 'difficulty', 'question_text'], limit, offset)
+    return [
+        {
+            'id': question_id,
+            'company': q_company,
+            'difficulty': q_difficulty,
+            'questionText': text,
+            'snippet': escape(text[:200]),
+            'rank': None,
+        }
+        for question_id, q_company, q_difficulty, text in rows
+    ]
+
+
+def search(query, company=None, difficulty=None, page=1, page_size=DEFAULT_PAGE_SIZE):
+    """Return ``(hits, has_more)`` for one page of ranked results."""
+    return paged_search(
+        query, page, page_size,
+        lambda expression, limit, offset: _search_fts(expression, company, difficulty, limit, offset),
+        lambda text, limit, offset: search_scan(text, company, difficulty, limit, offset),
+    )
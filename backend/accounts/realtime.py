@@ -0,0 +1,250 @@
+"""Process-wide Socket.IO emitter for realtime events.
+
+Views used to open a `socketio.Client`, connect to the Node server, emit once
+and disconnect inside the request, so every purchase paid for a TCP and
+Engine.IO handshake (and waited out the connect timeout when the server was
+slow). Instead, `emit()` only puts the event on a bounded queue and returns;
+one daemon thread per process keeps a long-lived connection to
+``settings.SOCKETIO_URL`` and forwards queued events as ``server_emit``
+messages, which the Node server relays to the ``to`` room.
+
+When the server is unreachable the thread reconnects with exponential
+backoff (`BACKOFF_INITIAL` doubling up to `BACKOFF_MAX`) and the event being
+sent is retried after reconnecting. Events arriving while the queue is full
+are dropped rather than blocking a request. The thread starts on the first
+event, and again in a forked worker, so pre-forking servers do not inherit a
+dead thread.
+
+Bursts are coalesced per room: the first event for a room opens a window of
+``settings.REALTIME_COALESCE_WINDOW`` seconds, and everything queued for that
+room before it closes goes out as one message. A single event is sent
+unchanged; several become one `BATCH_EVENT` whose payload is
+``{"events": [{"event": ..., "payload": ...}, ...]}`` in emit order, so the
+Node fan-out and client re-renders follow users rather than clicks.
+`stats()` reports events received against messages sent (plus coalesced,
+dropped and failed counts), and the thread logs them every
+`METRICS_INTERVAL` seconds while there is traffic.
+
+`emit()` sends over the transports in ``settings.REALTIME_TRANSPORTS``: this
+emitter for ``'socketio'``, and the in-process server-sent-events stream
+(accounts.event_stream, ``/api/events/``) for ``'sse'``, which needs no Node
+hop.
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+from django.conf import settings
+
+import socketio
+
+from . import event_stream
+
+logger = logging.getLogger(__name__)
+
+EVENT = 'server_emit'
+BATCH_EVENT = 'eventBatch'
+CONNECT_TIMEOUT = 5
+BACKOFF_INITIAL = 0.5
+BACKOFF_MAX = 30
+# Give up on one event after this many failed sends on a live connection
+MAX_ATTEMPTS = 3
+METRICS_INTERVAL = 60
+
+_STOP = object()
+
+
+class Emitter:
+    """Queue plus sender thread; `client_factory` builds a `socketio.Client`.
+
+    `window` is the coalescing window in seconds (0 sends every event alone).
+    """
+
+    def __init__(self, url, maxsize, client_factory=None, window=0):
+        self.url = url
+        self.queue = queue.Queue(maxsize)
+        self.client_factory = client_factory or (lambda: socketio.Client(reconnection=False))
+        self.window = window
+        self.counts = {'received': 0, 'sent': 0, 'coalesced': 0, 'dropped': 0, 'failed': 0, 'reconnects': 0}
+        self._client = None
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def emit(self, to, event, payload):
+        """Queue `event` for room `to`; False if it was dropped."""
+        self._ensure_thread()
+        try:
+            self.queue.put_nowait({'to': str(to), 'event': event, 'payload': payload})
+        except queue.Full:
+            self._count('dropped')
+            return False
+        self._count('received')
+        return True
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counts, queued=self.queue.qsize())
+
+    def close(self, timeout=2):
+        """Stop the thread after it drains what is already queued or held
+        for coalescing."""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        self._stopping.set()
+        try:
+            self.queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        thread.join(timeout)
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self.counts[name] += amount
+
+    def _ensure_thread(self):
+        pid = os.getpid()
+        if self._pid == pid and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid == pid and self._thread.is_alive():
+                return
+            self._client = None
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name='socketio-emitter', daemon=True)
+            self._pid = pid
+            self._thread.start()
+
+    def _connect(self):
+        """Connect, backing off until it succeeds; False once stopping."""
+        delay = BACKOFF_INITIAL
+        while True:
+            client = self.client_factory()
+            try:
+                client.connect(self.url, namespaces=['/'], wait_timeout=CONNECT_TIMEOUT)
+                self._client = client
+                return True
+            except Exception as exc:
+                # Once per outage, not on every retry
+                if delay == BACKOFF_INITIAL:
+                    logger.warning('Socket.IO connect to %s failed: %s', self.url, exc)
+            if self._stopping.wait(delay):
+                return False
+            delay = min(delay * 2, BACKOFF_MAX)
+            self._count('reconnects')
+
+    def _disconnect(self):
+        client, self._client = self._client, None
+        if client is not None:
+            try:
+                client.disconnect()
+            except Exception:
+                pass
+
+    def _send(self, message):
+        attempts = 0
+        while True:
+            if (self._client is None or not self._client.connected) and not self._connect():
+                self._count('failed')
+                return
+            try:
+                self._client.emit(EVENT, message)
+                self._count('sent')
+                return
+            except Exception as exc:
+                logger.warning('Socket.IO emit failed: %s', exc)
+                self._disconnect()
+                attempts += 1
+                if attempts >= MAX_ATTEMPTS:
+                    self._count('failed')
+                    return
+
+    def _flush(self, room, messages):
+        if len(messages) == 1:
+            self._send(messages[0])
+            return
+        self._count('coalesced', len(messages) - 1)
+        self._send({
+            'to': room,
+            'event': BATCH_EVENT,
+            'payload': {'events': [{'event': m['event'], 'payload': m['payload']} for m in messages]},
+        })
+
+    def _report(self):
+        stats = self.stats()
+        logger.info(
+            'Socket.IO emitter: %(received)d events in, %(sent)d messages out '
+            '(%(coalesced)d coalesced, %(dropped)d dropped, %(failed)d failed)', stats,
+        )
+
+    def _run(self):
+        pending = {}  # room -> (window deadline, [messages])
+        next_report = time.monotonic() + METRICS_INTERVAL
+        reported = None
+        while True:
+            timeout = None
+            if pending:
+                timeout = max(0, min(deadline for deadline, _ in pending.values()) - time.monotonic())
+            try:
+                message = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                message = None
+            try:
+                if message is _STOP:
+                    for room, (_, messages) in pending.items():
+                        self._flush(room, messages)
+                    break
+                if message is not None:
+                    if self.window > 0:
+                        deadline = time.monotonic() + self.window
+                        pending.setdefault(message['to'], (deadline, []))[1].append(message)
+                    else:
+                        self._send(message)
+                now = time.monotonic()
+                for room in [room for room, (deadline, _) in pending.items() if deadline <= now]:
+                    self._flush(room, pending.pop(room)[1])
+                if now >= next_report:
+                    next_report = now + METRICS_INTERVAL
+                    if self.counts != reported:
+                        reported = dict(self.counts)
+                        self._report()
+            finally:
+                if message is not None:
+                    self.queue.task_done()
+        self._disconnect()
+
+
+_emitter = None
+_emitter_lock = threading.Lock()
+
+
+def get_emitter():
+    global _emitter
+    if _emitter is None:
+        with _emitter_lock:
+            if _emitter is None:
+                _emitter = Emitter(
+                    settings.SOCKETIO_URL, settings.SOCKETIO_QUEUE_SIZE, window=settings.REALTIME_COALESCE_WINDOW,
+                )
+                atexit.register(_emitter.close)
+    return _emitter
+
+
+def emit(to, event, payload):
+    """Send a realtime event to room `to` over ``settings.REALTIME_TRANSPORTS``
+    without waiting for the network; False if the Socket.IO queue dropped it."""
+    queued = True
+    if 'sse' in settings.REALTIME_TRANSPORTS:
+        event_stream.publish(to, event, payload)
+    if 'socketio' in settings.REALTIME_TRANSPORTS:
+        queued = get_emitter().emit(to, event, payload)
+    return queued
+
+
+def stats():
+    return get_emitter().stats()
@@ -0,0 +1,151 @@
+"""Server-side scoring of test papers.
+
+The answer key of a paper (see `accounts.papers`) is kept as a compact byte
+string with one ASCII letter per question, e.g. ``b'BCAD...'``. Submitted
+answers use the same layout with ``-`` for unanswered questions, so a
+submission is scored with a single element-wise comparison instead of a
+per-question Python loop. Many submissions of the same paper are scored
+together as one (n x k) comparison.
+
+numpy is used when installed; otherwise the comparison runs through
+C-level ``map``/``bytes.count`` calls, which keeps the same interface.
+"""
+import operator
+from collections import namedtuple
+
+from django.core.cache import cache
+
+from .models import Question
+from . import papers, question_pool
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+UNANSWERED = b'-'
+VALID_CHOICES = frozenset(b'ABCD')
+
+Score = namedtuple('Score', ['total', 'answered', 'correct', 'wrong', 'percentage'])
+
+
+def _key_cache_key(paper_id):
+    # The pool generation moves on any Question change (e.g. an answer-key fix)
+    return f'answer_key:{question_pool.current_generation()}:{paper_id}'
+
+
+def answer_key(paper):
+    """Return the answer key bytes for a `papers.Paper`, in paper order."""
+    key = cache.get(_key_cache_key(paper.paper_id)) if paper.paper_id else None
+    if key is None:
+        answers = dict(
+            Question.objects.filter(pk__in=paper.question_ids).values_list('id', 'correct_answer')
+        )
+        key = bytes(ord(answers.get(question_id) or '?') for question_id in paper.question_ids)
+        if paper.paper_id:
+            cache.set(_key_cache_key(paper.paper_id), key, None)
+    return key
+
+
+def encode_answers(answers, size):
+    """Pack submitted answers into ``size`` bytes.
+
+    `answers` may be a dict of ``{index: 'A'}`` (as sent by test-page.js), a
+    list of letters, or an already packed string such as ``'AB-D'``; anything
+    else raises ValueError.
+    """
+    packed = bytearray(UNANSWERED * size)
+    if isinstance(answers, dict):
+        items = answers.items()
+    elif answers is None or isinstance(answers, (list, tuple, str)):
+        items = enumerate(answers or [])
+    else:
+        raise ValueError('answers must be a dict, a list or a string')
+    for index, value in items:
+        try:
+            index = int(index)
+        except (TypeError, ValueError):
+            continue
+        letter = str(value or '').strip().upper()[:1].encode('ascii', 'ignore')
+        if 0 <= index < size and letter and letter[0] in VALID_CHOICES:
+            packed[index] = letter[0]
+    return bytes(packed)
+
+
+def _score(total, answered, correct):
+    percentage = round(correct * 100 / total) if total else 0
+    return Score(total, answered, correct, answered - correct, percentage)
+
+
+def score(key, submitted):
+    """Score one packed submission against an answer key."""
+    total = len(key)
+    answered = total - submitted.count(UNANSWERED)
+    if NUMPY_AVAILABLE:
+        correct = int(np.count_nonzero(
+            np.frombuffer(key, dtype=np.uint8) == np.frombuffer(submitted, dtype=np.uint8)
+        ))
+    else:
+        correct = sum(map(operator.eq, key, submitted))
+    return _score(total, answered, correct)
+
+
+def score_many(key, submissions):
+    """Score many packed submissions of the same paper in one comparison."""
+    total = len(key)
+    if not submissions:
+        return []
+    block = b''.join(submissions)
+    if NUMPY_AVAILABLE:
+        matrix = np.frombuffer(block, dtype=np.uint8).reshape(len(submissions), total)
+        correct = np.count_nonzero(matrix == np.frombuffer(key, dtype=np.uint8), axis=1).tolist()
+        answered = (total - np.count_nonzero(matrix == UNANSWERED[0], axis=1)).tolist()
+    else:
+        matches = bytes(map(operator.eq, key * len(submissions), block))
+        correct = [matches.count(1, i, i + total) for i in range(0, len(block), total)]
+        answered = [total - block.count(UNANSWERED, i, i + total) for i in range(0, len(block), total)]
+    return [_score(total, a, c) for a, c in zip(answered, correct)]
+
+
+def score_paper(paper_id, answers):
+    """Rebuild `paper_id`, then score `answers` against it.
+
+    Returns ``(Score, packed_answers)``; raises `papers.InvalidPaper`, or
+    ValueError for malformed `answers`.
+    """
+    paper = papers.rebuild(paper_id)
+    key = answer_key(paper)
+    packed = encode_answers(answers, len(key))
+    return score(key, packed), packed
+
+
+def score_bulk(items):
+    """Score ``[(paper_id, answers), ...]``, grouping work per paper.
+
+    Returns a list aligned with `items`: a `Score` or an error string.
+    """
+    results = [None] * len(items)
+    groups = {}
+    for position, (paper_id, answers) in enumerate(items):
+        groups.setdefault(paper_id, []).append((position, answers))
+
+    for paper_id, members in groups.items():
+        try:
+            key = answer_key(papers.rebuild(paper_id))
+        except papers.InvalidPaper as e:
+            for position, _ in members:
+                results[position] = str(e)
+            continue
+        positions, packed = [], []
+        for position, answers in members:
+            try:
+                packed.append(encode_answers(answers, len(key)))
+            except ValueError as e:
+                results[position] = str(e)
+                continue
+            positions.append(position)
+        for position, result in zip(positions, score_many(key, packed)):
+            results[position] = result
+    return results
@@ -0,0 +1,102 @@
+"""Model signal handlers that keep the accounts app's caches and derived tables fresh.
+
+Connected from `AccountsConfig.ready()`.
+"""
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+
+from .models import AttemptedMock, CompanyProfile, Entitlement, PDF, PurchasedItem, Question, TestResult, User, Video
+from . import ability, catalog, company_directory, company_kb, entitlements, pdf_meta, profile_cache, profile_events, question_pool, question_payloads
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def question_changed(sender, instance, **kwargs):
+    """Any question change invalidates the sampled pools and its cached JSON."""
+    question_pool.invalidate()
+    question_payloads.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=TestResult)
+def test_result_saved(sender, instance, created, **kwargs):
+    """Each new server-scored result updates the user's adaptive-difficulty estimate."""
+    if created and instance.verified:
+        ability.record_result(instance.user, instance.company, instance.difficulty, instance.score)
+
+
+@receiver(pre_save, sender=PDF)
+def pdf_saving(sender, instance, **kwargs):
+    """Remember the stored company so a renamed PDF leaves its old entry."""
+    instance._stored_company = None
+    if instance.pk:
+        instance._stored_company = (
+            PDF.objects.filter(pk=instance.pk).values_list('company', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=PDF)
+@receiver(post_delete, sender=PDF)
+def pdf_changed(sender, instance, **kwargs):
+    """Refresh the company directory; after commit, refresh the file metadata
+    and start a new catalog version."""
+    for company in {instance.company, getattr(instance, '_stored_company', None)}:
+        company_directory.refresh(company)
+    url = instance.url if kwargs['signal'] is post_save else None
+    transaction.on_commit(lambda: _pdf_committed(url))
+
+
+def _pdf_committed(url):
+    if url:
+        pdf_meta.refresh_url(url)
+    catalog.bump()
+
+
+@receiver(post_save, sender=Video)
+@receiver(post_delete, sender=Video)
+def catalog_changed(sender, **kwargs):
+    """Any video change starts a new catalog snapshot version once committed,
+    so no reader can cache pre-commit rows under the new version."""
+    transaction.on_commit(catalog.bump)
+
+
+@receiver(post_save, sender=CompanyProfile)
+@receiver(post_delete, sender=CompanyProfile)
+def company_profile_changed(sender, **kwargs):
+    """Profile edits invalidate the slug index and cached company pages."""
+    company_kb.bump()
+
+
+@receiver(post_save, sender=Entitlement)
+@receiver(post_delete, sender=Entitlement)
+def entitlement_changed(sender, instance, **kwargs):
+    """A grant or revoke drops the user's cached entitlements everywhere."""
+    entitlements.invalidate(instance.user_id)
+
+
+@receiver(post_save, sender=PurchasedItem)
+@receiver(post_save, sender=AttemptedMock)
+@receiver(post_save, sender=TestResult)
+def profile_record_saved(sender, instance, created, **kwargs):
+    """Purchases, mock attempts and test results go out as versioned profile
+    events and are written through to the cached profile aggregate."""
+    profile_events.record_saved(instance, created)
+    profile_cache.record_changed(instance, instance.profile_event)
+
+
+@receiver(post_delete, sender=PurchasedItem)
+@receiver(post_delete, sender=AttemptedMock)
+@receiver(post_delete, sender=TestResult)
+def profile_record_deleted(sender, instance, **kwargs):
+    profile_cache.record_changed(instance, profile_events.record_deleted(instance))
+
+
+@receiver(post_save, sender=User)
+def profile_user_saved(sender, instance, created, **kwargs):
+    if not created:
+        profile_cache.user_saved(instance)
+
+
+@receiver(post_delete, sender=User)
+def profile_user_deleted(sender, instance, **kwargs):
+    profile_cache.invalidate(instance.pk)
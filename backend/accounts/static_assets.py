@@ -0,0 +1,175 @@
+"""Content-hashed, precompressed static files.
+
+``manage.py build_static`` collects ``frontend/css``, ``js`` and ``images``
+into STATIC_ROOT with `ManifestStorage` (the ``staticfiles`` storage in
+settings), which
+
+* copies every file to a content-hashed name (``css/style.3f2a9c1b7e4d.css``)
+  and rewrites ``url()`` references inside CSS to the hashed names,
+* writes ``staticfiles.json`` mapping original to hashed names, which
+  ``{% static %}`` resolves through, and
+* writes ``.gz`` (and, when the ``brotli`` package is installed, ``.br``)
+  siblings of text files that compress.
+
+A hashed URL names immutable content, so it is served with a one-year
+``Cache-Control: immutable`` and browsers never revalidate it; a changed file
+gets a new name. Until the first build (and in development) `{% static %}`
+falls back to the plain name.
+
+`serve` answers ``/static/`` from STATIC_ROOT, picking the ``.br`` / ``.gz``
+sibling the client accepts. Behind nginx, serve STATIC_ROOT directly instead::
+
+    location /static/ {
+        alias /srv/studyprohub/backend/staticfiles/;
+        gzip_static on;
+        brotli_static on;  # ngx_brotli
+        location ~ "\\.[0-9a-f]{12}\\.\\w+$" {
+            expires max;
+            add_header Cache-Control "public, immutable";
+        }
+    }
+"""
+import gzip
+import mimetypes
+import os
+import threading
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import Http404
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+
+from . import file_delivery
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+COMPRESSIBLE = {'.css', '.js', '.mjs', '.json', '.map', '.svg', '.txt', '.xml', '.html', '.ico'}
+# Smaller files gain less than the Content-Encoding negotiation costs
+MIN_COMPRESS_SIZE = 256
+# Keep a sibling only if it saves at least 5%
+MAX_RATIO = 0.95
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'no-cache'
+# (Content-Encoding, suffix) in order of preference
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+_lock = threading.Lock()
+_hashed = None  # (manifest hash, set of hashed names)
+
+
+def compressible(name):
+    return os.path.splitext(name)[1].lower() in COMPRESSIBLE
+
+
+def _encoders():
+    yield '.gz', lambda data: gzip.compress(data, 9, mtime=0)
+    if BROTLI_AVAILABLE:
+        yield '.br', lambda data: brotli.compress(data, quality=11)
+
+
+def compress(path):
+    """Write the ``.gz`` / ``.br`` siblings of `path` that are worth keeping;
+    stale siblings are removed. Returns the suffixes written."""
+    with open(path, 'rb') as fh:
+        data = fh.read()
+    written = []
+    for suffix, encode in _encoders():
+        target = path + suffix
+        encoded = encode(data) if len(data) >= MIN_COMPRESS_SIZE else None
+        if encoded is not None and len(encoded) <= len(data) * MAX_RATIO:
+            with open(target, 'wb') as fh:
+                fh.write(encoded)
+            written.append(suffix)
+        elif os.path.exists(target):
+            os.remove(target)
+    return written
+
+
+class ManifestStorage(ManifestStaticFilesStorage):
+    """Hashed names from ``staticfiles.json``, plus compressed siblings.
+
+    Names missing from the manifest (no build yet, or a file added since)
+    resolve to themselves instead of raising, so pages keep rendering.
+    """
+
+    manifest_strict = False
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        names = set(paths) | set(self.hashed_files.values())
+        for name in sorted(names):
+            if compressible(name) and self.exists(name):
+                for suffix in compress(self.path(name)):
+                    yield name, name + suffix, True
+
+
+def hashed_names():
+    """The set of content-hashed names in the current manifest."""
+    global _hashed
+    storage_hash = getattr(staticfiles_storage, 'manifest_hash', '')
+    cached = _hashed
+    if cached is not None and cached[0] == storage_hash:
+        return cached[1]
+    names = set(getattr(staticfiles_storage, 'hashed_files', {}).values())
+    with _lock:
+        _hashed = (storage_hash, names)
+    return names
+
+
+def _accepted(header):
+    """Content codings the client accepts (q > 0) from Accept-Encoding."""
+    accepted = set()
+    for part in (header or '').split(','):
+        coding, _, params = part.strip().partition(';')
+        q = params.strip()
+        if q.startswith('q='):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        if coding:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def serve(request, name):
+    """Deliver `name` from STATIC_ROOT, precompressed when possible."""
+    try:
+        path = safe_join(settings.STATIC_ROOT, name)
+    except SuspiciousFileOperation:
+        raise Http404('File not found')
+    if not os.path.isfile(path):
+        raise Http404('File not found')
+    content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+
+    encoding = None
+    if compressible(name):
+        accepted = _accepted(request.META.get('HTTP_ACCEPT_ENCODING'))
+        for coding, suffix in ENCODINGS:
+            if (coding in accepted or '*' in accepted) and os.path.isfile(path + suffix):
+                encoding, path = coding, path + suffix
+                break
+
+    response = file_delivery.serve_file(request, path, content_type=content_type, offload=False)
+    if encoding and response.status_code != 304:
+        response['Content-Encoding'] = encoding
+    if compressible(name):
+        patch_vary_headers(response, ['Accept-Encoding'])
+    response['Cache-Control'] = IMMUTABLE if name in hashed_names() else REVALIDATE
+    return response
@@ -0,0 +1,12 @@
+from accounts.models import Question
+
+
+def make_question(text, company='google', difficulty='easy', correct_answer='A', **fields):
+    return Question.objects.create(
+        company=company,
+        difficulty=difficulty,
+        question_text=text,
+        option_a='a', option_b='b', option_c='c', option_d='d',
+        correct_answer=correct_answer,
+        **fields,
+    )
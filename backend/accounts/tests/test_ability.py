@@ -0,0 +1,74 @@
+from io import StringIO
+import random
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, Client
+from django.urls import reverse
+from accounts.models import AbilityEstimate, TestResult
+from accounts import ability, question_pool
+from accounts.tests.helpers import make_question
+
+
+class AbilityTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='a@example.com', email='a@example.com', password='x')
+
+    def _result(self, difficulty, score, company='google', verified=True):
+        return TestResult.objects.create(
+            user=self.user, test_name='t', company=company, difficulty=difficulty,
+            total_questions=20, correct_answers=score // 5, score=score, verified=verified,
+        )
+
+    def test_saved_results_update_estimate_incrementally(self):
+        self._result('easy', 100)
+        first = AbilityEstimate.objects.get(user=self.user, company='google')
+        self.assertEqual(first.attempts, 1)
+        self.assertGreater(first.rating, 0)
+
+        self._result('hard', 0)
+        second = AbilityEstimate.objects.get(user=self.user, company='google')
+        self.assertEqual(second.attempts, 2)
+        self.assertLess(second.rating, first.rating)
+
+        # Unknown difficulty or company is ignored
+        self._result('adaptive', 50)
+        self._result('easy', 50, company='')
+        # and so is a client-reported (unverified) score
+        self._result('easy', 100, verified=False)
+        self.assertEqual(AbilityEstimate.objects.get(user=self.user).attempts, 2)
+
+    def test_mix_shifts_with_rating(self):
+        low, high = ability.difficulty_mix(-2.0), ability.difficulty_mix(2.5)
+        self.assertAlmostEqual(sum(low.values()), 1.0)
+        self.assertEqual(max(low, key=low.get), 'easy')
+        self.assertEqual(max(high, key=high.get), 'hard')
+        self.assertEqual(ability.difficulty_mix(100.0)['hard'], 1.0)
+
+    def test_choose_difficulty_is_single_lookup(self):
+        AbilityEstimate.objects.create(user=self.user, company='google', rating=3.0, attempts=10)
+        with self.assertNumQueries(1):
+            choice = ability.choose_difficulty(self.user, 'google', rng=random.Random(1))
+        self.assertEqual(choice, 'hard')
+
+    def test_rebuild_command_matches_incremental_updates(self):
+        for difficulty, score in [('easy', 90), ('medium', 70), ('hard', 40), ('medium', 85)]:
+            self._result(difficulty, score)
+        self._result('easy', 100, verified=False)
+        incremental = AbilityEstimate.objects.get(user=self.user).rating
+        AbilityEstimate.objects.all().delete()
+        call_command('rebuild_ability_estimates', stdout=StringIO())
+        rebuilt = AbilityEstimate.objects.get(user=self.user)
+        self.assertAlmostEqual(rebuilt.rating, incremental)
+        self.assertEqual(rebuilt.attempts, 4)
+
+    def test_get_questions_adaptive(self):
+        question_pool.invalidate()
+        for n in range(5):
+            make_question(f'Adaptive question {n}?', difficulty='hard')
+        AbilityEstimate.objects.create(user=self.user, company='google', rating=3.0, attempts=10)
+        client = Client()
+        client.post(reverse('accounts:login_page'), {'email': 'a@example.com', 'password': 'x'})
+        data = client.get(reverse('accounts:get_questions'), {'company': 'google', 'difficulty': 'adaptive'}).json()
+        self.assertEqual(data['difficulty'], 'hard')
+        self.assertEqual(data['count'], 5)
@@ -0,0 +1,58 @@
+from django.test import TestCase, Client
+from django.urls import reverse
+from accounts.models import PDF, Video
+from accounts import catalog
+
+
+class CatalogSnapshotTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        catalog.bump()
+        PDF.objects.create(title='Google notes', url='https://example.com/g.pdf', company='google')
+        PDF.objects.create(title='Uber notes', url='https://example.com/u.pdf', company='uber')
+        Video.objects.create(title='Intro', video_id='abc123')
+
+    def test_etag_and_304_without_queries(self):
+        url = reverse('accounts:list_pdfs')
+        first = self.client.get(url, {'company': 'google'})
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual([p['title'] for p in first.json()['pdfs']], ['Google notes'])
+        etag = first['ETag']
+        self.assertTrue(etag.startswith('"'))
+
+        with self.assertNumQueries(0):
+            again = self.client.get(url, {'company': 'google'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again['ETag'], etag)
+
+        # A different filter is a different snapshot
+        other = self.client.get(url)
+        self.assertEqual(len(other.json()['pdfs']), 2)
+        self.assertNotEqual(other['ETag'], etag)
+
+    def test_changes_bump_version(self):
+        url = reverse('accounts:list_videos')
+        etag = self.client.get(url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            Video.objects.create(title='Graphs', video_id='def456')
+            # Not bumped before commit: a reader here would cache stale rows
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(callbacks, [catalog.bump])
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['videos']), 2)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_pdf_changes_bump_after_commit(self):
+        url = reverse('accounts:list_pdfs')
+        etag = self.client.get(url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            pdf = PDF.objects.create(title='Microsoft notes', url='https://example.com/m.pdf', company='microsoft')
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(len(response.json()['pdfs']), 3)
+
+        etag = response['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            pdf.delete()
+        self.assertEqual(len(self.client.get(url, HTTP_IF_NONE_MATCH=etag).json()['pdfs']), 2)
@@ -0,0 +1,47 @@
+from django.test import TestCase, Client
+from django.urls import reverse
+from accounts.models import CompanyDirectory, PDF
+from accounts import catalog, company_directory
+
+
+class CompanyDirectoryTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        catalog.bump()
+
+    def _pdf(self, company, title='notes'):
+        return PDF.objects.create(title=title, url='https://example.com/x.pdf', company=company)
+
+    def test_maintained_on_save_and_delete(self):
+        first = self._pdf('capgemini')
+        self._pdf('capgemini', 'more notes')
+        self._pdf('TCS')
+        entry = CompanyDirectory.objects.get(company='capgemini')
+        self.assertEqual((entry.slug, entry.name, entry.pdf_count), ('capgemini', 'Capgemini', 2))
+        self.assertEqual(CompanyDirectory.objects.get(company='TCS').name, 'TCS')
+
+        # Moving a PDF updates both companies; the last PDF removes the entry
+        tcs = PDF.objects.get(company='TCS')
+        tcs.company = 'capgemini'
+        tcs.save()
+        self.assertFalse(CompanyDirectory.objects.filter(company='TCS').exists())
+        self.assertEqual(CompanyDirectory.objects.get(company='capgemini').pdf_count, 3)
+        first.delete()
+        self.assertEqual(CompanyDirectory.objects.get(company='capgemini').pdf_count, 2)
+
+        CompanyDirectory.objects.all().delete()
+        self.assertEqual(company_directory.rebuild(), 1)
+        self.assertEqual(company_directory.company_names(), ['capgemini'])
+
+    def test_companies_endpoint(self):
+        self._pdf('wipro')
+        self._pdf('')
+        url = reverse('accounts:list_companies')
+        response = self.client.get(url)
+        data = response.json()
+        self.assertEqual(data['count'], 1)
+        self.assertEqual(data['companies'][0]['name'], 'Wipro')
+        self.assertEqual(data['companies'][0]['pdfCount'], 1)
+        with self.assertNumQueries(0):
+            cached = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
@@ -0,0 +1,44 @@
+from django.test import TestCase, Client
+from django.urls import reverse
+from accounts.models import CompanyProfile
+from accounts import company_kb
+
+
+class CompanyKnowledgeBaseTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        company_kb.bump()
+
+    def test_seeded_from_migration(self):
+        self.assertEqual(CompanyProfile.objects.count(), 22)
+        profile = company_kb.get_profile('goldman-sachs')
+        self.assertEqual(profile['name'], 'Goldman Sachs')
+        self.assertTrue(profile['interview_process'])
+
+    def test_resolve(self):
+        cases = {
+            'TCS': 'tcs',
+            'goldman-sachs': 'goldman-sachs',
+            'Goldman Sachs': 'goldman-sachs',
+            'goldm': 'goldman-sachs',
+            'amadeus': 'amandeus',
+            'palo-alto-networks': 'paloalto',
+            'infosys-placement-papers': 'infosys',
+            'x': None,
+            'unknown-co': None,
+        }
+        for query, slug in cases.items():
+            self.assertEqual(company_kb.resolve(query), slug, query)
+
+    def test_page_cached_and_invalidated(self):
+        url = reverse('accounts:company_details', args=['morgan-stanley'])
+        first = self.client.get(url)
+        self.assertContains(first, 'Morgan Stanley')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url).content, first.content)
+
+        company = CompanyProfile.objects.get(slug='morgan-stanley')
+        company.profile['tagline'] = 'Updated tagline for tests'
+        company.save()
+        self.assertContains(self.client.get(url), 'Updated tagline for tests')
+        self.assertEqual(self.client.get(reverse('accounts:company_details', args=['nope'])).status_code, 404)
@@ -0,0 +1,76 @@
+import os
+import shutil
+import tempfile
+import time
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from accounts.models import PDF, UserProfile
+from accounts import download_links, entitlements
+
+CONTENT = b'%PDF-1.4 signed link test'
+
+
+class DownloadLinkTests(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, True)
+        os.makedirs(os.path.join(self.root, 'pdf'))
+        with open(os.path.join(self.root, 'pdf', 'Signed.pdf'), 'wb') as fh:
+            fh.write(CONTENT)
+        overrides = override_settings(MEDIA_ROOT=self.root, PDF_META_ROOT=os.path.join(self.root, 'meta'), FILE_DELIVERY='python', PDF_LINK_TTL=600)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.pdf = PDF.objects.create(title='Signed', url='http://testserver/assets/pdf/Signed.pdf', company='TCS')
+
+    def login(self, scope, company=''):
+        buyer = UserProfile.objects.create(phone='9000000002')
+        entitlements.grant(buyer, scope, company)
+        session = self.client.session
+        session['phone'] = buyer.phone
+        session.save()
+        return buyer
+
+    def test_sign_and_verify(self):
+        now = 1_700_000_000
+        url, expires = download_links.signed_url(7, 3, 'pdf/a.pdf', now=now)
+        self.assertEqual(expires % download_links.GRANULARITY, 0)
+        self.assertGreaterEqual(expires, now + 600)
+        self.assertEqual(url, download_links.signed_url(7, 3, 'pdf/a.pdf', now=now + 1)[0])
+
+        sig = download_links.signature(7, 3, expires, 'pdf/a.pdf')
+        self.assertTrue(download_links.verify(7, 3, expires, sig, 'pdf/a.pdf', now=now))
+        self.assertFalse(download_links.verify(7, 3, expires, sig, 'pdf/a.pdf', now=expires + 1))
+        self.assertFalse(download_links.verify(7, 4, expires, sig, 'pdf/a.pdf', now=now))
+        self.assertFalse(download_links.verify(7, 3, expires, sig, 'pdf/b.pdf', now=now))
+        self.assertFalse(download_links.verify(7, 3, expires + 60, sig, 'pdf/a.pdf', now=now))
+
+    def test_link_requires_entitlement(self):
+        link = reverse('accounts:pdf_link', args=[self.pdf.pk])
+        self.assertEqual(self.client.get(link).status_code, 403)
+        self.login(entitlements.COMPANY, 'Infosys')
+        self.assertEqual(self.client.get(link).json(), {'ok': False, 'error': 'forbidden'})
+        self.assertEqual(self.client.get(reverse('accounts:pdf_link', args=[0])).status_code, 404)
+
+    def test_signed_download_needs_no_queries(self):
+        buyer = self.login(entitlements.COMPANY, 'TCS')
+        data = self.client.get(reverse('accounts:pdf_link', args=[self.pdf.pk])).json()
+        self.assertTrue(data['ok'])
+        self.assertGreater(data['expires'], time.time())
+        self.assertIn(f'/{self.pdf.pk}/{buyer.pk}/', data['url'])
+
+        self.client.logout()
+        with self.assertNumQueries(0):
+            response = self.client.get(data['url'], HTTP_RANGE='bytes=0-3')
+            self.assertEqual(b''.join(response.streaming_content), CONTENT[:4])
+        self.assertEqual(response.status_code, 206)
+
+        tampered = data['url'].replace('Signed.pdf', 'Other.pdf')
+        self.assertEqual(self.client.get(tampered).status_code, 403)
+
+    def test_external_pdf_link(self):
+        external = PDF.objects.create(title='Ext', url='https://example.com/x.pdf', company='TCS')
+        self.login(entitlements.ALL)
+        data = self.client.get(reverse('accounts:pdf_link', args=[external.pk])).json()
+        self.assertEqual(data, {'ok': True, 'url': external.url, 'expires': None})
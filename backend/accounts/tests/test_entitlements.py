@@ -0,0 +1,84 @@
+import json
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import Entitlement, UserProfile
+from accounts import entitlements
+
+
+class EntitlementTests(TestCase):
+    def setUp(self):
+        self.profile = UserProfile.objects.create(phone='9000000003')
+        # Test rollbacks reuse primary keys without firing delete signals
+        entitlements.invalidate(self.profile.pk)
+
+    def test_grant_revoke_and_cache(self):
+        self.assertFalse(entitlements.has_access(self.profile, 'TCS'))
+        entitlements.grant(self.profile, entitlements.COMPANY, 'TCS')
+        with self.assertNumQueries(1):
+            self.assertTrue(entitlements.has_access(self.profile, 'TCS'))
+            self.assertFalse(entitlements.has_access(self.profile, 'Infosys'))
+            self.assertFalse(entitlements.has_access(self.profile))
+            self.assertEqual(entitlements.companies(self.profile), ['TCS'])
+
+        entitlements.grant(self.profile, entitlements.ALL)
+        self.assertTrue(entitlements.has_access(self.profile, 'Infosys'))
+        self.assertEqual(entitlements.summary(self.profile), {'has_paid': True, 'paid_companies': {'TCS': True}})
+
+        self.assertTrue(entitlements.revoke(self.profile, entitlements.ALL))
+        self.assertFalse(entitlements.revoke(self.profile, entitlements.ALL))
+        self.assertFalse(entitlements.has_access(self.profile, 'Infosys'))
+        self.assertEqual(list(entitlements.holders('TCS')), [self.profile])
+
+    def test_expiry(self):
+        entitlements.grant(self.profile, entitlements.COMPANY, 'TCS', expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertFalse(entitlements.has_access(self.profile, 'TCS'))
+        self.assertEqual(list(entitlements.holders('TCS')), [])
+        entitlements.grant(self.profile, entitlements.COMPANY, 'TCS', expires_at=timezone.now() + timedelta(days=1))
+        self.assertTrue(entitlements.has_access(self.profile, 'TCS'))
+        self.assertEqual(Entitlement.objects.filter(user=self.profile).count(), 1)
+
+    def test_mark_paid_and_verify_transaction(self):
+        session = self.client.session
+        session['phone'] = self.profile.phone
+        session.save()
+        response = self.client.post(reverse('accounts:mark_paid'), json.dumps({'type': 'pdf', 'company': 'Wipro'}), content_type='application/json')
+        self.assertTrue(response.json()['ok'])
+        self.assertEqual(entitlements.companies(self.profile), ['Wipro'])
+
+        user = get_user_model().objects.create_user(username='buyer@example.com', password='x')
+        self.client.force_login(user)
+        response = self.client.post(reverse('accounts:verify_transaction'), json.dumps({'transactionId': 'T1', 'company': 'Accenture'}), content_type='application/json')
+        self.assertTrue(response.json()['ok'])
+        self.assertEqual(entitlements.companies(user.profile), ['Accenture'])
+
+
+class EntitlementMigrationTests(TransactionTestCase):
+    before = [('accounts', '0017_companyprofile')]
+    after = [('accounts', '0018_entitlement')]
+
+    def test_json_grants_are_copied(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.before)
+        apps = executor.loader.project_state(self.before).apps
+        OldProfile = apps.get_model('accounts', 'UserProfile')
+        OldProfile.objects.create(phone='1', has_paid=True, paid_companies={'TCS': True, 'Wipro': False})
+        OldProfile.objects.create(phone='2', paid_companies={'Infosys': True})
+
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(self.after)
+        apps = executor.loader.project_state(self.after).apps
+        Grant = apps.get_model('accounts', 'Entitlement')
+        self.assertEqual(
+            sorted(Grant.objects.values_list('user__phone', 'scope', 'company')),
+            [('1', 'all', ''), ('1', 'company', 'TCS'), ('2', 'company', 'Infosys')],
+        )
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
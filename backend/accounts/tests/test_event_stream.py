@@ -0,0 +1,136 @@
+import asyncio
+import json
+import os
+import tempfile
+import threading
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.sessions.backends.db import SessionStore
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from accounts import event_stream, realtime
+
+
+class LocalBrokerTests(SimpleTestCase):
+    async def test_publish_reaches_room_subscribers_only(self):
+        broker = event_stream.LocalBroker()
+        mine, other = broker.subscribe(7), broker.subscribe(8)
+        broker.publish(7, 'purchaseAdded', {'version': 2})
+        self.assertEqual(await mine.get(1), ('purchaseAdded', {'version': 2}))
+        with self.assertRaises(asyncio.TimeoutError):
+            await other.get(0.05)
+        mine.close()
+        other.close()
+        self.assertEqual(broker.subscriber_count(), 0)
+
+    async def test_publish_from_another_thread(self):
+        broker = event_stream.LocalBroker()
+        subscription = broker.subscribe('7')
+        thread = threading.Thread(target=broker.publish, args=(7, 'attemptAdded', {'version': 3}))
+        thread.start()
+        thread.join()
+        self.assertEqual(await subscription.get(1), ('attemptAdded', {'version': 3}))
+        subscription.close()
+
+    async def test_slow_client_loses_oldest_events(self):
+        broker = event_stream.LocalBroker()
+        with mock.patch.object(event_stream, 'SUBSCRIPTION_SIZE', 2):
+            subscription = broker.subscribe(1)
+        for n in range(3):
+            broker.publish(1, 'e', n)
+        await asyncio.sleep(0)
+        self.assertEqual([await subscription.get(1), await subscription.get(1)], [('e', 1), ('e', 2)])
+        self.assertEqual(subscription.dropped, 1)
+
+
+class SQLiteBrokerTests(SimpleTestCase):
+    async def test_events_cross_broker_instances(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'events.sqlite3')
+            reader, writer = event_stream.SQLiteBroker(path), event_stream.SQLiteBroker(path)
+            subscription = reader.subscribe(5)
+            await asyncio.sleep(event_stream.POLL_INTERVAL)
+            writer.publish(5, 'profileChanged', {'version': 4})
+            writer.publish(6, 'profileChanged', {'version': 9})
+            self.assertEqual(await subscription.get(2), ('profileChanged', {'version': 4}))
+            subscription.close()
+            await asyncio.sleep(event_stream.POLL_INTERVAL * 2)
+            self.assertTrue(reader._poller[1].done())
+
+
+class StreamTests(SimpleTestCase):
+    def test_format_event(self):
+        self.assertEqual(
+            event_stream.format_event([('purchaseAdded', {'version': 2})]),
+            'event: purchaseAdded\ndata: {"version": 2}\n\n',
+        )
+        frame = event_stream.format_event([('a', 1), ('b', 2)])
+        name, data = frame.strip().split('\n')
+        self.assertEqual(name, 'event: eventBatch')
+        self.assertEqual(json.loads(data[len('data: '):]), {
+            'events': [{'event': 'a', 'payload': 1}, {'event': 'b', 'payload': 2}],
+        })
+
+    async def test_stream_coalesces_within_window(self):
+        broker = event_stream.LocalBroker()
+        subscription = broker.subscribe(1)
+        body = event_stream.stream(subscription, window=0.05, heartbeat=0.5)
+        self.assertEqual(await anext(body), 'retry: 3000\n\n')
+        broker.publish(1, 'a', 1)
+        broker.publish(1, 'b', 2)
+        self.assertIn('event: eventBatch', await anext(body))
+        self.assertEqual(await anext(body), ': keepalive\n\n')
+        await body.aclose()
+        self.assertEqual(broker.subscriber_count(), 0)
+
+
+@override_settings(REALTIME_TRANSPORTS=['sse'])
+class EventsViewTests(TestCase):
+    def test_refuses_wsgi_and_disabled_transport(self):
+        response = self.client.get(reverse('accounts:events'))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json(), {'ok': False, 'error': 'asgi_required'})
+        with override_settings(REALTIME_TRANSPORTS=['socketio']):
+            response = self.client.get(reverse('accounts:events'))
+        self.assertEqual(response.json(), {'ok': False, 'error': 'event_stream_disabled'})
+
+    async def test_requires_session(self):
+        response = await self.async_client.get(reverse('accounts:events'))
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json(), {'ok': False, 'error': 'not_authenticated'})
+
+    async def test_streams_session_users_events(self):
+        user = await User.objects.acreate(username='sse')
+        session = SessionStore()
+        session['user_id'] = user.pk
+        await session.asave()
+        self.async_client.cookies[settings.SESSION_COOKIE_NAME] = session.session_key
+
+        broker = event_stream.LocalBroker()
+        with mock.patch.object(event_stream, 'get_broker', return_value=broker):
+            response = await self.async_client.get(reverse('accounts:events'))
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+        body = response.streaming_content
+        self.assertEqual(await anext(body), b'retry: 3000\n\n')
+        broker.publish(user.pk, 'purchaseAdded', {'version': 2})
+        self.assertEqual(await anext(body), b'event: purchaseAdded\ndata: {"version": 2}\n\n')
+        await body.aclose()
+
+
+class TransportTests(SimpleTestCase):
+    def test_emit_uses_configured_transports(self):
+        with mock.patch.object(event_stream, 'publish') as publish, \
+                mock.patch.object(realtime, 'get_emitter') as get_emitter:
+            with override_settings(REALTIME_TRANSPORTS=['sse']):
+                self.assertTrue(realtime.emit(3, 'profileChanged', {'version': 1}))
+            publish.assert_called_once_with(3, 'profileChanged', {'version': 1})
+            get_emitter.assert_not_called()
+
+            with override_settings(REALTIME_TRANSPORTS=['socketio']):
+                realtime.emit(3, 'profileChanged', {'version': 2})
+            self.assertEqual(publish.call_count, 1)
+            get_emitter.return_value.emit.assert_called_once_with(3, 'profileChanged', {'version': 2})
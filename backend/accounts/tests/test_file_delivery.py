@@ -0,0 +1,107 @@
+import importlib
+import os
+import shutil
+import tempfile
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.urls.resolvers import RegexPattern, URLResolver
+
+from accounts.models import PDF, UserProfile
+from accounts import entitlements, file_delivery, views
+from djproject import urls as root_urls
+
+CONTENT = bytes(range(256)) * 40  # 10240 bytes
+
+
+class FileDeliveryTests(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, True)
+        os.makedirs(os.path.join(self.root, 'pdf'))
+        with open(os.path.join(self.root, 'pdf', 'Sample.pdf'), 'wb') as fh:
+            fh.write(CONTENT)
+        overrides = override_settings(MEDIA_ROOT=self.root, PDF_META_ROOT=os.path.join(self.root, 'meta'), FILE_DELIVERY='python')
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+    def get(self, url, **headers):
+        response = self.client.get(url, **headers)
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        return response, body
+
+    def test_assets_route_to_serve_asset_in_debug(self):
+        with override_settings(DEBUG=True):
+            module = importlib.reload(root_urls)
+        self.addCleanup(importlib.reload, root_urls)
+        resolver = URLResolver(RegexPattern(r'^/'), module)
+        self.assertIs(resolver.resolve('/assets/pdf/Sample.pdf').func, views.serve_asset)
+
+    def test_parse_range(self):
+        self.assertEqual(file_delivery.parse_range('bytes=0-99', 1000), (0, 99))
+        self.assertEqual(file_delivery.parse_range('bytes=900-', 1000), (900, 999))
+        self.assertEqual(file_delivery.parse_range('bytes=-100', 1000), (900, 999))
+        self.assertEqual(file_delivery.parse_range('bytes=0-5000', 1000), (0, 999))
+        self.assertEqual(file_delivery.parse_range('bytes=1000-', 1000), 'unsatisfiable')
+        self.assertIsNone(file_delivery.parse_range('bytes=0-1,5-9', 1000))
+        self.assertIsNone(file_delivery.parse_range('items=0-1', 1000))
+        self.assertIsNone(file_delivery.parse_range(None, 1000))
+
+    def test_full_and_range_responses(self):
+        url = '/assets/pdf/Sample.pdf'
+        response, body = self.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, CONTENT)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        etag = response['ETag']
+
+        response, body = self.get(url, HTTP_RANGE='bytes=100-199')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(body, CONTENT[100:200])
+        self.assertEqual(response['Content-Length'], '100')
+        self.assertEqual(response['Content-Range'], f'bytes 100-199/{len(CONTENT)}')
+
+        response, body = self.get(url, HTTP_RANGE='bytes=-10', HTTP_IF_RANGE=etag)
+        self.assertEqual((response.status_code, body), (206, CONTENT[-10:]))
+        response, body = self.get(url, HTTP_RANGE='bytes=-10', HTTP_IF_RANGE='"stale"')
+        self.assertEqual((response.status_code, body), (200, CONTENT))
+
+        response, _ = self.get(url, HTTP_RANGE='bytes=20000-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(CONTENT)}')
+
+        response, _ = self.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.client.get('/assets/pdf/missing.pdf').status_code, 404)
+        self.assertEqual(self.client.get('/assets/pdf/').status_code, 404)
+
+    def test_offload_headers(self):
+        with override_settings(FILE_DELIVERY='x-accel-redirect', FILE_DELIVERY_ACCEL_PREFIX='/protected/'):
+            response = self.client.get('/assets/pdf/Sample.pdf')
+            self.assertEqual(response['X-Accel-Redirect'], '/protected/pdf/Sample.pdf')
+            self.assertEqual(response.content, b'')
+        with override_settings(FILE_DELIVERY='x-sendfile'):
+            response = self.client.get('/assets/pdf/Sample.pdf')
+            self.assertEqual(response['X-Sendfile'], os.path.join(self.root, 'pdf', 'Sample.pdf'))
+
+    def test_pdf_download_checks_access(self):
+        pdf = PDF.objects.create(title='Sample', url='http://testserver/assets/pdf/Sample.pdf', company='TCS')
+        external = PDF.objects.create(title='Ext', url='https://example.com/assets/pdf/Sample.pdf', company='TCS')
+        url = reverse('accounts:pdf_download', args=[pdf.pk])
+        self.assertEqual(self.client.get(url).status_code, 403)
+        # the public /assets/ path of a PDF record is checked the same way
+        self.assertEqual(self.client.get('/assets/pdf/Sample.pdf').status_code, 403)
+
+        buyer = UserProfile.objects.create(phone='9000000001')
+        entitlements.grant(buyer, entitlements.COMPANY, 'TCS')
+        session = self.client.session
+        session['phone'] = '9000000001'
+        session.save()
+        response, body = self.get(url, HTTP_RANGE='bytes=0-9')
+        self.assertEqual((response.status_code, body), (206, CONTENT[:10]))
+        response, body = self.get('/assets/pdf/Sample.pdf', HTTP_RANGE='bytes=0-9')
+        self.assertEqual((response.status_code, body), (206, CONTENT[:10]))
+        response = self.client.get(reverse('accounts:pdf_download', args=[external.pk]))
+        self.assertRedirects(response, external.url, fetch_redirect_response=False)
+        self.assertEqual(self.client.get(reverse('accounts:pdf_download', args=[0])).status_code, 404)
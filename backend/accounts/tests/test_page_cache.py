@@ -0,0 +1,81 @@
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.test import TestCase, Client, override_settings
+from accounts import page_cache
+
+
+class PageCacheTests(TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self._write('static-page.html', '{% extends "base-layout.html" %}{% block body %}Hello{% endblock %}')
+        self._write('base-layout.html', '<main>{% block body %}{% endblock %}</main>')
+        self._write('user-page.html', '{% if user.is_authenticated %}Hi {{ user.username }}{% else %}Anon{% endif %}')
+        self._write('header-page.html', '{% include "header.html" %}Body')
+        self._write('header.html', '{% if request.session.user_id or request.session.phone %}Logout{% else %}Login{% endif %}')
+        settings = override_settings(TEMPLATES=[{
+            'BACKEND': 'django.template.backends.django.DjangoTemplates',
+            'DIRS': [self.dir],
+            'OPTIONS': {'context_processors': [
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+            ]},
+        }])
+        settings.enable()
+        self.addCleanup(settings.disable)
+        page_cache.clear()
+        self.addCleanup(page_cache.clear)
+        self.client = Client()
+
+    def _write(self, name, source, mtime=None):
+        path = os.path.join(self.dir, name)
+        with open(path, 'w') as fh:
+            fh.write(source)
+        if mtime:
+            os.utime(path, ns=(mtime, mtime))
+
+    def test_static_page_cached_until_dependency_changes(self):
+        self.assertContains(self.client.get('/static-page.html'), '<main>Hello</main>')
+        with mock.patch.object(page_cache, 'get_template', side_effect=AssertionError('loader hit')):
+            self.assertContains(self.client.get('/static-page.html'), '<main>Hello</main>')
+
+        self._write('base-layout.html', '<section>{% block body %}{% endblock %}</section>', mtime=1)
+        self.assertContains(self.client.get('/static-page.html'), '<section>Hello</section>')
+
+    def test_user_pages_bypass_cache(self):
+        self.assertContains(self.client.get('/user-page.html'), 'Anon')
+        from django.contrib.auth import get_user_model
+        self.client.force_login(get_user_model().objects.create_user(username='pc', password='x'))
+        self.assertContains(self.client.get('/user-page.html'), 'Hi pc')
+
+    def test_login_state_pages_cached_per_state(self):
+        self.assertContains(self.client.get('/header-page.html'), 'LoginBody')
+        session = self.client.session
+        session['user_id'] = 1
+        session.save()
+        self.assertContains(self.client.get('/header-page.html'), 'LogoutBody')
+        with mock.patch.object(page_cache, 'get_template', side_effect=AssertionError('loader hit')):
+            self.assertContains(self.client.get('/header-page.html'), 'LogoutBody')
+            self.client.cookies.clear()
+            self.assertContains(self.client.get('/header-page.html'), 'LoginBody')
+
+    def test_missing_templates_negatively_cached(self):
+        self.assertEqual(self.client.get('/nope/probe.html').status_code, 404)
+        with mock.patch.object(page_cache, 'get_template', side_effect=AssertionError('loader hit')):
+            self.assertEqual(self.client.get('/nope/probe.html').status_code, 404)
+
+
+class SitePageCacheTests(TestCase):
+    def setUp(self):
+        page_cache.clear()
+        self.addCleanup(page_cache.clear)
+
+    def test_company_pdf_page_served_from_cache(self):
+        url = '/company-pdfs/pdf-accenture.html'
+        first = self.client.get(url)
+        self.assertContains(first, 'Accenture PDF Materials')
+        with mock.patch.object(page_cache, 'get_template', side_effect=AssertionError('loader hit')):
+            self.assertEqual(self.client.get(url).content, first.content)
@@ -0,0 +1,87 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from accounts.models import PDF, TestResult
+from accounts import catalog, pagination, profile_cache
+
+
+class CursorPaginationTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = get_user_model().objects.create_user(username='p@example.com', password='x')
+        # Test rollbacks reuse primary keys and skip on_commit write-through
+        profile_cache.invalidate(self.user.pk)
+        now = timezone.now()
+        # Pairs share a timestamp so the id tie-breaker is exercised
+        for n in range(7):
+            TestResult.objects.create(
+                user=self.user, test_name=f'T{n}', total_questions=20, correct_answers=10, score=50,
+                attempt_date=now - timedelta(minutes=n // 2),
+            )
+
+    def test_cursor_roundtrip(self):
+        when = timezone.now()
+        self.assertEqual(pagination.decode_cursor(pagination.encode_cursor(when, 42)), (when, 42))
+        with self.assertRaises(pagination.InvalidCursor):
+            pagination.decode_cursor('not a cursor!')
+
+    def test_walks_every_row_once_in_order(self):
+        url = reverse('accounts:get_user_test_results', args=[self.user.id])
+        seen, cursor = [], None
+        while True:
+            params = {'page_size': 3}
+            if cursor:
+                params['cursor'] = cursor
+            data = self.client.get(url, params).json()
+            self.assertLessEqual(data['count'], 3)
+            seen += [r['id'] for r in data['test_results']]
+            cursor = data['next_cursor']
+            if not cursor:
+                break
+        expected = list(TestResult.objects.order_by('-attempt_date', '-id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+    @override_settings(LIST_MAX_PAGE_SIZE=2)
+    def test_page_size_is_capped(self):
+        url = reverse('accounts:get_user_test_results', args=[self.user.id])
+        self.assertEqual(self.client.get(url, {'page_size': 500}).json()['count'], 2)
+        self.assertEqual(self.client.get(url, {'cursor': '!!'}).status_code, 400)
+
+    def test_catalog_pages(self):
+        catalog.bump()
+        for n in range(3):
+            PDF.objects.create(title=f'PDF {n}', url='https://example.com/x.pdf', company='google')
+        url = reverse('accounts:list_pdfs')
+        first = self.client.get(url, {'page_size': 2}).json()
+        self.assertEqual(len(first['pdfs']), 2)
+        second = self.client.get(url, {'page_size': 2, 'cursor': first['next_cursor']}).json()
+        self.assertEqual(len(second['pdfs']), 1)
+        self.assertIsNone(second['next_cursor'])
+
+    def test_users_list_and_profile_pages(self):
+        for n in range(3):
+            get_user_model().objects.create_user(username=f'u{n}@example.com', password='x')
+        response = self.client.get(reverse('accounts:view_all_users'), {'page_size': 2})
+        self.assertEqual(len(response.context['users']), 2)
+        self.assertEqual(response.context['total_users'], 4)
+        self.assertIsNotNone(response.context['next_cursor'])
+
+        # Later pages seek the (date_joined, id) index instead of sorting auth_user
+        cursor = pagination.encode_cursor(timezone.now(), 10)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('accounts:view_all_users'), {'page_size': 2, 'cursor': cursor})
+        page_sql = next(q['sql'] for q in queries if 'FROM "auth_user"' in q['sql'] and 'LIMIT' in q['sql'])
+        with connection.cursor() as db:
+            db.execute('EXPLAIN QUERY PLAN ' + page_sql)
+            plan = ' '.join(str(row) for row in db.fetchall())
+        self.assertIn('accounts_auth_user_joined_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+        profile = self.client.get(reverse('accounts:user_profile', args=[self.user.id])).json()['profile']
+        self.assertEqual(profile['purchasedItems'], [])
+        self.assertIsNone(profile['purchasedItemsNextCursor'])
@@ -0,0 +1,56 @@
+from django.test import TestCase, Client
+from django.urls import reverse
+from accounts.models import TestResult
+from accounts import papers, question_pool
+from accounts.tests.helpers import make_question
+
+
+def paper_question(n):
+    return make_question(f'Paper question {n}?', 'openai', 'medium', correct_answer='ABCD'[n % 4])
+
+
+class PaperTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        question_pool.invalidate()
+        self.questions = [paper_question(i) for i in range(40)]
+
+    def test_rebuild_reproduces_issued_paper(self):
+        paper = papers.issue('openai', 'medium', 20)
+        self.assertEqual(len(paper.question_ids), 20)
+        self.assertLessEqual(len(paper.paper_id), 32)
+        rebuilt = papers.rebuild(paper.paper_id)
+        self.assertEqual(rebuilt.question_ids, paper.question_ids)
+        self.assertEqual((rebuilt.company, rebuilt.difficulty), ('openai', 'medium'))
+
+    def test_sparse_selection_fits_test_result(self):
+        # 20 picks spread over a large, mostly seen pool: 3-byte deltas
+        selection = tuple(range(0, 2_000_000, 100_000))
+        paper_id = papers.encode_paper_id('openai', 'medium', 20, 2_000_000, 2_000_000, 2**32 - 1, selection)
+        self.assertGreater(len(paper_id), 96)
+        self.assertLessEqual(len(paper_id), TestResult._meta.get_field('paper_id').max_length)
+
+    def test_rebuild_survives_new_questions(self):
+        paper = papers.issue('openai', 'medium', 20)
+        paper_question(100)
+        self.assertEqual(papers.rebuild(paper.paper_id).question_ids, paper.question_ids)
+
+    def test_rebuild_fails_after_delete_in_pool(self):
+        paper = papers.issue('openai', 'medium', 20)
+        self.questions[0].delete()
+        with self.assertRaises(papers.InvalidPaper):
+            papers.rebuild(paper.paper_id)
+
+    def test_tampered_paper_id_rejected(self):
+        paper_id = papers.issue('openai', 'medium', 20).paper_id
+        tampered = ('A' if paper_id[5] != 'A' else 'B').join([paper_id[:5], paper_id[6:]])
+        with self.assertRaises(papers.InvalidPaper):
+            papers.rebuild(tampered)
+        with self.assertRaises(papers.InvalidPaper):
+            papers.rebuild('not-a-paper')
+
+    def test_paper_endpoint_returns_same_questions(self):
+        resp = self.client.get(reverse('accounts:get_questions'), {'company': 'openai', 'difficulty': 'medium'})
+        data = resp.json()
+        review = self.client.get(reverse('accounts:get_paper'), {'paper_id': data['paper_id']}).json()
+        self.assertEqual(review['questions'], data['questions'])
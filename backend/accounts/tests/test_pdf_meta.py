@@ -0,0 +1,96 @@
+import os
+import shutil
+import tempfile
+import zlib
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from accounts.models import PDF
+from accounts import catalog, pdf_meta
+
+
+def make_pdf(pages):
+    kids = ' '.join(f'{3 + n} 0 R' for n in range(pages))
+    objects = [
+        '<< /Type /Catalog /Pages 2 0 R >>',
+        f'<< /Type /Pages /Kids [{kids}] /Count {pages} >>',
+    ] + ['<< /Type /Page /Parent 2 0 R /MediaBox [0 0 200 200] >>'] * pages
+    body = '%PDF-1.4\n' + ''.join(f'{n + 1} 0 obj\n{obj}\nendobj\n' for n, obj in enumerate(objects))
+    return (body + 'trailer\n<< /Root 1 0 R >>\n%%EOF\n').encode()
+
+
+class PdfMetaTests(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, True)
+        os.makedirs(os.path.join(self.root, 'pdf'))
+        overrides = override_settings(MEDIA_ROOT=self.root, PDF_META_ROOT=os.path.join(self.root, 'meta'))
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        catalog.bump()
+
+    def write(self, name, data):
+        with open(os.path.join(self.root, 'pdf', name), 'wb') as fh:
+            fh.write(data)
+
+    def test_update_skips_unchanged_files_and_known_hashes(self):
+        self.write('a.pdf', make_pdf(3))
+        self.write('b.pdf', make_pdf(5))
+        self.assertEqual(pdf_meta.update(workers=2), (2, 0))
+        meta = pdf_meta.for_url('/assets/pdf/b.pdf')
+        self.assertEqual((meta['pages'], meta['bytes']), (5, len(make_pdf(5))))
+        self.assertEqual(meta['sha256'], pdf_meta.file_sha256(os.path.join(self.root, 'pdf', 'b.pdf')))
+
+        with mock.patch.object(pdf_meta, '_inspect', wraps=pdf_meta._inspect) as inspect:
+            self.assertEqual(pdf_meta.update(), (0, 2))
+            self.write('copy.pdf', make_pdf(3))
+            self.assertEqual(pdf_meta.update(), (1, 2))
+            self.assertFalse(inspect.called)
+            os.remove(os.path.join(self.root, 'pdf', 'a.pdf'))
+            pdf_meta.update(force=True)
+            self.assertEqual(inspect.call_count, 2)
+        self.assertIsNone(pdf_meta.for_url('/assets/pdf/a.pdf'))
+        self.assertEqual(pdf_meta.for_url('http://testserver/assets/pdf/copy.pdf')['pages'], 3)
+        self.assertIsNone(pdf_meta.for_url('https://example.com/x.pdf'))
+
+    def test_page_count_in_object_streams(self):
+        packed = zlib.compress(b'1 0 2 40 << /Type /Page >> << /Type /Page >>')
+        data = b'%PDF-1.5\n5 0 obj\n<< /Type /ObjStm /N 2 /Filter /FlateDecode >>\nstream\n' + packed + b'\nendstream\n'
+        self.assertEqual(pdf_meta._scan_page_count(data), 2)
+        self.assertEqual(pdf_meta._scan_page_count(make_pdf(4)), 4)
+        self.assertIsNone(pdf_meta._scan_page_count(b'not a pdf'))
+
+    def test_saved_pdf_is_described_in_list_pdfs(self):
+        self.write('new.pdf', make_pdf(2))
+        with self.captureOnCommitCallbacks(execute=True):
+            PDF.objects.create(title='New', url='http://testserver/assets/pdf/new.pdf', company='TCS')
+            PDF.objects.create(title='Ext', url='https://example.com/x.pdf', company='TCS')
+            # nothing is hashed inside the save's transaction
+            self.assertIsNone(pdf_meta.for_url('/assets/pdf/new.pdf'))
+        pdfs = {p['title']: p for p in self.client.get(reverse('accounts:list_pdfs')).json()['pdfs']}
+        self.assertEqual(pdfs['New']['meta']['pages'], 2)
+        self.assertIsNone(pdfs['Ext']['meta'])
+        self.assertEqual(self.client.get(reverse('accounts:pdf_thumbnail', args=['0' * 64])).status_code, 404)
+
+    def test_concurrent_updates_merge_index_entries(self):
+        self.write('a.pdf', make_pdf(1))
+        self.write('b.pdf', make_pdf(2))
+        extract = pdf_meta.extract
+
+        def racing_extract(path, root, force=False):
+            # another writer indexes b.pdf while a.pdf is being extracted
+            if path.endswith('a.pdf'):
+                pdf_meta.update(['pdf/b.pdf'])
+            return extract(path, root, force)
+
+        with mock.patch.object(pdf_meta, 'extract', side_effect=racing_extract):
+            pdf_meta.update(['pdf/a.pdf'])
+        self.assertEqual(set(pdf_meta.load_index()), {'pdf/a.pdf', 'pdf/b.pdf'})
+
+    def test_command(self):
+        self.write('a.pdf', make_pdf(1))
+        call_command('build_pdf_meta', workers=1, stdout=open(os.devnull, 'w'), stderr=open(os.devnull, 'w'))
+        self.assertEqual(pdf_meta.for_url('/assets/pdf/a.pdf')['pages'], 1)
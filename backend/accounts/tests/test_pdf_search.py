@@ -0,0 +1,111 @@
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from accounts.models import PDF, PdfPage, PdfText, UserProfile
+from accounts import entitlements, pdf_search, question_search
+
+PAGES = {
+    b'tcs': ['Aptitude round', 'Time and work: pipes fill a <tank>', ''],
+    b'infosys': ['Puzzles', 'Time and distance problems'],
+}
+
+
+def fake_extract(path):
+    with open(path, 'rb') as fh:
+        return list(PAGES[fh.read()])
+
+
+class PdfSearchTests(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, True)
+        os.makedirs(os.path.join(self.root, 'pdf'))
+        overrides = override_settings(MEDIA_ROOT=self.root, PDF_META_ROOT=os.path.join(self.root, 'meta'))
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        for patch in (
+            mock.patch.object(pdf_search, 'EXTRACTION_AVAILABLE', True),
+            mock.patch.object(pdf_search, 'extract_pages', side_effect=fake_extract),
+        ):
+            self.extract = patch.start()
+            self.addCleanup(patch.stop)
+
+        self.tcs = self.make_pdf('tcs.pdf', b'tcs', 'TCS')
+        self.infosys = self.make_pdf('infosys.pdf', b'infosys', 'Infosys')
+        PDF.objects.create(title='External', url='https://example.com/x.pdf', company='TCS')
+
+    def make_pdf(self, name, data, company):
+        with open(os.path.join(self.root, 'pdf', name), 'wb') as fh:
+            fh.write(data)
+        return PDF.objects.create(title=f'{company} notes', url=f'/assets/pdf/{name}', company=company)
+
+    def test_index_is_incremental_and_drops_missing_files(self):
+        self.assertEqual(pdf_search.index(), (2, 0, 0))
+        self.assertEqual(PdfText.objects.get(pdf=self.tcs).pages, 3)
+        # blank pages are not stored
+        self.assertEqual(PdfPage.objects.filter(pdf=self.tcs).count(), 2)
+
+        self.extract.reset_mock()
+        self.assertEqual(pdf_search.index(), (0, 2, 0))
+        self.extract.assert_not_called()
+
+        os.remove(os.path.join(self.root, 'pdf', 'infosys.pdf'))
+        self.assertEqual(pdf_search.index(), (0, 1, 1))
+        self.assertFalse(PdfPage.objects.filter(pdf=self.infosys).exists())
+
+    def test_search_returns_pages_and_respects_companies(self):
+        pdf_search.index()
+        hits, has_more = pdf_search.search('time')
+        self.assertEqual({(h['pdfId'], h['page']) for h in hits}, {(self.tcs.id, 2), (self.infosys.id, 2)})
+        self.assertFalse(has_more)
+
+        hits, _ = pdf_search.search('tank')
+        self.assertIn('<mark>tank</mark>', hits[0]['snippet'])
+        self.assertNotIn('<tank>', hits[0]['snippet'])
+
+        hits, _ = pdf_search.search('time', companies=['Infosys'])
+        self.assertEqual([h['pdfId'] for h in hits], [self.infosys.id])
+        self.assertEqual(pdf_search.search('time', companies=[]), ([], False))
+
+        hits, has_more = pdf_search.search('time', page_size=1)
+        self.assertEqual(len(hits), 1)
+        self.assertTrue(has_more)
+
+    def test_search_scan_fallback(self):
+        pdf_search.index()
+        with mock.patch.object(question_search, 'fts_available', return_value=False):
+            hits, has_more = pdf_search.search('Time', companies=['TCS', 'Infosys'], page_size=1)
+            self.assertEqual([(h['pdfId'], h['page'], h['rank']) for h in hits], [(self.tcs.id, 2, None)])
+            self.assertTrue(has_more)
+            self.assertEqual(pdf_search.search('   '), ([], False))
+
+    def test_index_follows_page_deletes(self):
+        pdf_search.index()
+        self.tcs.delete()
+        self.assertEqual([h['pdfId'] for h in pdf_search.search('time')[0]], [self.infosys.id])
+
+    def test_endpoint_applies_entitlements(self):
+        pdf_search.index()
+        url = reverse('accounts:search_pdfs')
+        self.assertEqual(self.client.get(url, {'q': 'time'}).status_code, 401)
+
+        profile = UserProfile.objects.create(phone='9000000019')
+        entitlements.invalidate(profile.pk)
+        session = self.client.session
+        session['phone'] = profile.phone
+        session.save()
+        self.assertEqual(self.client.get(url, {'q': 'time'}).json()['results'], [])
+
+        entitlements.grant(profile, entitlements.COMPANY, 'TCS')
+        data = self.client.get(url, {'q': 'time'}).json()
+        self.assertEqual([(h['pdfId'], h['page']) for h in data['results']], [(self.tcs.id, 2)])
+
+        entitlements.grant(profile, entitlements.ALL)
+        data = self.client.get(url, {'q': 'time', 'company': 'Infosys'}).json()
+        self.assertEqual([h['pdfId'] for h in data['results']], [self.infosys.id])
+        self.assertEqual(self.client.get(url).status_code, 400)
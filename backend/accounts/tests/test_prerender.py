@@ -0,0 +1,66 @@
+import json
+import os
+import shutil
+import tempfile
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from accounts.models import CompanyProfile
+from accounts import company_kb, page_cache, prerender
+
+
+class PrerenderTests(TestCase):
+    def setUp(self):
+        company_kb.bump()
+        page_cache.clear()
+        self.output = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output, True)
+
+    def manifest(self):
+        with open(os.path.join(self.output, prerender.MANIFEST_NAME)) as fh:
+            return json.load(fh)['pages']
+
+    def test_build_is_incremental(self):
+        first = prerender.build(self.output)
+        self.assertGreater(first.rendered, 0)
+        pages = self.manifest()
+
+        company = pages['/company/goldman-sachs/']
+        self.assertEqual(company['mode'], 'anonymous')
+        with open(os.path.join(self.output, company['file']), encoding='utf-8') as fh:
+            self.assertIn('Goldman Sachs', fh.read())
+        static = [url for url, entry in pages.items() if entry['mode'] == 'static']
+        self.assertTrue(any(url.startswith('/tests/') for url in static))
+
+        second = prerender.build(self.output)
+        self.assertEqual(second.rendered, 0)
+        self.assertEqual(second.unchanged, first.rendered)
+
+        profile = CompanyProfile.objects.get(slug='tcs')
+        profile.profile['tagline'] = 'Prerender tagline'
+        profile.save()
+        third = prerender.build(self.output)
+        self.assertEqual(third.rendered, 1)
+        with open(os.path.join(self.output, 'company/tcs/index.html'), encoding='utf-8') as fh:
+            self.assertIn('Prerender tagline', fh.read())
+
+        CompanyProfile.objects.filter(slug='tcs').delete()
+        fourth = prerender.build(self.output)
+        self.assertEqual((fourth.rendered, fourth.removed), (0, 1))
+        self.assertFalse(os.path.exists(os.path.join(self.output, 'company/tcs/index.html')))
+        self.assertNotIn('/company/tcs/', self.manifest())
+
+    def test_render_records_extended_templates(self):
+        response, files, used = prerender.render('/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual({os.path.basename(name) for name in files}, {'index.html', 'base.html'})
+        # recording is scoped to the block
+        with page_cache.recording() as outside:
+            pass
+        prerender.render('/')
+        self.assertEqual(outside, [])
+
+    def test_command(self):
+        call_command('prerender_site', output=self.output, stdout=open(os.devnull, 'w'))
+        self.assertTrue(self.manifest())
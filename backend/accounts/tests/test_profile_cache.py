@@ -0,0 +1,93 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import AttemptedMock, Item, Mock, PurchasedItem, TestResult
+from accounts import pagination, profile_cache, realtime
+
+
+class ProfileCacheTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='agg@example.com', password='x', first_name='Agg')
+        # Test rollbacks reuse primary keys and skip on_commit write-through
+        profile_cache.invalidate(self.user.pk)
+        self.item = Item.objects.create(item_type='pdf', title='Pack')
+        self.mock = Mock.objects.create(title='Mock')
+        now = timezone.now()
+        for n in range(5):
+            TestResult.objects.create(
+                user=self.user, test_name=f'T{n}', total_questions=10, correct_answers=n, score=n * 10,
+                attempt_date=now - timedelta(minutes=n // 2),
+            )
+        PurchasedItem.objects.create(user=self.user, item=self.item, title='Pack', item_type='pdf')
+        emit = mock.patch.object(realtime, 'emit')
+        emit.start()
+        self.addCleanup(emit.stop)
+
+    def test_header_is_one_cache_get_and_lists_are_keyset_pages(self):
+        aggregate = profile_cache.get(self.user.pk)
+        self.assertEqual(aggregate['stats']['totalTests'], 5)
+        self.assertEqual(aggregate['stats']['averageTestScore'], 20)
+        self.assertEqual(aggregate['stats']['bestTestScore'], 40)
+        self.assertEqual(aggregate['user']['firstName'], 'Agg')
+        self.assertNotIn('testResults', aggregate)
+        with self.assertNumQueries(0):
+            profile_cache.get(self.user.pk)
+        # one indexed page query per list, however long the history
+        with self.assertNumQueries(2):
+            self.client.get(reverse('accounts:user_profile', args=[self.user.pk]))
+        self.assertIsNone(profile_cache.get(self.user.pk + 1000))
+
+        url = reverse('accounts:get_user_test_results', args=[self.user.pk])
+        names, cursor = [], ''
+        while cursor is not None:
+            with self.assertNumQueries(1):
+                data = self.client.get(url, {'cursor': cursor, 'page_size': 2}).json()
+            names += [r['testName'] for r in data['test_results']]
+            cursor = data['next_cursor']
+        sql = pagination.paginate(TestResult.objects.filter(user=self.user), 'attempt_date', page_size=5)
+        self.assertEqual(names, [r.test_name for r in sql.items])
+
+    def test_writes_update_the_aggregate_in_place(self):
+        version = profile_cache.get(self.user.pk)['version']
+        with mock.patch.object(profile_cache, 'build') as build:
+            with self.captureOnCommitCallbacks(execute=True):
+                attempt = AttemptedMock.objects.create(user=self.user, mock=self.mock, score=70)
+            with self.captureOnCommitCallbacks(execute=True):
+                TestResult.objects.filter(test_name='T0').delete()
+            with self.captureOnCommitCallbacks(execute=True):
+                attempt.score = 90
+                attempt.save()
+            aggregate = profile_cache.get(self.user.pk)
+            build.assert_not_called()
+        self.assertEqual(aggregate['version'], version + 3)
+        self.assertEqual(aggregate['stats']['totalMockAttempts'], 1)
+        self.assertEqual(aggregate['stats']['averageMockScore'], 90)
+        self.assertEqual(aggregate['stats']['totalTests'], 4)
+        self.assertEqual(aggregate['stats']['averageTestScore'], 25)
+
+    def test_missed_update_drops_the_aggregate(self):
+        profile_cache.get(self.user.pk)
+        # written without running on_commit: the cached version falls behind
+        AttemptedMock.objects.create(user=self.user, mock=self.mock, score=10)
+        with self.captureOnCommitCallbacks(execute=True):
+            AttemptedMock.objects.create(user=self.user, mock=self.mock, score=20)
+        stats = profile_cache.get(self.user.pk)['stats']
+        self.assertEqual((stats['totalMockAttempts'], stats['averageMockScore']), (2, 15))
+
+    def test_account_changes_and_profile_page(self):
+        profile_cache.get(self.user.pk)
+        self.user.first_name = 'Renamed'
+        self.user.save()
+        self.assertEqual(profile_cache.get(self.user.pk)['user']['firstName'], 'Renamed')
+
+        session = self.client.session
+        session['user_id'] = self.user.pk
+        session.save()
+        response = self.client.get(reverse('accounts:profile'))
+        self.assertContains(response, 'T4')
+        self.assertContains(response, 'Type: Pdf')
@@ -0,0 +1,70 @@
+import json
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import AttemptedMock, Item, Mock, PurchasedItem
+from accounts import profile_cache, profile_events, realtime
+
+
+class ProfileEventTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='delta', password='x')
+        profile_cache.invalidate(self.user.pk)
+        self.item = Item.objects.create(item_type='pdf', title='TCS pack')
+        self.mock = Mock.objects.create(title='Mock 1')
+        emit = mock.patch.object(realtime, 'emit')
+        self.emit = emit.start()
+        self.addCleanup(emit.stop)
+
+    def post(self, name, body):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse(f'accounts:{name}'), json.dumps(body), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_writes_emit_versioned_deltas(self):
+        PurchasedItem.objects.create(user=self.user, item=self.item, title='old', item_type='pdf')
+        data = self.post('purchase', {'userId': self.user.id, 'itemId': self.item.id})
+        self.assertEqual(data['event'], 'purchaseAdded')
+        self.assertEqual(data['version'], 2)
+        self.assertEqual(data['purchase']['title'], 'TCS pack')
+        self.assertNotIn('user', data)
+        self.emit.assert_called_once_with(
+            self.user.id, 'purchaseAdded', {'version': 2, 'purchase': data['purchase']},
+        )
+
+        data = self.post('mock_attempt', {'userId': self.user.id, 'mockId': self.mock.id, 'score': 80})
+        self.assertEqual((data['event'], data['version'], data['attempt']['score']), ('attemptAdded', 3, 80))
+
+        profile = self.client.get(reverse('accounts:user_profile', args=[self.user.id])).json()['profile']
+        self.assertEqual(profile['version'], 3)
+
+    def test_write_does_not_reread_history(self):
+        for n in range(5):
+            PurchasedItem.objects.create(user=self.user, item=self.item, title=f'p{n}', item_type='pdf')
+        body = json.dumps({'userId': self.user.id, 'itemId': self.item.id})
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(reverse('accounts:purchase'), body, content_type='application/json')
+        reads = [q['sql'] for q in queries if q['sql'].startswith('SELECT') and 'accounts_purchaseditem' in q['sql']]
+        self.assertEqual(reads, [])
+
+    def test_edits_and_deletes_publish_profile_changed(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            attempt = AttemptedMock.objects.create(user=self.user, mock=self.mock, score=10)
+            attempt.score = 20
+            attempt.save()
+            attempt.delete()
+        self.assertEqual(
+            [c.args[1:] for c in self.emit.call_args_list][1:],
+            [('profileChanged', {'version': 2}), ('profileChanged', {'version': 3})],
+        )
+
+    def test_user_deletion_cascades_cleanly(self):
+        PurchasedItem.objects.create(user=self.user, item=self.item, title='p', item_type='pdf')
+        self.user.delete()
+        self.assertEqual(profile_events.current(self.user.id), 0)
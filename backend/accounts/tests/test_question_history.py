@@ -0,0 +1,74 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, Client
+from django.urls import reverse
+from accounts.idset import IdSet
+from accounts import papers, question_history, question_pool
+from accounts.tests.helpers import make_question
+
+
+class IdSetTests(TestCase):
+    def test_roundtrip_sparse_and_dense_containers(self):
+        ids = set(range(0, 20000, 3)) | {70000, 70001, 2 ** 33 + 5}
+        idset = IdSet(ids)
+        restored, offset = IdSet.from_bytes(idset.to_bytes())
+        self.assertEqual(set(restored), ids)
+        self.assertEqual(len(restored), len(ids))
+        self.assertIn(70001, restored)
+        self.assertNotIn(70002, restored)
+        restored.difference_update(range(0, 20000, 3))
+        self.assertEqual(set(restored), {70000, 70001, 2 ** 33 + 5})
+
+
+class SeenQuestionTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        question_pool.invalidate()
+        self.ids = [
+            make_question(f'History question {n}?', difficulty='medium').id
+            for n in range(50)
+        ]
+        self.user = get_user_model().objects.create_user(username='h@example.com', email='h@example.com', password='x')
+
+    def test_papers_avoid_seen_and_stay_rebuildable(self):
+        seen = question_history.SeenQuestions()
+        served = []
+        for _ in range(2):
+            paper = papers.issue('google', 'medium', 20, seen=seen)
+            self.assertTrue(set(paper.question_ids).isdisjoint(served))
+            self.assertEqual(papers.rebuild(paper.paper_id).question_ids, paper.question_ids)
+            served += paper.question_ids
+            seen.mark(paper.question_ids)
+
+        # Only 10 unseen remain: they all appear, topped up with seen ones
+        paper = papers.issue('google', 'medium', 20, seen=seen)
+        self.assertEqual(len(paper.question_ids), 20)
+        self.assertTrue(set(self.ids) - set(served) <= set(paper.question_ids))
+        self.assertEqual(papers.rebuild(paper.paper_id).question_ids, paper.question_ids)
+
+    def test_least_recently_seen_used_first(self):
+        seen = question_history.SeenQuestions()
+        old, recent = self.ids[:25], self.ids[25:]
+        seen.mark(old)
+        seen.buckets.insert(0, IdSet())
+        seen.mark(recent)
+        paper = papers.issue('google', 'medium', 20, seen=seen)
+        self.assertTrue(set(paper.question_ids) <= set(old))
+
+    def test_large_mostly_seen_pool_falls_back_to_least_recent(self):
+        ids = [make_question(f'Large pool question {n}?', difficulty='hard').id for n in range(400)]
+        unseen, old, recent = ids[:5], ids[5:200], ids[200:]
+        seen = question_history.SeenQuestions([IdSet(recent), IdSet(old)])
+        paper = papers.issue('google', 'hard', 20, seen=seen)
+        self.assertEqual(len(paper.question_ids), 20)
+        self.assertTrue(set(unseen) <= set(paper.question_ids))
+        self.assertTrue(set(paper.question_ids) <= set(unseen) | set(old))
+        self.assertLess(len(paper.paper_id), 120)
+        self.assertEqual(papers.rebuild(paper.paper_id).question_ids, paper.question_ids)
+
+    def test_get_questions_records_history(self):
+        self.client.post(reverse('accounts:login_page'), {'email': 'h@example.com', 'password': 'x'})
+        url = reverse('accounts:get_questions')
+        first = {q['id'] for q in self.client.get(url, {'company': 'google', 'difficulty': 'medium'}).json()['questions']}
+        second = {q['id'] for q in self.client.get(url, {'company': 'google', 'difficulty': 'medium'}).json()['questions']}
+        self.assertFalse(first & second)
+        self.assertEqual(len(question_history.load(self.user)), 40)
@@ -0,0 +1,64 @@
+import io
+import json
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.test import TestCase
+from accounts.models import Question
+from accounts import question_pool, question_payloads
+
+
+def row(n, answer='A'):
+    return {
+        'company': 'microsoft', 'difficulty': 'easy', 'question_text': f'Imported question {n}?',
+        'option_a': 'a', 'option_b': 'b', 'option_c': 'c', 'option_d': 'd',
+        'correct_answer': answer, 'explanation': '',
+    }
+
+
+class ImportQuestionsTests(TestCase):
+    def setUp(self):
+        question_pool.invalidate()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def write_jsonl(self, rows):
+        path = os.path.join(self.tmpdir.name, 'bank.jsonl')
+        with open(path, 'w', encoding='utf-8') as fh:
+            for r in rows:
+                fh.write(json.dumps(r) + '\n')
+        return path
+
+    def test_reimport_keeps_ids_and_updates_rows(self):
+        path = self.write_jsonl([row(n) for n in range(25)] + [{'company': 'nope'}])
+        call_command('import_questions', path, '--chunk-size', '10', stdout=io.StringIO())
+        ids = dict(Question.objects.values_list('question_text', 'id'))
+        self.assertEqual(len(ids), 25)
+        self.assertEqual(len(question_pool.get_pool('microsoft', 'easy')), 25)
+
+        first = Question.objects.get(question_text='Imported question 0?')
+        question_payloads.get_fragments([first.id])
+
+        path = self.write_jsonl([row(n, answer='C') for n in range(30)])
+        call_command('import_questions', path, stdout=io.StringIO())
+        self.assertEqual(Question.objects.count(), 30)
+        for text, question_id in ids.items():
+            self.assertEqual(Question.objects.get(question_text=text).id, question_id)
+        self.assertEqual(set(Question.objects.values_list('correct_answer', flat=True)), {'C'})
+        fragment = question_payloads.get_fragments([first.id])[0]
+        self.assertEqual(json.loads(fragment)['correctAnswer'], 'C')
+
+    def test_csv_import(self):
+        path = os.path.join(self.tmpdir.name, 'bank.csv')
+        with open(path, 'w', encoding='utf-8', newline='') as fh:
+            fh.write('company,difficulty,question_text,option_a,option_b,option_c,option_d,correct_answer\n')
+            fh.write('google,hard,"CSV question, with comma?",a,b,c,d,b\n')
+        call_command('import_questions', path, stdout=io.StringIO())
+        self.assertEqual(Question.objects.get().correct_answer, 'B')
+
+    def test_seed_questions_is_idempotent(self):
+        call_command('seed_questions', stdout=io.StringIO())
+        ids = set(Question.objects.values_list('id', flat=True))
+        call_command('seed_questions', stdout=io.StringIO())
+        self.assertEqual(set(Question.objects.values_list('id', flat=True)), ids)
@@ -0,0 +1,71 @@
+from django.test import TestCase, Client
+from django.urls import reverse
+import json
+from accounts import question_pool, question_payloads
+from accounts.tests.helpers import make_question
+
+
+class QuestionPoolTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        question_pool.invalidate()
+        self.questions = [make_question(f'Question {i}?') for i in range(30)]
+        make_question('Question 99?', difficulty='hard')
+
+    def test_pool_holds_sorted_ids_for_key(self):
+        pool = question_pool.get_pool('google', 'easy')
+        self.assertEqual(list(pool), [q.id for q in self.questions])
+
+    def test_sample_is_distinct_and_bounded(self):
+        ids = question_pool.sample_ids('google', 'easy', 20)
+        self.assertEqual(len(ids), 20)
+        self.assertEqual(len(set(ids)), 20)
+        self.assertEqual(len(question_pool.sample_ids('google', 'hard', 20)), 1)
+        self.assertEqual(question_pool.sample_ids('uber', 'easy', 20), [])
+
+    def test_pool_refreshes_on_question_change(self):
+        self.assertEqual(len(question_pool.get_pool('google', 'easy')), 30)
+        new_q = make_question('Question 100?')
+        self.assertIn(new_q.id, question_pool.get_pool('google', 'easy'))
+        new_q.delete()
+        self.assertEqual(len(question_pool.get_pool('google', 'easy')), 30)
+
+    def test_fetch_preserves_sample_order(self):
+        ids = question_pool.sample_ids('google', 'easy', 10)
+        self.assertEqual([q.id for q in question_pool.fetch_questions(ids)], ids)
+
+    def test_get_questions_endpoint(self):
+        resp = self.client.get(reverse('accounts:get_questions'), {'company': 'google', 'difficulty': 'easy'})
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()
+        self.assertEqual(data['count'], 20)
+        self.assertEqual(len({q['id'] for q in data['questions']}), 20)
+
+
+class QuestionPayloadTests(TestCase):
+    def setUp(self):
+        question_pool.invalidate()
+        self.questions = [make_question(f'Question {i}?') for i in range(5)]
+
+    def test_body_matches_as_dict(self):
+        ids = [q.id for q in self.questions]
+        body = question_payloads.build_body(question_payloads.get_fragments(ids), company='google')
+        data = json.loads(body)
+        self.assertEqual(data['questions'], [q.as_dict() for q in self.questions])
+        self.assertEqual(data['count'], 5)
+        self.assertEqual(data['company'], 'google')
+
+    def test_fragment_refreshed_after_save(self):
+        q = self.questions[0]
+        question_payloads.get_fragments([q.id])
+        q.question_text = 'Edited?'
+        q.save()
+        fragment = question_payloads.get_fragments([q.id])[0]
+        self.assertEqual(json.loads(fragment)['questionText'], 'Edited?')
+
+    def test_deleted_question_skipped(self):
+        q = self.questions[0]
+        question_payloads.get_fragments([q.id])
+        q_id = q.id
+        q.delete()
+        self.assertEqual(question_payloads.get_fragments([q_id]), [])
@@ -0,0 +1,46 @@
+from django.test import TestCase, Client
+from django.urls import reverse
+from accounts import question_search
+from accounts.tests.helpers import make_question
+
+
+class QuestionSearchTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.bsearch = make_question('What is the complexity of binary search?')
+        self.tree = make_question('How is a binary tree balanced?', company='uber')
+        self.queue = make_question('Which structure is FIFO?', explanation='A queue <b>processes</b> in order.')
+
+    def test_match_expression_is_sanitised(self):
+        self.assertEqual(question_search.match_expression('binary "sea'), '"binary" "sea"*')
+        self.assertEqual(question_search.match_expression('  ^*() '), '')
+
+    def test_ranked_hits_with_filters(self):
+        hits, has_more = question_search.search('binary')
+        self.assertEqual({h['id'] for h in hits}, {self.bsearch.id, self.tree.id})
+        self.assertFalse(has_more)
+        hits, _ = question_search.search('binary', company='uber')
+        self.assertEqual([h['id'] for h in hits], [self.tree.id])
+
+    def test_explanation_snippet_is_escaped(self):
+        hits, _ = question_search.search('queue')
+        self.assertEqual(hits[0]['id'], self.queue.id)
+        self.assertIn('<mark>queue</mark>', hits[0]['snippet'])
+        self.assertIn('&lt;b&gt;', hits[0]['snippet'])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.queue.question_text = 'Which structure is LIFO?'
+        self.queue.save()
+        self.assertEqual(question_search.search('FIFO')[0], [])
+        self.tree.delete()
+        self.assertEqual([h['id'] for h in question_search.search('binary')[0]], [self.bsearch.id])
+
+    def test_endpoint_paginates(self):
+        for n in range(5):
+            make_question(f'Paging question number {n} about heaps?')
+        url = reverse('accounts:search_questions')
+        data = self.client.get(url, {'q': 'heaps', 'page_size': 3}).json()
+        self.assertEqual((data['count'], data['has_more']), (3, True))
+        data = self.client.get(url, {'q': 'heaps', 'page_size': 3, 'page': 2}).json()
+        self.assertEqual((data['count'], data['has_more']), (2, False))
+        self.assertEqual(self.client.get(url).status_code, 400)
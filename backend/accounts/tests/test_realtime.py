@@ -0,0 +1,105 @@
+import threading
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from accounts import realtime
+
+
+class FakeClient:
+    """Stands in for socketio.Client; `failures` connects fail first."""
+
+    failures = 0
+
+    def __init__(self, log):
+        self.log = log
+        self.connected = False
+
+    def connect(self, url, **kwargs):
+        if FakeClient.failures:
+            FakeClient.failures -= 1
+            raise ConnectionError('refused')
+        self.connected = True
+        self.log.append(('connect', url))
+
+    def emit(self, event, data):
+        self.log.append((event, data))
+
+    def disconnect(self):
+        self.connected = False
+
+
+class EmitterTests(SimpleTestCase):
+    def setUp(self):
+        self.log = []
+        FakeClient.failures = 0
+        self.emitter = realtime.Emitter('http://node:3000', 3, client_factory=lambda: FakeClient(self.log))
+        self.addCleanup(self.emitter.close)
+
+    def drain(self):
+        self.emitter.queue.join()
+
+    def test_one_connection_for_many_events(self):
+        for n in range(3):
+            self.assertTrue(self.emitter.emit(7, 'profileUpdated', {'n': n}))
+        self.drain()
+        self.assertEqual(self.log[0], ('connect', 'http://node:3000'))
+        self.assertEqual(
+            self.log[1:],
+            [('server_emit', {'to': '7', 'event': 'profileUpdated', 'payload': {'n': n}}) for n in range(3)],
+        )
+        self.assertEqual(self.emitter.stats(), {
+            'received': 3, 'sent': 3, 'coalesced': 0, 'dropped': 0, 'failed': 0, 'reconnects': 0, 'queued': 0,
+        })
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        gate = threading.Event()
+        with mock.patch.object(self.emitter, '_send', side_effect=lambda message: gate.wait()):
+            results = [self.emitter.emit(1, 'e', n) for n in range(6)]
+            # one taken by the blocked thread, three queued
+            self.assertIn(False, results)
+            gate.set()
+            self.drain()
+        self.assertEqual(self.emitter.counts['dropped'], results.count(False))
+
+    def test_reconnects_with_backoff(self):
+        FakeClient.failures = 2
+        with mock.patch.object(realtime, 'BACKOFF_INITIAL', 0.001):
+            self.emitter.emit(1, 'e', 'payload')
+            self.drain()
+        self.assertEqual(self.log[-1], ('server_emit', {'to': '1', 'event': 'e', 'payload': 'payload'}))
+        self.assertEqual(self.emitter.counts['reconnects'], 2)
+        self.assertEqual(self.emitter.counts['sent'], 1)
+
+    def test_bursts_are_coalesced_per_room(self):
+        emitter = realtime.Emitter('http://node:3000', 10, client_factory=lambda: FakeClient(self.log), window=0.05)
+        for n in range(3):
+            emitter.emit(7, 'attemptAdded', {'version': n})
+        emitter.emit(8, 'purchaseAdded', {'version': 1})
+        emitter.close()
+        self.assertEqual(self.log[1:], [
+            ('server_emit', {'to': '7', 'event': 'eventBatch', 'payload': {'events': [
+                {'event': 'attemptAdded', 'payload': {'version': n}} for n in range(3)
+            ]}}),
+            ('server_emit', {'to': '8', 'event': 'purchaseAdded', 'payload': {'version': 1}}),
+        ])
+        stats = emitter.stats()
+        self.assertEqual((stats['received'], stats['sent'], stats['coalesced']), (4, 2, 2))
+
+    def test_window_closes_after_its_deadline(self):
+        emitter = realtime.Emitter('http://node:3000', 10, client_factory=lambda: FakeClient(self.log), window=0.01)
+        self.addCleanup(emitter.close)
+        emitter.emit(7, 'e', 1)
+        deadline = time.monotonic() + 5
+        while emitter.stats()['sent'] < 1 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        emitter.emit(7, 'e', 2)
+        emitter.close()
+        self.assertEqual([entry[1]['payload'] for entry in self.log[1:]], [1, 2])
+
+    def test_module_emit_uses_shared_emitter(self):
+        emitter = mock.Mock()
+        with mock.patch.object(realtime, '_emitter', emitter):
+            realtime.emit(5, 'profileUpdated', {})
+        emitter.emit.assert_called_once_with(5, 'profileUpdated', {})
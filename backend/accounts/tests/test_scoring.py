@@ -0,0 +1,124 @@
+import json
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, Client
+from django.urls import reverse
+from accounts.models import AbilityEstimate, Question, TestResult
+from accounts import papers, profile_cache, profile_events, question_pool, realtime, scoring
+from accounts.tests.helpers import make_question
+
+
+class ScoringTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        question_pool.invalidate()
+        for n in range(20):
+            make_question(f'Scoring question {n}?', 'uber', 'hard', correct_answer='ABCD'[n % 4])
+        self.paper = papers.issue('uber', 'hard', 20)
+        self.key = scoring.answer_key(self.paper)
+
+    def test_encode_answers(self):
+        self.assertEqual(scoring.encode_answers({'0': 'a', '2': 'D', '9': 'x'}, 4), b'A-D-')
+        self.assertEqual(scoring.encode_answers(['B', None, 'C'], 3), b'B-C')
+        with self.assertRaises(ValueError):
+            scoring.encode_answers(5, 3)
+
+    def test_score_and_score_many_agree(self):
+        all_right = self.key
+        half = self.key[:10] + b'-' * 10
+        wrong = bytes(ord('A') if c != ord('A') else ord('B') for c in self.key)
+        singles = [scoring.score(self.key, s) for s in (all_right, half, wrong)]
+        self.assertEqual(singles, scoring.score_many(self.key, [all_right, half, wrong]))
+        self.assertEqual(singles[0], scoring.Score(20, 20, 20, 0, 100))
+        self.assertEqual(singles[1], scoring.Score(20, 10, 10, 0, 50))
+        self.assertEqual(singles[2].correct, 0)
+
+    def test_submit_test_ignores_client_numbers(self):
+        User = get_user_model()
+        User.objects.create_user(username='s@example.com', email='s@example.com', password='x')
+        answers = {str(i): chr(c) for i, c in enumerate(self.key[:5])}
+        resp = self.client.post(reverse('accounts:submit_test'), json.dumps({
+            'email': 's@example.com', 'company': 'uber', 'difficulty': 'hard',
+            'paper_id': self.paper.paper_id, 'answers': answers,
+            'correct': 20, 'total_questions': 20, 'percentage': 100,
+            'time_remaining': 600, 'time_limit': 1800,
+        }), content_type='application/json')
+        data = resp.json()
+        self.assertTrue(data['scored_by_server'])
+        self.assertEqual((data['correct'], data['percentage']), (5, 25))
+        result = TestResult.objects.get()
+        self.assertEqual(result.correct_answers, 5)
+        self.assertEqual(result.answers, self.key[:5].decode() + '-' * 15)
+        self.assertTrue(result.verified)
+
+    def test_submissions_without_paper_are_unverified(self):
+        User = get_user_model()
+        User.objects.create_user(username='s@example.com', email='s@example.com', password='x')
+        submission = {'email': 's@example.com', 'company': 'uber', 'difficulty': 'hard',
+                      'correct': 20, 'total_questions': 20, 'percentage': 100, 'time_taken': '5m'}
+        resp = self.client.post(reverse('accounts:submit_test'), json.dumps(submission),
+                                content_type='application/json')
+        self.assertFalse(resp.json()['scored_by_server'])
+        result = TestResult.objects.get()
+        self.assertEqual(result.score, 100)
+        self.assertFalse(result.verified)
+        self.assertFalse(result.as_dict()['verified'])
+
+    def test_malformed_answers_are_rejected(self):
+        User = get_user_model()
+        user = User.objects.create_user(username='s@example.com', email='s@example.com', password='x')
+        submission = {'email': 's@example.com', 'paper_id': self.paper.paper_id, 'answers': 5}
+        resp = self.client.post(reverse('accounts:submit_test'), json.dumps(submission),
+                                content_type='application/json')
+        self.assertEqual(resp.status_code, 400)
+        self.assertFalse(resp.json()['ok'])
+        self.client.force_login(user)
+        resp = self.client.post(reverse('accounts:save_test_result'), json.dumps(submission),
+                                content_type='application/json')
+        self.assertEqual(resp.status_code, 400)
+        self.assertFalse(TestResult.objects.exists())
+
+    def test_bulk_endpoint_and_rescore(self):
+        User = get_user_model()
+        staff = User.objects.create_user(username='admin', password='x', is_staff=True)
+        self.client.force_login(staff)
+        resp = self.client.post(reverse('accounts:score_submissions'), json.dumps({'submissions': [
+            {'paper_id': self.paper.paper_id, 'answers': self.key.decode()},
+            {'paper_id': 'bogus', 'answers': {}},
+            {'paper_id': self.paper.paper_id, 'answers': 5},
+        ]}), content_type='application/json')
+        results = resp.json()['results']
+        self.assertEqual(results[0]['correct'], 20)
+        self.assertFalse(results[1]['ok'])
+        self.assertFalse(results[2]['ok'])
+
+        result = TestResult.objects.create(
+            user=staff, test_name='Uber - Hard', company='uber', difficulty='hard', total_questions=20,
+            correct_answers=20, score=100, paper_id=self.paper.paper_id, answers=self.key.decode(),
+            verified=True,
+        )
+        rating = AbilityEstimate.objects.get(user=staff).rating
+        session = self.client.session
+        session['user_id'] = staff.pk
+        session.save()
+        self.assertContains(self.client.get(reverse('accounts:profile')), '20/20')
+        profile_cache.get(staff.pk)
+        version = profile_events.current(staff.pk)
+        # Fix the answer key of the first question, then rescore history
+        first = Question.objects.get(pk=self.paper.question_ids[0])
+        first.correct_answer = 'A' if first.correct_answer != 'A' else 'B'
+        first.save()
+        with mock.patch.object(realtime, 'emit') as emit, self.captureOnCommitCallbacks(execute=True):
+            call_command('rescore_test_results', stdout=open('/dev/null', 'w'))
+        result.refresh_from_db()
+        self.assertEqual((result.correct_answers, result.score), (19, 95))
+
+        # The bulk update skips signals; the command does their work per user
+        emit.assert_called_once_with(staff.pk, profile_events.PROFILE_CHANGED, {'version': version + 1})
+        aggregate = profile_cache.get(staff.pk)
+        self.assertEqual(aggregate['version'], version + 1)
+        self.assertEqual(aggregate['stats']['bestTestScore'], 95)
+        self.assertLess(AbilityEstimate.objects.get(user=staff).rating, rating)
+        self.assertContains(self.client.get(reverse('accounts:profile')), '19/20')
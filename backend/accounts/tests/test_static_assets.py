@@ -0,0 +1,67 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.templatetags.static import static
+from django.test import TestCase, override_settings
+
+from accounts import static_assets
+
+CSS = 'body { background: url("../images/bg.png"); }\n' + '.card { margin: 0 auto; }\n' * 40
+
+
+class StaticAssetsTests(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, True)
+        source = os.path.join(self.root, 'src')
+        for name, data in (('css/site.css', CSS.encode()), ('images/bg.png', b'\x89PNG' * 100), ('js/tiny.js', b'1;')):
+            os.makedirs(os.path.dirname(os.path.join(source, name)), exist_ok=True)
+            with open(os.path.join(source, name), 'wb') as fh:
+                fh.write(data)
+        overrides = override_settings(
+            STATIC_ROOT=os.path.join(self.root, 'static'),
+            STATICFILES_DIRS=[(name, os.path.join(source, name)) for name in ('css', 'js', 'images')],
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+    def test_unbuilt_names_resolve_to_themselves(self):
+        self.assertEqual(static('css/site.css'), '/static/css/site.css')
+
+    def test_build_hashes_rewrites_and_compresses(self):
+        call_command('build_static', stdout=StringIO(), stderr=StringIO())
+        with open(os.path.join(self.root, 'static', 'staticfiles.json')) as fh:
+            paths = json.load(fh)['paths']
+        css = paths['css/site.css']
+        self.assertRegex(css, r'^css/site\.[0-9a-f]{12}\.css$')
+        self.assertEqual(static('css/site.css'), '/static/' + css)
+
+        css_path = os.path.join(self.root, 'static', css)
+        with open(css_path) as fh:
+            self.assertIn(paths['images/bg.png'].split('/')[1], fh.read())
+        self.assertTrue(os.path.exists(css_path + '.gz'))
+        # too small, or not text
+        self.assertFalse(os.path.exists(os.path.join(self.root, 'static', paths['js/tiny.js']) + '.gz'))
+        self.assertFalse(os.path.exists(os.path.join(self.root, 'static', paths['images/bg.png']) + '.gz'))
+
+        response = self.client.get('/static/' + css, HTTP_ACCEPT_ENCODING='gzip, br;q=0')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertEqual(response['Cache-Control'], static_assets.IMMUTABLE)
+        self.assertIn('Accept-Encoding', response['Vary'])
+        with open(css_path + '.gz', 'rb') as fh:
+            self.assertEqual(b''.join(response.streaming_content), fh.read())
+
+        response = self.client.get('/static/css/site.css', HTTP_ACCEPT_ENCODING='gzip;q=0')
+        self.assertNotIn('Content-Encoding', response)
+        self.assertEqual(response['Cache-Control'], static_assets.REVALIDATE)
+        self.assertEqual(self.client.get('/static/css/missing.css').status_code, 404)
+
+    def test_accept_encoding_parsing(self):
+        self.assertEqual(static_assets._accepted('gzip, deflate, br;q=0.5, zstd;q=0'), {'gzip', 'deflate', 'br'})
+        self.assertEqual(static_assets._accepted(None), set())
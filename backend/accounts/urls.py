@@ -67,6 +67,9 @@ urlpatterns = [
     path('mark_paid/', views.mark_paid, name='mark_paid'),
     path('verify_transaction/', views_payment.verify_transaction, name='verify_transaction'),
     path('pdf/<int:pk>/download/', views.pdf_download, name='pdf_download'),
+    path('pdf/<int:pk>/link/', views.pdf_link, name='pdf_link'),
+    re_path(r'^pdf/thumb/(?P<digest>[0-9a-f]{64})\.png$', views.pdf_thumbnail, name='pdf_thumbnail'),
+    path('pdf/s/<int:pdf_id>/<int:user_id>/<int:expires>/<str:signature>/<path:name>', views.pdf_signed_download, name='pdf_signed_download'),
     # New API endpoints for purchase, mock attempts and profile
     path('purchase/', api.purchase, name='purchase'),
     path('mock/attempt/', api.mock_attempt, name='mock_attempt'),
@@ -78,9 +81,15 @@ urlpatterns = [
     path('test/create_item/', api.test_create_item, name='test_create_item'),
     path('test/create_mock/', api.test_create_mock, name='test_create_mock'),
     path('api/get-questions/', api.get_questions, name='get_questions'),
+    path('api/paper/', api.get_paper, name='get_paper'),
+    path('api/questions/search/', api.search_questions, name='search_questions'),
+    path('api/pdfs/search/', api.search_pdfs, name='search_pdfs'),
+    path('api/events/', api.events, name='events'),
+    path('api/companies/', api.list_companies, name='list_companies'),
     path('api/get-user-email/', views.get_user_email, name='get_user_email'),
     path('api/submit-test/', views.submit_test, name='submit_test'),
     path('api/save-test-result/', views.save_test_result, name='save_test_result'),
+    path('api/score-bulk/', api.score_submissions, name='score_submissions'),
     path('api/delete-test-result/', views.delete_test_result, name='delete_test_result'),
     
     # Company Details Page
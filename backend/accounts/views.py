@@ -9,14 +9,20 @@ Important: This demo returns OTP codes in responses for easy testing. Remove
 that behavior when moving to production.
 """
 import json
+import os
 import random
-from django.http import JsonResponse, HttpResponseBadRequest, HttpResponseForbidden
+from urllib.parse import quote
+from django.db.models import Q
+from django.http import FileResponse, HttpResponse, JsonResponse, HttpResponseBadRequest, HttpResponseForbidden
 from django.shortcuts import render, redirect
 from django.views.decorators.csrf import csrf_exempt
 from django.utils import timezone
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.template import TemplateDoesNotExist  # 👈 ADD THIS LINE
-from .models import OTP, User, Video, PDF
+from .models import OTP, User, Video, PDF, UserProfile
 from .email_utils import send_result_email
+from . import catalog, company_directory, company_kb, download_links, entitlements, file_delivery, page_cache, pagination, papers, pdf_meta, scoring, static_assets
 from django.http import Http404
 from django.contrib import messages
 from django.contrib.auth import authenticate
@@ -52,6 +58,11 @@ def signup_page(request):
     return render(request, "signup.html")
 
 
+def serve_static(request, path):
+    """Files under /static/ (STATIC_ROOT), hashed names cached as immutable."""
+    return static_assets.serve(request, path)
+
+
 def login_page(request):
     if request.method == "POST":
         email = request.POST['email']
@@ -79,6 +90,13 @@ def dashboard(request):
     return render(request, 'dashboard.html')
 
 
+def _first_page(model, owner, field):
+    """The newest keyset page of `owner`'s `model` rows (see accounts.pagination)."""
+    if owner is None:
+        return []
+    return pagination.paginate(model.objects.filter(user=owner), field).items
+
+
 def profile(request):
     """Render a profile page showing user details and purchases.
 
@@ -94,57 +112,48 @@ def profile(request):
 
     # Default context
     context = {'purchases': [], 'transactions': [], 'purchased_items': [], 'test_results': []}
+    # live updates over /api/events/ instead of the Node Socket.IO server
+    context['realtime_sse'] = 'sse' in settings.REALTIME_TRANSPORTS
 
+    from .models import Transaction, PDF, PurchasedItem, TestResult
     if phone:
         try:
-            acct_user = User.objects.get(phone=phone)
-        except User.DoesNotExist:
+            acct_user = UserProfile.objects.select_related('auth_user').get(phone=phone)
+        except UserProfile.DoesNotExist:
             return redirect('accounts:login_page')
-        # purchases stored in paid_companies JSONField
-        purchases = list((acct_user.paid_companies or {}).keys())
-        # transactions related to this accounts.User
-        from .models import Transaction, PDF, PurchasedItem, TestResult
-        txs = Transaction.objects.filter(user=acct_user).order_by('-created_at')
-        # Get purchased items from database
-        purchased_items = list(PurchasedItem.objects.filter(user=acct_user).order_by('-purchased_at'))
-        # Get test results from database
-        test_results = list(TestResult.objects.filter(user=acct_user).order_by('-attempt_date'))
+        # purchases are Entitlement rows (see accounts.entitlements)
+        purchases = entitlements.companies(acct_user)
+        # transactions, items and results belong to the linked auth user
+        owner = acct_user.auth_user
+        txs = Transaction.objects.filter(user=owner).order_by('-created_at') if owner else []
+        # newest page of purchased items and test results; older pages come from the cursor APIs
+        purchased_items = _first_page(PurchasedItem, owner, 'purchased_at')
+        test_results = _first_page(TestResult, owner, 'attempt_date')
         # also derive purchased PDF objects (by company key)
         purchased_pdfs = []
         if purchases:
             purchased_pdfs = list(PDF.objects.filter(company__in=purchases).order_by('-created_at'))
-        context.update({'user_obj': acct_user, 'purchases': purchases, 'transactions': txs, 'purchased_pdfs': purchased_pdfs, 'purchased_items': purchased_items, 'test_results': test_results, 'profile_user_id': getattr(acct_user, 'id', None)})
+        context.update({'user_obj': acct_user, 'has_paid': entitlements.has_access(acct_user), 'purchases': purchases, 'transactions': txs, 'purchased_pdfs': purchased_pdfs, 'purchased_items': purchased_items, 'test_results': test_results, 'profile_user_id': getattr(owner, 'id', None)})
     else:
         # email/password user
         try:
             auth_user = AuthUser.objects.get(pk=uid)
         except AuthUser.DoesNotExist:
             return redirect('accounts:login_page')
-        # try to find or create linked accounts.User to surface purchases
-        from .models import User as AccountUser, Transaction, PDF, PurchasedItem, TestResult
-        acct_user = None
-        try:
-            acct_user = AccountUser.objects.filter(auth_user=auth_user).first()
-        except Exception:
-            acct_user = None
+        # find the linked UserProfile to surface purchases
+        acct_user = UserProfile.objects.filter(auth_user=auth_user).first()
 
         purchased_pdfs = []
-        txs = []
-        purchased_items = []
-        test_results = []
-        if acct_user:
-            purchases = list((acct_user.paid_companies or {}).keys())
-            if purchases:
-                purchased_pdfs = list(PDF.objects.filter(company__in=purchases).order_by('-created_at'))
-            txs = list(Transaction.objects.filter(user=acct_user).order_by('-created_at'))
-            # Get purchased items from database
-            purchased_items = list(PurchasedItem.objects.filter(user=acct_user).order_by('-purchased_at'))
-            # Get test results from database
-            test_results = list(TestResult.objects.filter(user=acct_user).order_by('-attempt_date'))
-
-        # if we have a linked AccountUser, expose its id for realtime/profile API
-        linked_id = getattr(acct_user, 'id', None) if acct_user else None
-        context.update({'user_obj': auth_user, 'email_user': True, 'purchased_pdfs': purchased_pdfs, 'transactions': txs, 'purchased_items': purchased_items, 'test_results': test_results, 'profile_user_id': linked_id})
+        purchases = entitlements.companies(acct_user) if acct_user else []
+        if purchases:
+            purchased_pdfs = list(PDF.objects.filter(company__in=purchases).order_by('-created_at'))
+        txs = list(Transaction.objects.filter(user=auth_user).order_by('-created_at'))
+        # newest page of purchased items and test results; older pages come from the cursor APIs
+        purchased_items = _first_page(PurchasedItem, auth_user, 'purchased_at')
+        test_results = _first_page(TestResult, auth_user, 'attempt_date')
+
+        # expose the auth user's id for the realtime/profile API
+        context.update({'user_obj': auth_user, 'email_user': True, 'has_paid': entitlements.has_access(acct_user), 'purchases': purchases, 'purchased_pdfs': purchased_pdfs, 'transactions': txs, 'purchased_items': purchased_items, 'test_results': test_results, 'profile_user_id': auth_user.id})
 
     return render(request, 'accounts/profile.html', context)
 
@@ -206,13 +215,8 @@ def _generate_code():
 
 def home(request):
     """Render the home page with featured companies from PDFs."""
-    # Get unique company names from PDFs to show in the featured section
-    featured_companies = (
-        PDF.objects.exclude(company='')
-        .values_list('company', flat=True)
-        .distinct()
-        .order_by('company')[:4]  # Limit to 4 featured companies
-    )
+    # Company names come from the maintained directory, not a scan of PDFs
+    featured_companies = company_directory.company_names(limit=4)  # Limit to 4 featured companies
     # Render the existing index.html template located under accounts/templates/
     # (TEMPLATES['DIRS'] already includes this path in settings)
     return render(request, 'index.html', {
@@ -314,9 +318,13 @@ def dynamic_html(request, path):
     Dynamically render any .html file from templates folder.
     Example:
         /company-pdfs/pdf-capgemini.html → templates/company-pdfs/pdf-capgemini.html
+
+    Pages without per-user content are served from accounts.page_cache.
     """
     try:
-        return render(request, path)
+        return page_cache.render_page(request, path)
+    except Http404:
+        raise
     except Exception:
         raise Http404(f"Template not found: {path}")
   
@@ -393,14 +401,13 @@ def me(request):
         return JsonResponse({'ok': False, 'error': 'not_logged_in'}, status=401)
 
     try:
-        user = User.objects.get(phone=phone)
-    except User.DoesNotExist:
+        user = UserProfile.objects.get(phone=phone)
+    except UserProfile.DoesNotExist:
         return JsonResponse({'ok': False, 'error': 'user_not_found'}, status=404)
 
     return JsonResponse({'ok': True, 'user': {
         'phone': user.phone,
-        'has_paid': user.has_paid,
-        'paid_companies': user.paid_companies,
+        **entitlements.summary(user),
     }})
 
 
@@ -421,6 +428,24 @@ def list_pdfs(request):
     return JsonResponse({'ok': True, 'pdfs': data})
 
 
+def _score_submission(payload):
+    """Score a submission server-side when it carries a rebuildable `paper_id`.
+
+    Returns (paper_id, packed_answers, score). `score` is None when there is
+    no usable paper, in which case callers fall back to client-sent numbers
+    and store the result as unverified. Raises ValueError for malformed
+    `answers`.
+    """
+    paper_id = payload.get('paper_id')
+    if not paper_id:
+        return '', '', None
+    try:
+        result, packed = scoring.score_paper(paper_id, payload.get('answers'))
+    except papers.InvalidPaper:
+        return '', '', None
+    return paper_id, packed.decode('ascii'), result
+
+
 @csrf_exempt
 def submit_test(request):
     """API endpoint: Receive test submission and send result email.
@@ -431,6 +456,7 @@ def submit_test(request):
       - total_questions, answered, correct, wrong, percentage
       - time_remaining
       - answers (optional)
+      - paper_id (optional, as returned by /api/get-questions/)
       - name (optional)
       - rank (optional)
       - feedback (optional)
@@ -450,7 +476,6 @@ def submit_test(request):
     name = payload.get('name') or None
     company = payload.get('company') or ''
     difficulty = payload.get('difficulty') or ''
-    test_name = f"{company.title()} - {difficulty.title()}" if company else payload.get('test_name') or 'StudyPro Test'
     total = payload.get('total_questions') or payload.get('total') or 0
     score = payload.get('correct') or 0
     percentage = payload.get('percentage') or 0
@@ -458,6 +483,19 @@ def submit_test(request):
     rank = payload.get('rank') or 'N/A'
     feedback = payload.get('feedback') or ''
 
+    # Prefer server-side scoring over client-sent correct/total/percentage
+    try:
+        paper_id, packed_answers, server_score = _score_submission(payload)
+    except ValueError as e:
+        return JsonResponse({'ok': False, 'error': str(e)}, status=400)
+    if server_score:
+        total = server_score.total
+        score = server_score.correct
+        percentage = server_score.percentage
+        # The paper knows which pool it came from (e.g. after difficulty=adaptive)
+        company, difficulty = papers.decode_paper_id(paper_id)[:2]
+    test_name = f"{company.title()} - {difficulty.title()}" if company else payload.get('test_name') or 'StudyPro Test'
+
     # Compute time_taken if possible
     time_taken = payload.get('time_taken')
     if not time_taken and isinstance(time_remaining, (int, float)):
@@ -521,6 +559,9 @@ def submit_test(request):
                 correct_answers=score,
                 score=percentage,
                 time_taken=time_taken,
+                paper_id=paper_id,
+                answers=packed_answers,
+                verified=bool(server_score),
                 attempt_date=timezone.now()
             )
             db_saved = True
@@ -559,7 +600,11 @@ def submit_test(request):
         'message': 'result submitted',
         'email_sent': bool(email_sent),
         'auto_saved': auto_saved,
-        'db_saved': db_saved
+        'db_saved': db_saved,
+        'scored_by_server': bool(server_score),
+        'correct': score,
+        'total_questions': total,
+        'percentage': percentage,
     })
 
 
@@ -608,6 +653,17 @@ def save_test_result(request):
     score_percent = payload.get('percentage') or 0
     time_taken = payload.get('time_taken', '')
 
+    # Prefer server-side scoring over client-sent correct/total/percentage
+    try:
+        paper_id, packed_answers, server_score = _score_submission(payload)
+    except ValueError as e:
+        return JsonResponse({'ok': False, 'error': str(e)}, status=400)
+    if server_score:
+        total_questions = server_score.total
+        correct_answers = server_score.correct
+        score_percent = server_score.percentage
+        company, difficulty = papers.decode_paper_id(paper_id)[:2]
+
     # Save to TestResult database table
     from .models import TestResult
     try:
@@ -620,6 +676,9 @@ def save_test_result(request):
             correct_answers=correct_answers,
             score=score_percent,
             time_taken=time_taken,
+            paper_id=paper_id,
+            answers=packed_answers,
+            verified=bool(server_score),
             attempt_date=timezone.now()
         )
     except Exception as e:
@@ -709,23 +768,19 @@ def mark_paid(request):
         return JsonResponse({'ok': False, 'error': 'phone required'}, status=400)
 
     try:
-        user = User.objects.get(phone=phone)
-    except User.DoesNotExist:
+        user = UserProfile.objects.get(phone=phone)
+    except UserProfile.DoesNotExist:
         return JsonResponse({'ok': False, 'error': 'user_not_found'}, status=404)
 
     t = payload.get('type')
     if t == 'video':
-        user.has_paid = True
-        user.save()
+        entitlements.grant(user, entitlements.ALL)
         return JsonResponse({'ok': True, 'message': 'marked has_paid'})
     elif t == 'pdf':
         company = payload.get('company')
         if not company:
             return HttpResponseBadRequest('company required for pdf type')
-        paid = user.paid_companies or {}
-        paid[company] = True
-        user.paid_companies = paid
-        user.save()
+        entitlements.grant(user, entitlements.COMPANY, company)
         return JsonResponse({'ok': True, 'message': f'marked paid for {company}'})
     else:
         return HttpResponseBadRequest('unknown type')
@@ -814,7 +869,7 @@ def verify_otp(request):
             return JsonResponse({'ok': False, 'error': 'Invalid code'}, status=400)
 
         # Create or get user
-        user, created = User.objects.get_or_create(phone=phone)
+        user, created = UserProfile.objects.get_or_create(phone=phone)
 
         # Set a simple session value so template views can identify logged-in user
         try:
@@ -827,8 +882,7 @@ def verify_otp(request):
         return JsonResponse({'ok': True, 'user': {
             'id': str(user.id),
             'phone': user.phone,
-            'has_paid': user.has_paid,
-            'paid_companies': user.paid_companies,
+            **entitlements.summary(user),
         }})
     except Exception as e:
         return JsonResponse({'ok': False, 'error': str(e)}, status=500)
@@ -844,23 +898,32 @@ def me(request):
     if not phone:
         return JsonResponse({'ok': False, 'error': 'phone query param required'}, status=400)
     try:
-        user = User.objects.get(phone=phone)
+        user = UserProfile.objects.get(phone=phone)
         return JsonResponse({'ok': True, 'user': {
             'id': str(user.id),
             'phone': user.phone,
-            'has_paid': user.has_paid,
-            'paid_companies': user.paid_companies,
+            **entitlements.summary(user),
         }})
-    except User.DoesNotExist:
+    except UserProfile.DoesNotExist:
         return JsonResponse({'ok': False, 'error': 'user not found'}, status=404)
 
 
 def list_videos(request):
-    """Return a JSON list of videos."""
-    vids = []
+    """Return a JSON list of videos, newest first, one cursor page at a time.
+
+    Served from a versioned catalog snapshot with an ETag (see accounts.catalog).
+    Pass `next_cursor` from a response back as ?cursor= for the next page.
+    """
     try:
-        videos = __import__('accounts.models', fromlist=['Video']).Video.objects.all().order_by('-created_at')
-        for v in videos:
+        cursor, page_size = pagination.page_params(request)
+    except pagination.InvalidCursor as e:
+        return JsonResponse({'ok': False, 'error': str(e)}, status=400)
+
+    def build():
+        vids = []
+        Video = __import__('accounts.models', fromlist=['Video']).Video
+        page = pagination.paginate(Video.objects.all(), 'created_at', cursor, page_size)
+        for v in page.items:
             vids.append({
                 'id': str(v.id),
                 'title': v.title,
@@ -868,22 +931,36 @@ def list_videos(request):
                 'videoId': v.video_id,
                 'createdAt': v.created_at.isoformat(),
             })
+        return json.dumps({'ok': True, 'videos': vids, 'next_cursor': page.next_cursor}, cls=DjangoJSONEncoder).encode('utf-8')
+
+    try:
+        snapshot = catalog.get_snapshot('videos', None, build, cursor, page_size)
     except Exception as e:
         return JsonResponse({'ok': False, 'error': str(e)}, status=500)
 
-    return JsonResponse({'ok': True, 'videos': vids})
+    return catalog.respond(request, snapshot)
 
 
 def list_pdfs(request):
-    """Return PDFs; optional filter by company via ?company=capgemini"""
+    """Return PDFs; optional filter by company via ?company=capgemini
+
+    Served from a versioned catalog snapshot with an ETag (see accounts.catalog).
+    Paginated like `list_videos` (?cursor=, ?page_size=).
+    """
     company = request.GET.get('company')
-    pdfs = []
     try:
+        cursor, page_size = pagination.page_params(request)
+    except pagination.InvalidCursor as e:
+        return JsonResponse({'ok': False, 'error': str(e)}, status=400)
+
+    def build():
+        pdfs = []
         PDF = __import__('accounts.models', fromlist=['PDF']).PDF
-        qs = PDF.objects.all().order_by('-created_at')
+        qs = PDF.objects.all()
         if company:
             qs = qs.filter(company=company)
-        for p in qs:
+        page = pagination.paginate(qs, 'created_at', cursor, page_size)
+        for p in page.items:
             pdfs.append({
                 'id': str(p.id),
                 'title': p.title,
@@ -891,11 +968,22 @@ def list_pdfs(request):
                 'url': p.url,
                 'company': p.company,
                 'createdAt': p.created_at.isoformat(),
+                # pages, bytes, sha256, thumbnail_url (None until extracted)
+                'meta': pdf_meta.for_url(p.url),
             })
+        return json.dumps({'ok': True, 'pdfs': pdfs, 'next_cursor': page.next_cursor}, cls=DjangoJSONEncoder).encode('utf-8')
+
+    try:
+        snapshot = catalog.get_snapshot('pdfs', company, build, cursor, page_size)
     except Exception as e:
         return JsonResponse({'ok': False, 'error': str(e)}, status=500)
 
-    return JsonResponse({'ok': True, 'pdfs': pdfs})
+    return catalog.respond(request, snapshot)
+
+
+def _can_download(buyer, pdf):
+    """Full access OR a grant for the PDF's company (see accounts.entitlements)."""
+    return entitlements.has_access(buyer, pdf.company)
 
 
 def pdf_download(request, pk):
@@ -903,41 +991,74 @@ def pdf_download(request, pk):
     try:
         pdf = PDF.objects.get(pk=pk)
     except PDF.DoesNotExist:
-        return Http404('PDF not found')
-
-    # Find current accounts.User either via phone session or linked auth_user
-    acct_user = None
-    phone = request.session.get('phone')
-    uid = request.session.get('user_id')
-    if phone:
-        try:
-            acct_user = User.objects.get(phone=phone)
-        except User.DoesNotExist:
-            acct_user = None
-    elif uid:
-        try:
-            auth_user = AuthUser.objects.get(pk=uid)
-            acct_user = User.objects.filter(auth_user=auth_user).first()
-        except Exception:
-            acct_user = None
-
-    # Check access: either has_paid OR company in paid_companies
-    allowed = False
-    if acct_user:
-        if acct_user.has_paid:
-            allowed = True
-        else:
-            paid = acct_user.paid_companies or {}
-            if pdf.company and paid.get(pdf.company):
-                allowed = True
+        raise Http404('PDF not found')
 
-    if allowed:
-        # safe redirect to actual URL (could be local file or external link)
+    if _can_download(entitlements.profile_for(request), pdf):
+        # Files under /assets/ are sent by file_delivery; external links are redirected
+        name = file_delivery.asset_name(request, pdf.url)
+        if name:
+            return file_delivery.serve_under(request, settings.MEDIA_ROOT, name)
         return redirect(pdf.url)
     else:
         return HttpResponseForbidden('You do not have access to this PDF')
 
 
+def pdf_link(request, pk):
+    """GET: check access once and return a short-lived signed download URL.
+
+    Returns {"ok": true, "url": "/pdf/s/...", "expires": <unix time>}; PDFs
+    hosted elsewhere get their own URL and "expires": null.
+    """
+    try:
+        pdf = PDF.objects.get(pk=pk)
+    except PDF.DoesNotExist:
+        return JsonResponse({'ok': False, 'error': 'not_found'}, status=404)
+    buyer = entitlements.profile_for(request)
+    if not _can_download(buyer, pdf):
+        return JsonResponse({'ok': False, 'error': 'forbidden'}, status=403)
+    name = file_delivery.asset_name(request, pdf.url)
+    if not name:
+        return JsonResponse({'ok': True, 'url': pdf.url, 'expires': None})
+    url, expires = download_links.signed_url(pdf.pk, buyer.pk, name)
+    return JsonResponse({'ok': True, 'url': url, 'expires': expires})
+
+
+def pdf_signed_download(request, pdf_id, user_id, expires, signature, name):
+    """Serve a URL issued by `pdf_link`; checks only the signature (no queries)."""
+    if not download_links.verify(pdf_id, user_id, expires, signature, name):
+        return HttpResponseForbidden('This download link is invalid or has expired')
+    return file_delivery.serve_under(request, settings.MEDIA_ROOT, name)
+
+
+def pdf_thumbnail(request, digest):
+    """First-page PNG made by accounts.pdf_meta; named by content hash, so immutable."""
+    path = os.path.join(settings.PDF_META_ROOT, f'{digest}.png')
+    if not os.path.isfile(path):
+        raise Http404('Thumbnail not found')
+    response = FileResponse(open(path, 'rb'), content_type='image/png')
+    response['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
+
+def serve_asset(request, path):
+    """Files under /assets/ (MEDIA_ROOT), with range support.
+
+    A PDF that backs a `PDF` record gets the same access check as
+    `pdf_download`; files no record points at are public.
+    """
+    if path.lower().endswith('.pdf'):
+        suffixes = {settings.MEDIA_URL + path, settings.MEDIA_URL + quote(path)}
+        query = Q()
+        for suffix in suffixes:
+            query |= Q(url__endswith=suffix)
+        pdfs = list(PDF.objects.filter(query).only('company'))
+        if pdfs:
+            buyer = entitlements.profile_for(request)
+            if not any(_can_download(buyer, pdf) for pdf in pdfs):
+                return HttpResponseForbidden('You do not have access to this PDF')
+    return file_delivery.serve_under(request, settings.MEDIA_ROOT, path)
+
+
 def login_page(request):
     """Render login template and handle email/password POST.
 
@@ -1015,13 +1136,11 @@ def dashboard(request):
 
     # Load videos and companies
     Video = __import__('accounts.models', fromlist=['Video']).Video
-    PDF = __import__('accounts.models', fromlist=['PDF']).PDF
 
     videos = Video.objects.all().order_by('-created_at')
-    pdfs = PDF.objects.all().order_by('-created_at')
 
-    # derive unique company list
-    companies = sorted(list({p.company for p in pdfs if p.company}))
+    # unique company list from the maintained directory (no PDF scan)
+    companies = company_directory.company_names()
 
     context = {
         'user': user,
@@ -1048,20 +1167,16 @@ def mark_paid(request):
 
         data = json.loads(request.body.decode('utf-8'))
         typ = data.get('type')
-        user = User.objects.get(phone=phone)
+        user = UserProfile.objects.get(phone=phone)
 
         if typ == 'video':
-            user.has_paid = True
-            user.save()
+            entitlements.grant(user, entitlements.ALL)
             return JsonResponse({'ok': True, 'message': 'video access granted'})
         elif typ == 'pdf':
             company = data.get('company')
             if not company:
                 return JsonResponse({'ok': False, 'error': 'company required'}, status=400)
-            pc = user.paid_companies or {}
-            pc[company] = True
-            user.paid_companies = pc
-            user.save()
+            entitlements.grant(user, entitlements.COMPANY, company)
             return JsonResponse({'ok': True, 'message': f'pdf access granted for {company}'})
         else:
             return JsonResponse({'ok': False, 'error': 'invalid type'}, status=400)
@@ -1092,7 +1207,7 @@ def test_instructions(request):
     difficulty = request.GET.get('difficulty', 'medium')
     
     # Validate difficulty
-    valid_difficulties = ['easy', 'medium', 'hard']
+    valid_difficulties = ['easy', 'medium', 'hard', 'adaptive']
     if difficulty not in valid_difficulties:
         difficulty = 'medium'
     
@@ -1125,8 +1240,8 @@ def test_page(request):
     if company not in valid_companies:
         company = 'google'
     
-    # Validate difficulty
-    valid_difficulties = ['easy', 'medium', 'hard']
+    # Validate difficulty ('adaptive' is resolved per paper by get_questions)
+    valid_difficulties = ['easy', 'medium', 'hard', 'adaptive']
     if difficulty not in valid_difficulties:
         difficulty = 'medium'
     
@@ -1162,7 +1277,7 @@ def company_test(request, company=None, difficulty=None):
     The view validates inputs and passes a `company_logo_url` to the template.
     """
     valid_companies = ['google', 'openai', 'uber', 'microsoft']
-    valid_difficulties = ['easy', 'medium', 'hard']
+    valid_difficulties = ['easy', 'medium', 'hard', 'adaptive']
 
     # Normalize and validate
     company = (company or request.GET.get('company', 'google')).lower()
@@ -1192,693 +1307,19 @@ def company_test(request, company=None, difficulty=None):
     return render(request, 'test-page.html', context)
 
 
-# Company Information Database
-COMPANY_DATABASE = {
-    'capgemini': {
-        'name': 'Capgemini',
-        'logo_url': 'https://upload.wikimedia.org/wikipedia/commons/c/cb/Capgemini_201x_logo.svg',
-        'tagline': 'Digital Leader. Business Accelerator.',
-        'description': 'Capgemini is a global leader in partnering with companies to transform and manage their business and technology. With over 300,000 employees and presence in over 50 countries, Capgemini serves clients across all major industries.',
-        'industries': ['IT Services', 'Digital Transformation', 'Consulting', 'Cloud Solutions'],
-        'hiring_roles': ['Systems Engineer', 'Senior Associate', 'Software Developer', 'Data Engineer', 'Cloud Architect'],
-        'salary_range': '₹3.5 - 6 LPA',
-        'bonus': '8-12%',
-        'benefits': ['Health Insurance', '5 days work week', 'Performance bonus', 'Professional development', 'Stock options'],
-        'interview_process': [
-            {'round': 'Online Assessment', 'description': 'Aptitude, logical reasoning, verbal ability, and coding test (120 minutes)'},
-            {'round': 'Technical Interview', 'description': 'Discussion on core DSA concepts, system design basics, and project-related questions'},
-            {'round': 'Pseudo Code Round', 'description': 'Problem-solving using pseudo code or flowcharts'},
-            {'round': 'HR Round', 'description': 'Discussion on background, career goals, and company culture fit'}
-        ],
-        'required_skills': [
-            {
-                'category': 'Technical Skills',
-                'items': ['C/C++/Java/Python', 'Data Structures & Algorithms', 'DBMS', 'SQL', 'Basic OOP concepts']
-            },
-            {
-                'category': 'Soft Skills',
-                'items': ['Communication ability', 'Problem-solving mindset', 'Teamwork', 'Adaptability']
-            }
-        ],
-        'interview_tips': [
-            {'icon': '📚', 'title': 'Prepare DSA', 'description': 'Focus on arrays, linked lists, trees, and basic graph problems'},
-            {'icon': '💻', 'title': 'Practice Pseudo Code', 'description': 'Capgemini emphasizes pseudo code; practice writing clean algorithmic solutions'},
-            {'icon': '🎯', 'title': 'Know Your Projects', 'description': 'Be ready to explain all projects on your resume with technical depth'},
-            {'icon': '⏱️', 'title': 'Time Management', 'description': 'Online assessment is tricky; practice solving within time limits'}
-        ]
-    },
-    'cognizant': {
-        'name': 'Cognizant',
-        'logo_url': 'https://upload.wikimedia.org/wikipedia/commons/0/0e/Cognizant_logo.svg',
-        'tagline': 'Digital Engineering. Powered by AI.',
-        'description': 'Cognizant is a leading provider of information technology, consulting, and business process outsourcing services. With offices worldwide, they help enterprises modernize and transform their business operations.',
-        'industries': ['IT Services', 'BPO', 'Digital Services', 'AI & Analytics'],
-        'hiring_roles': ['Programmer Analyst', 'Associate Programmer', 'Senior Programmer', 'DevOps Engineer', 'Data Scientist'],
-        'salary_range': '₹3.5 - 5.5 LPA',
-        'bonus': '8-10%',
-        'benefits': ['Comprehensive health coverage', 'Flexible work arrangements', 'Training programs', 'Career growth path', 'Wellness benefits'],
-        'interview_process': [
-            {'round': 'Online Test', 'description': 'Aptitude (quantitative, logical, verbal) + coding assessment'},
-            {'round': 'Technical Round 1', 'description': 'Core technical knowledge, programming concepts, and basic system design'},
-            {'round': 'Technical Round 2', 'description': 'Problem-solving, code optimization, and project discussion'},
-            {'round': 'HR Round', 'description': 'Background verification, motivation, and cultural fit'}
-        ],
-        'required_skills': [
-            {
-                'category': 'Programming',
-                'items': ['Java/Python/C++', 'SQL and Database concepts', 'Full-stack development basics']
-            },
-            {
-                'category': 'Core Concepts',
-                'items': ['Data Structures', 'Algorithms', 'OOPS', 'Web technologies']
-            }
-        ],
-        'interview_tips': [
-            {'icon': '🔧', 'title': 'Tools & Technologies', 'description': 'Highlight experience with relevant tools used in your projects'},
-            {'icon': '📝', 'title': 'Problem Analysis', 'description': 'Ask clarifying questions and analyze problems systematically'},
-            {'icon': '💬', 'title': 'Communication', 'description': 'Explain your thought process clearly to the interviewer'},
-            {'icon': '🚀', 'title': 'Quick Learning', 'description': 'Show eagerness to learn new technologies and frameworks'}
-        ]
-    },
-    'tcs': {
-        'name': 'TCS (Tata Consultancy Services)',
-        'logo_url': 'https://upload.wikimedia.org/wikipedia/commons/f/f6/Tata_Consultancy_Services_Logo.svg',
-        'tagline': 'Experience Certainty.',
-        'description': 'TCS is one of the largest IT services, consulting, and business solutions organizations globally. Known for consistent hiring and employee development programs, TCS is a preferred choice for campus recruiting.',
-        'industries': ['IT Services', 'Consulting', 'Infrastructure Services', 'Applications Development'],
-        'hiring_roles': ['Systems Engineer', 'Network Administration', 'Software Developer', 'IT Support', 'Cloud Solutions'],
-        'salary_range': '₹3 - 5 LPA',
-        'bonus': '8-15%',
-        'benefits': ['Health & wellness programs', 'Retirement benefits', 'Professional certification support', 'Flexible scheduling', 'Learning opportunities'],
-        'interview_process': [
-            {'round': 'Aptitude Test', 'description': 'Quantitative, logical reasoning, verbal ability (90 minutes)'},
-            {'round': 'Technical Interview', 'description': 'Programming languages, data structures, databases, and general CS concepts'},
-            {'round': 'Coding Challenge', 'description': 'Write code to solve given problems using your preferred language'},
-            {'round': 'HR Round', 'description': 'Final discussion on background, interests, and company culture'}
-        ],
-        'required_skills': [
-            {
-                'category': 'Core Programming',
-                'items': ['C/Java/Python', 'OOPS Concepts', 'Basic problem-solving']
-            },
-            {
-                'category': 'Fundamentals',
-                'items': ['Data Structures', 'Database basics', 'Operating Systems basics']
-            }
-        ],
-        'interview_tips': [
-            {'icon': '✅', 'title': 'Clear Basics', 'description': 'TCS focuses on fundamentals; ensure your basics are crystal clear'},
-            {'icon': '🎓', 'title': 'Academic Knowledge', 'description': 'Knowledge from college subjects will be directly tested'},
-            {'icon': '🤝', 'title': 'Soft Skills', 'description': 'Emphasize teamwork, communication, and willingness to learn'},
-            {'icon': '⚡', 'title': 'Consistency', 'description': 'Maintain consistent knowledge; they appreciate long-term learners'}
-        ]
-    },
-    'hcl': {
-        'name': 'HCL Technologies',
-        'logo_url': 'https://upload.wikimedia.org/wikipedia/commons/8/8e/HCL_Technologies_Logo.svg',
-        'tagline': 'Supercharge your aspirations',
-        'description': 'HCL Technologies is a global technology company providing software and services. They are known for innovation and providing excellent career growth opportunities to young professionals.',
-        'industries': ['IT Services', 'Product Engineering', 'Infrastructure Services'],
-        'hiring_roles': ['Software Developer', 'Systems Engineer', 'Associate Software Engineer', 'Quality Analyst', 'DevOps Specialist'],
-        'salary_range': '₹3 - 5.5 LPA',
-        'bonus': '8-12%',
-        'benefits': ['Medical insurance', 'Learning & development', 'Flexible work options', 'Performance bonus', 'Employee wellness'],
-        'interview_process': [
-            {'round': 'Online Assessment', 'description': 'Aptitude + coding test (reasoning, quantitative, coding practical)'},
-            {'round': 'Technical Interview', 'description': 'Problem-solving, code writing, and technical depth assessment'},
-            {'round': 'Managerial Round', 'description': 'Discussion on project experience and approach to challenges'},
-            {'round': 'HR Round', 'description': 'Final round with HR team'}
-        ],
-        'required_skills': [
-            {
-                'category': 'Languages',
-                'items': ['C/Java/Python/JavaScript', 'SQL']
-            },
-            {
-                'category': 'CS Fundamentals',
-                'items': ['DSA', 'DBMS', 'Operating Systems', 'Networking basics']
-            }
-        ],
-        'interview_tips': [
-            {'icon': '🎯', 'title': 'Direct Approach', 'description': 'HCL values direct communication; be clear and concise'},
-            {'icon': '💡', 'title': 'Innovation Mindset', 'description': 'Show enthusiasm for learning new technologies'},
-            {'icon': '🔍', 'title': 'Deep Dive', 'description': 'Be ready to go deep into any technology you mention'},
-            {'icon': '📊', 'title': 'Real-world Problems', 'description': 'Relate your knowledge to real-world applications'}
-        ]
-    },
-    'infosys': {
-        'name': 'Infosys',
-        'logo_url': 'https://upload.wikimedia.org/wikipedia/commons/1/1a/Infosys_logo_horizontal.svg',
-        'tagline': 'Next is what we make it',
-        'description': 'Infosys is a global leader in digital services and consulting. Committed to delivering innovation on every client engagement, Infosys provides digital, consulting, technology, and outsourcing services.',
-        'industries': ['IT Services', 'Digital Transformation', 'Consulting', 'Business Automation'],
-        'hiring_roles': ['Software Developer', 'Systems Engineer', 'Senior Software Developer', 'Data Engineer', 'Cloud Specialist'],
-        'salary_range': '₹3.5 - 6 LPA',
-        'bonus': '8-12%',
-        'benefits': ['Comprehensive health coverage', 'Work-life balance programs', 'Career progression path', 'Continuous learning', 'Performance incentives'],
-        'interview_process': [
-            {'round': 'Online Test', 'description': 'Aptitude (logical, quantitative, verbal) + coding round'},
-            {'round': 'Technical Interview 1', 'description': 'Core concepts, problem-solving, and code review'},
-            {'round': 'Technical Interview 2', 'description': 'Deep technical knowledge and project discussion'},
-            {'round': 'HR Round', 'description': 'HR panel discussion'}
-        ],
-        'required_skills': [
-            {
-                'category': 'Programming',
-                'items': ['Java/Python/C++', 'SQL', 'HTML/CSS/JavaScript basics']
-            },
-            {
-                'category': 'Concepts',
-                'items': ['DSA', 'DBMS', 'Web services', 'Microservices basics']
-            }
-        ],
-        'interview_tips': [
-            {'icon': '🌐', 'title': 'Specialization', 'description': 'Highlight specific technology areas you\'re strong in'},
-            {'icon': '📱', 'title': 'Modern Tech', 'description': 'Show knowledge of latest frameworks and tools'},
-            {'icon': '🚀', 'title': 'Scalability', 'description': 'Discuss how to build scalable and efficient solutions'},
-            {'icon': '🤖', 'title': 'AI/Automation', 'description': 'Knowledge of AI/ML basics is a plus'}
-        ]
-    },
-    'accenture': {
-        'name': 'Accenture',
-        'logo_url': 'https://upload.wikimedia.org/wikipedia/commons/c/cd/Accenture.svg',
-        'tagline': 'Let There Be Change',
-        'description': 'Accenture is a global professional services company with leading capabilities in digital, cloud, and security. Committed to delivering on the promise of technology and human ingenuity.',
-        'industries': ['Consulting', 'Technology Services', 'Digital Transformation', 'Business Services'],
-        'hiring_roles': ['Associate Software Engineer', 'Senior Technology Analyst', 'Solutions Engineer', 'Network Engineer', 'AI/ML Specialist'],
-        'salary_range': '₹4 - 7 LPA',
-        'bonus': '10-15%',
-        'benefits': ['Medical benefits', 'Flexible workplace', 'Professional development', 'Mentoring programs', 'Stock programs'],
-        'interview_process': [
-            {'round': 'Online Cognitive Assessment', 'description': 'Accenture Digital Assessment: logical, numerical, verbal, and technical questions'},
-            {'round': 'Technical Interview', 'description': 'Programming concepts, system design, and problem-solving'},
-            {'round': 'Second Technical Round', 'description': 'Advanced concepts and project experience discussion'},
-            {'round': 'HR & Management Round', 'description': 'Final round with HR and senior management'}
-        ],
-        'required_skills': [
-            {
-                'category': 'Technical Stacks',
-                'items': ['Java/Python/C++/JavaScript', 'Full-stack development', 'Cloud platforms']
-            },
-            {
-                'category': 'Advanced Topics',
-                'items': ['System Design', 'Microservices', 'DevOps', 'Cloud computing']
-            }
-        ],
-        'interview_tips': [
-            {'icon': '🎓', 'title': 'Accenture Assessment', 'description': 'Practice their specific online assessment; it\'s unique and different'},
-            {'icon': '🌍', 'title': 'Global Mindset', 'description': 'Show openness to working with global teams'},
-            {'icon': '💼', 'title': 'Client Skills', 'description': 'Accenture works with clients; emphasize communication skills'},
-            {'icon': '🔄', 'title': 'Agile & DevOps', 'description': 'Familiarity with agile and DevOps methodologies is valuable'}
-        ]
-    },
-    'amazon': {
-        'name': 'Amazon',
-        'logo_url': 'https://upload.wikimedia.org/wikipedia/commons/a/a9/Amazon_logo.svg',
-        'tagline': 'Work Hard. Have Fun. Make History.',
-        'description': 'Amazon is a global technology company focused on e-commerce, cloud computing, digital streaming, and artificial intelligence. Known for its leadership principles and fast-paced environment.',
-        'industries': ['E-commerce', 'Cloud Computing', 'AI/ML', 'Streaming Services'],
-        'hiring_roles': ['Software Development Engineer', 'Data Engineer', 'Solutions Architect', 'DevOps Engineer', 'ML Scientist'],
-        'salary_range': '₹6 - 15 LPA',
-        'bonus': '10-15%',
-        'benefits': ['ESOP/Stock options', 'Health and wellness', 'Relocation assistance', 'Professional development', 'Maternity benefits'],
-        'interview_process': [
-            {'round': 'Online Coding Assessment', 'description': 'LeetCode-style problems (2 problems in 90 minutes)'},
-            {'round': 'Phone Technical Interview', 'description': 'System design or coding round with experienced engineer'},
-            {'round': '2-4 Onsite Interviews', 'description': 'Mix of coding, system design, and behavioral interviews'},
-            {'round': 'Bar Raiser Interview', 'description': 'Final interview with senior engineer from different team'}
-        ],
-        'required_skills': [
-            {
-                'category': 'Core Competencies',
-                'items': ['Strong DSA', 'System Design', 'Java/Python', 'Distributed systems']
-            },
-            {
-                'category': 'Amazon Specific',
-                'items': ['Leadership principles knowledge', 'AWS basics', 'Scalability thinking']
-            }
-        ],
-        'interview_tips': [
-            {'icon': '⚡', 'title': 'Leadership Principles', 'description': 'Familiarize yourself with Amazon\'s 16 leadership principles'},
-            {'icon': '🎯', 'title': 'Customer Obsession', 'description': 'Show focus on customer problems in your answers'},
-            {'icon': '🔬', 'title': 'Data-Driven', 'description': 'Use metrics and data to support your solutions'},
-            {'icon': '📈', 'title': 'Bias for Action', 'description': 'Show decisiveness and ability to make quick calls'}
-        ]
-    },
-    'microsoft': {
-        'name': 'Microsoft',
-        'logo_url': 'https://upload.wikimedia.org/wikipedia/commons/4/44/Microsoft_logo.svg',
-        'tagline': 'Empowering Every Person and Organization',
-        'description': 'Microsoft is a global leader in software, services, and solutions. Innovation is at the heart of everything they do, from cloud computing to AI to enterprise solutions.',
-        'industries': ['Software', 'Cloud Computing', 'AI/ML', 'Gaming', 'Cybersecurity'],
-        'hiring_roles': ['Software Engineer', 'Cloud Solution Architect', 'Security Engineer', 'Data Scientist', 'AI Specialist'],
-        'salary_range': '₹8 - 20 LPA',
-        'bonus': '15-25%',
-        'benefits': ['Competitive stock options', 'World-class benefits', 'Health insurance', 'Gym memberships', 'Professional growth'],
-        'interview_process': [
-            {'round': 'Online Assessment', 'description': 'Coding + problem-solving (Microsoft specific assessment)'},
-            {'round': 'Phone Screening', 'description': 'Technical depth and communication assessment'},
-            {'round': '2-3 Onsite Rounds', 'description': 'Mix of coding, system design, and technical interviews'},
-            {'round': 'Team Match Round', 'description': 'Discussion with potential team lead'}
-        ],
-        'required_skills': [
-            {
-                'category': 'Technical Skills',
-                'items': ['C#/Java/Python', 'Advanced DSA', 'System Design', '.NET basics']
-            },
-            {
-                'category': 'Cloud & Scale',
-                'items': ['Azure knowledge', 'Cloud architecture', 'Distributed systems']
-            }
-        ],
-        'interview_tips': [
-            {'icon': '🧠', 'title': 'Think Cloud', 'description': 'Show understanding of cloud-first thinking and scalability'},
-            {'icon': '🔧', 'title': 'Tools & Platforms', 'description': 'Familiarity with Microsoft tools (Azure, Office 365, etc.)'},
-            {'icon': '🤝', 'title': 'Collaboration', 'description': 'Microsoft values teamwork and cross-functional collaboration'},
-            {'icon': '📚', 'title': 'Continuous Learning', 'description': 'Show passion for learning new technologies'}
-        ]
-    },
-    'wipro': {
-        'name': 'Wipro',
-        'logo_url': 'https://upload.wikimedia.org/wikipedia/commons/1/19/Wipro_Logo_2017.svg',
-        'tagline': 'Applying Thought',
-        'description': 'Wipro is a leading provider of information technology, consulting and business process services. Known for its strong engineering teams and global presence.',
-        'industries': ['IT Services', 'Consulting', 'Engineering Services'],
-        'hiring_roles': ['Software Engineer', 'Systems Engineer', 'Senior Associate', 'Data Analyst', 'Cloud Engineer'],
-        'salary_range': '₹3 - 5 LPA',
-        'bonus': '8-12%',
-        'benefits': ['Health insurance', 'Flexible work', 'Training programs', 'Career growth', 'Employee wellness'],
-        'interview_process': [
-            {'round': 'Online Aptitude Test', 'description': 'Quantitative, logical, and verbal reasoning'},
-            {'round': 'Technical Round', 'description': 'Core programming concepts and problem-solving'},
-            {'round': 'Coding Challenge', 'description': 'Write code solutions for given problems'},
-            {'round': 'HR Round', 'description': 'Background and cultural fit discussion'}
-        ],
-        'required_skills': [
-            {'category': 'Programming', 'items': ['Java/Python/C++', 'SQL', 'Data Structures']},
-            {'category': 'Concepts', 'items': ['Algorithms', 'DBMS', 'Networks']}
-        ],
-        'interview_tips': [
-            {'icon': '💻', 'title': 'Code Quality', 'description': 'Write clean, readable code with proper variable names'},
-            {'icon': '⚡', 'title': 'Optimization', 'description': 'Focus on optimizing solutions for time and space'},
-            {'icon': '🎯', 'title': 'Problem Solving', 'description': 'Break problems into smaller components'},
-            {'icon': '📝', 'title': 'Documentation', 'description': 'Explain your approach clearly'}
-        ]
-    },
-    'deloitte': {
-        'name': 'Deloitte',
-        'logo_url': 'https://upload.wikimedia.org/wikipedia/commons/thumb/1/12/Deloitte_2019_logo.svg/440px-Deloitte_2019_logo.svg.png',
-        'tagline': 'Make an Impact',
-        'description': 'Deloitte is a global consulting firm providing audit, consulting, financial advisory, risk advisory, and tax services.',
-        'industries': ['Consulting', 'Audit', 'Advisory', 'Compliance'],
-        'hiring_roles': ['Business Analyst', 'Consultant', 'Technology Consultant', 'Risk Analyst', 'Data Analyst'],
-        'salary_range': '₹4 - 8 LPA',
-        'bonus': '10-15%',
-        'benefits': ['Medical coverage', 'Mentoring program', 'Professional development', 'Flexible working'],
-        'interview_process': [
-            {'round': 'Aptitude Test', 'description': 'Logical reasoning and analytical skills'},
-            {'round': 'Technical/Business Round', 'description': 'Domain knowledge and problem-solving'},
-            {'round': 'Case Study', 'description': 'Real-world business case analysis'},
-            {'round': 'HR & Final Round', 'description': 'Culture fit and offer discussion'}
-        ],
-        'required_skills': [
-            {'category': 'Analytical', 'items': ['Problem-solving', 'Logical thinking', 'Data analysis']},
-            {'category': 'Business', 'items': ['Industry knowledge', 'Communication', 'Client management']}
-        ],
-        'interview_tips': [
-            {'icon': '🎓', 'title': 'Case Studies', 'description': 'Practice solving business case problems'},
-            {'icon': '💼', 'title': 'Industry Knowledge', 'description': 'Stay updated with current industry trends'},
-            {'icon': '🗣️', 'title': 'Communication', 'description': 'Present your ideas clearly and confidently'},
-            {'icon': '📊', 'title': 'Analytics', 'description': 'Show strong analytical and quantitative skills'}
-        ]
-    },
-    'goldman-sachs': {
-        'name': 'Goldman Sachs',
-        'logo_url': 'https://upload.wikimedia.org/wikipedia/commons/5/5d/GoldmanSachs.svg',
-        'tagline': 'Investment Banking Excellence',
-        'description': 'Goldman Sachs is a leading global investment banking, securities and investment management firm.',
-        'industries': ['Investment Banking', 'Finance', 'Trading', 'Risk Management'],
-        'hiring_roles': ['Analyst', 'Associate', 'Engineer', 'Risk Analyst', 'Quantitative Analyst'],
-        'salary_range': '₹8 - 20 LPA',
-        'bonus': '20-50%',
-        'benefits': ['Stock options', 'Bonuses', 'Premium healthcare', 'Learning funds'],
-        'interview_process': [
-            {'round': 'Online Assessment', 'description': 'Quantitative reasoning and coding'},
-            {'round': 'Technical Interview', 'description': 'System design and problem-solving'},
-            {'round': 'Business Round', 'description': 'Financial domain knowledge'},
-            {'round': 'Executive Round', 'description': 'Leadership and culture fit'}
-        ],
-        'required_skills': [
-            {'category': 'Technical', 'items': ['C++/Java/Python', 'Data Structures', 'Algorithms']},
-            {'category': 'Finance', 'items': ['Financial markets', 'Quantitative analysis', 'Risk management']}
-        ],
-        'interview_tips': [
-            {'icon': '💰', 'title': 'Financial Knowledge', 'description': 'Understand financial markets and instruments'},
-            {'icon': '🔢', 'title': 'Quantitative Skills', 'description': 'Excel at mathematical and statistical problems'},
-            {'icon': '⚙️', 'title': 'System Design', 'description': 'Be ready for large-scale system design questions'},
-            {'icon': '🎯', 'title': 'Precision', 'description': 'Attention to detail is critical'}
-        ]
-    },
-    'paloalto': {
-        'name': 'Palo Alto Networks',
-        'logo_url': 'https://upload.wikimedia.org/wikipedia/commons/3/34/Palo_Alto_Networks_logo.svg',
-        'tagline': 'Secure Every Moment',
-        'description': 'Palo Alto Networks is a cybersecurity company delivering security software and services.',
-        'industries': ['Cybersecurity', 'Enterprise Security', 'Cloud Security', 'Network Security'],
-        'hiring_roles': ['Security Engineer', 'Software Engineer', 'Security Analyst', 'Threat Researcher', 'DevOps Engineer'],
-        'salary_range': '₹6 - 14 LPA',
-        'bonus': '15-20%',
-        'benefits': ['Security training', 'Home office', 'Learning budget', 'Flexible schedule'],
-        'interview_process': [
-            {'round': 'Coding Assessment', 'description': 'Programming and problem-solving skills'},
-            {'round': 'Security Interview', 'description': 'Security concepts and threat analysis'},
-            {'round': 'System Design', 'description': 'Designing secure systems at scale'},
-            {'round': 'Final Round', 'description': 'Team and culture fit'}
-        ],
-        'required_skills': [
-            {'category': 'Security', 'items': ['Networking basics', 'Cryptography', 'Threat modeling', 'Incident response']},
-            {'category': 'Technical', 'items': ['C/C++/Python', 'Linux', 'Security protocols']}
-        ],
-        'interview_tips': [
-            {'icon': '🔐', 'title': 'Security First', 'description': 'Always think about security implications'},
-            {'icon': '🌐', 'title': 'Network Knowledge', 'description': 'Strong understanding of networking essentials'},
-            {'icon': '🛡️', 'title': 'Threat Analysis', 'description': 'Be able to identify and mitigate security threats'},
-            {'icon': '🧠', 'title': 'Stay Updated', 'description': 'Keep up with latest cybersecurity trends'}
-        ]
-    },
-    'zscaler': {
-        'name': 'Zscaler',
-        'logo_url': 'https://upload.wikimedia.org/wikipedia/commons/thumb/a/a8/Zscaler_logo_2023.svg/220px-Zscaler_logo_2023.svg.png',
-        'tagline': 'Zero Trust Security',
-        'description': 'Zscaler is a cybersecurity company providing zero trust security solutions and services.',
-        'industries': ['Cybersecurity', 'Zero Trust', 'Cloud Security', 'Enterprise Security'],
-        'hiring_roles': ['Security Engineer', 'Cloud Engineer', 'Software Engineer', 'Solutions Architect', 'Security Analyst'],
-        'salary_range': '₹5 - 12 LPA',
-        'bonus': '12-18%',
-        'benefits': ['Security certifications', 'Relocation support', 'Remote work', 'Professional development'],
-        'interview_process': [
-            {'round': 'Technical Screening', 'description': 'Coding and basic DSA assessment'},
-            {'round': 'Security Deep Dive', 'description': 'Security protocols and threat models'},
-            {'round': 'Architecture Round', 'description': 'Cloud and security architecture design'},
-            {'round': 'Team Discussion', 'description': 'Team fit and career goals'}
-        ],
-        'required_skills': [
-            {'category': 'Cloud Security', 'items': ['Cloud platforms', 'Container security', 'API security']},
-            {'category': 'Programming', 'items': ['Python/Go', 'Networking', 'Linux']}
-        ],
-        'interview_tips': [
-            {'icon': '☁️', 'title': 'Cloud Knowledge', 'description': 'Deep understanding of cloud architectures'},
-            {'icon': '🔑', 'title': 'Zero Trust', 'description': 'Understand zero trust security principles'},
-            {'icon': '🚀', 'title': 'Scalability', 'description': 'Design solutions for scale and performance'},
-            {'icon': '🔍', 'title': 'Monitoring', 'description': 'Knowledge of security monitoring and logging'}
-        ]
-    },
-    'airbus': {
-        'name': 'Airbus',
-        'logo_url': 'https://upload.wikimedia.org/wikipedia/commons/d/d8/Airbus_Logo_2017.svg',
-        'tagline': 'We make it fly',
-        'description': 'Airbus is a European aircraft manufacturer and aerospace company.',
-        'industries': ['Aerospace', 'Defense', 'Aviation', 'Engineering'],
-        'hiring_roles': ['Software Engineer', 'Embedded Systems Engineer', 'Mechanical Engineer', 'Systems Engineer', 'DevOps Engineer'],
-        'salary_range': '₹5 - 10 LPA',
-        'bonus': '10-15%',
-        'benefits': ['Relocation', 'Housing allowance', 'Medical coverage', 'Professional development'],
-        'interview_process': [
-            {'round': 'Technical Assessment', 'description': 'Programming and problem-solving'},
-            {'round': 'Embedded Systems Round', 'description': 'Real-time systems and embedded C/C++'},
-            {'round': 'System Design', 'description': 'Designing complex aerospace systems'},
-            {'round': 'HR Round', 'description': 'Background and culture fit'}
-        ],
-        'required_skills': [
-            {'category': 'Embedded', 'items': ['C/C++', 'Embedded systems', 'Real-time programming']},
-            {'category': 'Aerospace', 'items': ['Systems thinking', 'Safety-critical systems', 'RTOS']}
-        ],
-        'interview_tips': [
-            {'icon': '✈️', 'title': 'Domain Knowledge', 'description': 'Learn about aerospace industry basics'},
-            {'icon': '🔧', 'title': 'Embedded Focus', 'description': 'Strong embedded systems expertise expected'},
-            {'icon': '⚙️', 'title': 'Complex Systems', 'description': 'Ability to handle complex system design'},
-            {'icon': '📋', 'title': 'Documentation', 'description': 'Detailed documentation and standards compliance'}
-        ]
-    },
-    'morgan-stanley': {
-        'name': 'Morgan Stanley',
-        'logo_url': 'https://upload.wikimedia.org/wikipedia/commons/3/36/Morgan_Stanley_logo.svg',
-        'tagline': 'Your Global Investment Partner',
-        'description': 'Morgan Stanley is a leading global financial services firm providing investment banking, securities and wealth management services.',
-        'industries': ['Investment Banking', 'Finance', 'Wealth Management', 'Trading'],
-        'hiring_roles': ['Analyst', 'Associate', 'Software Engineer', 'Quantitative Analyst', 'Risk Manager'],
-        'salary_range': '₹7 - 18 LPA',
-        'bonus': '15-40%',
-        'benefits': ['Stock options', 'Performance bonus', 'Healthcare', 'Education fund'],
-        'interview_process': [
-            {'round': 'Online Test', 'description': 'Logical reasoning and quantitative skills'},
-            {'round': 'Technical Interview', 'description': 'Programming and system design'},
-            {'round': 'Business Round', 'description': 'Financial knowledge and case studies'},
-            {'round': 'Executive Round', 'description': 'Leadership assessment'}
-        ],
-        'required_skills': [
-            {'category': 'Finance', 'items': ['Financial markets', 'Derivatives', 'Risk analysis']},
-            {'category': 'Technical', 'items': ['C++/Java', 'Algorithms', 'Database systems']}
-        ],
-        'interview_tips': [
-            {'icon': '📈', 'title': 'Market Knowledge', 'description': 'Understand financial markets and instruments'},
-            {'icon': '💻', 'title': 'Trading Systems', 'description': 'Knowledge of high-frequency trading systems'},
-            {'icon': '🎯', 'title': 'Performance', 'description': 'Focus on optimization and efficiency'},
-            {'icon': '💼', 'title': 'Professionalism', 'description': 'Demonstrate professional and analytical approach'}
-        ]
-    },
-    'kpit': {
-        'name': 'KPIT Technologies',
-        'logo_url': 'https://upload.wikimedia.org/wikipedia/commons/8/8a/KPIT_Technologies_logo.jpg',
-        'tagline': 'Automotive Software Excellence',
-        'description': 'KPIT Technologies is a leading automotive software and engineering services company.',
-        'industries': ['Automotive', 'Embedded Systems', 'IoT', 'Engineering Services'],
-        'hiring_roles': ['Embedded Software Engineer', 'Automotive Software Engineer', 'Systems Engineer', 'Quality Engineer', 'DevOps Engineer'],
-        'salary_range': '₹3.5 - 7 LPA',
-        'bonus': '8-12%',
-        'benefits': ['Medical insurance', 'Flexible working', 'Technical training', 'Career progression'],
-        'interview_process': [
-            {'round': 'Technical Assessment', 'description': 'C/C++ and embedded systems programming'},
-            {'round': 'Automotive Knowledge', 'description': 'Automotive domain and protocols (CAN, LIN)'},
-            {'round': 'System Design', 'description': 'Designing automotive software systems'},
-            {'round': 'HR Round', 'description': 'Background and motivation'}
-        ],
-        'required_skills': [
-            {'category': 'Embedded', 'items': ['C/C++', 'RTOS', 'Microcontrollers', 'Automotive protocols']},
-            {'category': 'Domain', 'items': ['CAN/LIN/FlexRay', 'AUTOSAR', 'Vehicle diagnostics']}
-        ],
-        'interview_tips': [
-            {'icon': '🚗', 'title': 'Automotive Focus', 'description': 'Learn about automotive software development'},
-            {'icon': '⚙️', 'title': 'Embedded Expertise', 'description': 'Strong C/C++ and embedded systems knowledge'},
-            {'icon': '🔌', 'title': 'Protocols', 'description': 'Understand automotive communication protocols'},
-            {'icon': '🛠️', 'title': 'Debugging', 'description': 'Strong debugging and troubleshooting skills'}
-        ]
-    },
-    'thermax': {
-        'name': 'Thermax',
-        'logo_url': 'https://upload.wikimedia.org/wikipedia/commons/0/0c/Thermax_Limited_Logo.png',
-        'tagline': 'Engineering Solutions for Sustainability',
-        'description': 'Thermax is an engineering company providing energy and environment solutions.',
-        'industries': ['Engineering', 'Energy', 'Environmental', 'Industrial Solutions'],
-        'hiring_roles': ['Design Engineer', 'Software Engineer', 'Mechanical Engineer', 'Electrical Engineer', 'Project Manager'],
-        'salary_range': '₹3 - 6 LPA',
-        'bonus': '8-10%',
-        'benefits': ['Medical coverage', 'Performance bonus', 'Technical training', 'Career growth'],
-        'interview_process': [
-            {'round': 'Technical Test', 'description': 'Engineering fundamentals and problem-solving'},
-            {'round': 'Domain Round', 'description': 'Industry-specific knowledge and applications'},
-            {'round': 'Project Discussion', 'description': 'Academic or professional projects'},
-            {'round': 'HR Round', 'description': 'Background and fit assessment'}
-        ],
-        'required_skills': [
-            {'category': 'Engineering', 'items': ['CAD/CAM', 'Thermodynamics', 'Heat transfer', 'Mechanical design']},
-            {'category': 'Technical', 'items': ['MATLAB/Python', 'Simulation tools', 'AutoCAD']}
-        ],
-        'interview_tips': [
-            {'icon': '🌱', 'title': 'Sustainability', 'description': 'Show interest in green and sustainable solutions'},
-            {'icon': '🏭', 'title': 'Industrial Knowledge', 'description': 'Understand industrial processes and challenges'},
-            {'icon': '📐', 'title': 'Design Skills', 'description': 'Demonstrate CAD and design capabilities'},
-            {'icon': '💡', 'title': 'Problem Solving', 'description': 'Focus on practical engineering solutions'}
-        ]
-    },
-    'amandeus': {
-        'name': 'Amadeus',
-        'logo_url': 'https://upload.wikimedia.org/wikipedia/commons/2/2c/Amadeus_IT_Group_logo.svg',
-        'tagline': 'Powering Travel',
-        'description': 'Amadeus is a leading travel technology company providing software and services to the travel industry.',
-        'industries': ['Travel Technology', 'SaaS', 'Cloud Solutions', 'B2B'],
-        'hiring_roles': ['Software Engineer', 'Backend Developer', 'Systems Engineer', 'DevOps Engineer', 'Quality Analyst'],
-        'salary_range': '₹4 - 9 LPA',
-        'bonus': '12-15%',
-        'benefits': ['Travel benefits', 'Professional development', 'Flexible hours', 'Health insurance'],
-        'interview_process': [
-            {'round': 'Online Coding', 'description': 'Algorithm and data structure problems'},
-            {'round': 'System Design', 'description': 'Designing scalable travel systems'},
-            {'round': 'Backend Technology', 'description': 'Microservices and distributed systems'},
-            {'round': 'HR & Team Match', 'description': 'Culture and team fit'}
-        ],
-        'required_skills': [
-            {'category': 'Backend', 'items': ['Java/Python', 'SQL', 'REST APIs', 'Microservices']},
-            {'category': 'Cloud', 'items': ['Cloud platforms', 'Container orchestration', 'CI/CD']}
-        ],
-        'interview_tips': [
-            {'icon': '✈️', 'title': 'Travel Industry', 'description': 'Understand travel systems and GDS basics'},
-            {'icon': '🏗️', 'title': 'System Design', 'description': 'Focus on scalable distributed architecture'},
-            {'icon': '🔄', 'title': 'Microservices', 'description': 'Experience with microservices pattern'},
-            {'icon': '📊', 'title': 'Data Handling', 'description': 'Handle large-scale data and transactions'}
-        ]
-    },
-    'hexaware': {
-        'name': 'Hexaware',
-        'logo_url': 'https://upload.wikimedia.org/wikipedia/commons/2/22/Hexaware_Logo.png',
-        'tagline': 'Digital Reimagined',
-        'description': 'Hexaware is an IT services and consulting company providing digital transformation solutions.',
-        'industries': ['IT Services', 'Digital Transformation', 'Consulting', 'Cloud Services'],
-        'hiring_roles': ['Software Engineer', 'Systems Engineer', 'Senior Developer', 'Cloud Architect', 'QA Analyst'],
-        'salary_range': '₹3 - 6 LPA',
-        'bonus': '8-12%',
-        'benefits': ['Health insurance', 'Learning programs', 'Flexible work', 'Career path'],
-        'interview_process': [
-            {'round': 'Aptitude Test', 'description': 'Quantitative, logical and reasoning skills'},
-            {'round': 'Technical Interview', 'description': 'Programming and problem-solving'},
-            {'round': 'Second Technical', 'description': 'Project experience and system design'},
-            {'round': 'HR Round', 'description': 'Final selection'}
-        ],
-        'required_skills': [
-            {'category': 'Programming', 'items': ['Java/Python', 'SQL', 'Full-stack basics']},
-            {'category': 'Digital', 'items': ['Cloud platforms', 'DevOps', 'Agile methodology']}
-        ],
-        'interview_tips': [
-            {'icon': '🌐', 'title': 'Digital Focus', 'description': 'Show knowledge of digital transformation'},
-            {'icon': '☁️', 'title': 'Cloud Ready', 'description': 'Familiar with cloud platforms and services'},
-            {'icon': '⚡', 'title': 'Agile Mindset', 'description': 'Comfortable with agile and DevOps practices'},
-            {'icon': '🤝', 'title': 'Collaboration', 'description': 'Emphasize teamwork and communication'}
-        ]
-    },
-    'ibm': {
-        'name': 'IBM',
-        'logo_url': 'https://upload.wikimedia.org/wikipedia/commons/5/51/IBM_logo.svg',
-        'tagline': 'Think. Build. Transform.',
-        'description': 'IBM is a global technology and consulting company providing enterprise hardware, software, and services. Known for innovation in cloud, AI, and quantum computing.',
-        'industries': ['Enterprise IT', 'Cloud Solutions', 'AI & Cognitive', 'Quantum Computing', 'Consulting'],
-        'hiring_roles': ['Software Engineer', 'Cloud Developer', 'Data Scientist', 'Systems Engineer', 'Solutions Architect'],
-        'salary_range': '₹4 - 8 LPA',
-        'bonus': '10-15%',
-        'benefits': ['Health insurance', 'Stock options', 'Training programs', 'Flexible work arrangements', 'Wellness programs'],
-        'interview_process': [
-            {'round': 'Online Assessment', 'description': 'Coding test on HackerEarth or similar platform (2-3 problems, 90 minutes)'},
-            {'round': 'Technical Interview 1', 'description': 'Core concepts, DSA, system design, and code optimization'},
-            {'round': 'Technical Interview 2', 'description': 'Advanced problem-solving, architecture design, and project discussion'},
-            {'round': 'HR Round', 'description': 'Background, motivation, and cultural fit assessment'}
-        ],
-        'required_skills': [
-            {
-                'category': 'Programming',
-                'items': ['Java/Python/C++', 'SQL and Databases', 'Web services and APIs', 'Full-stack development']
-            },
-            {
-                'category': 'Cloud & DevOps',
-                'items': ['AWS/Azure/GCP', 'Docker/Kubernetes', 'CI/CD pipelines', 'Linux administration']
-            }
-        ],
-        'interview_tips': [
-            {'icon': '☁️', 'title': 'Cloud Knowledge', 'description': 'Showcase understanding of cloud services and architectures'},
-            {'icon': '🤖', 'title': 'AI & Innovation', 'description': 'Mention interest in AI, blockchain, or quantum technologies'},
-            {'icon': '🏗️', 'title': 'System Design', 'description': 'Practice designing scalable systems and microservices'},
-            {'icon': '📊', 'title': 'Analytics Mindset', 'description': 'Demonstrate data-driven thinking in solutions'}
-        ]
-    },
-    'accolite': {
-        'name': 'Accolite Digital',
-        'logo_url': 'https://upload.wikimedia.org/wikipedia/commons/thumb/3/3a/Accolite_Digital_Logo.png/220px-Accolite_Digital_Logo.png',
-        'tagline': 'Digital Transformation Enabler',
-        'description': 'Accolite Digital is a digital transformation consulting company specializing in cloud solutions, AI, and enterprise modernization. Focused on startup and SME growth.',
-        'industries': ['Digital Transformation', 'Cloud Consulting', 'AI Solutions', 'Enterprise Software', 'Startup Tech'],
-        'hiring_roles': ['Software Engineer', 'Cloud Architect', 'Data Engineer', 'Full Stack Developer', 'Technical Lead'],
-        'salary_range': '₹3.5 - 7 LPA',
-        'bonus': '8-12%',
-        'benefits': ['Performance bonus', 'Health insurance', 'Professional development', 'Flexible working', 'Stock options'],
-        'interview_process': [
-            {'round': 'Online Test', 'description': 'Coding challenge on platform like HackerRank (2-3 problems)'},
-            {'round': 'Technical Interview 1', 'description': 'Data structures, algorithms, and database concepts'},
-            {'round': 'Technical Interview 2', 'description': 'System design, API design, and cloud architecture'},
-            {'round': 'HR & Culture Round', 'description': 'Values alignment and career aspirations'}
-        ],
-        'required_skills': [
-            {
-                'category': 'Core Development',
-                'items': ['Java/Python/JavaScript', 'Databases (SQL & NoSQL)', 'REST APIs', 'Microservices']
-            },
-            {
-                'category': 'Cloud & Modern Stack',
-                'items': ['AWS or GCP', 'Docker & Kubernetes', 'Agile methodologies', 'Git & Version control']
-            }
-        ],
-        'interview_tips': [
-            {'icon': '🚀', 'title': 'Startup Mindset', 'description': 'Show entrepreneurial thinking and problem-solving attitude'},
-            {'icon': '💡', 'title': 'Modern Tech Stack', 'description': 'Highlight experience with latest frameworks and technologies'},
-            {'icon': '🔧', 'title': 'Hands-on Skills', 'description': 'Demonstrate practical knowledge of modern development tools'},
-            {'icon': '📱', 'title': 'Full Stack Ready', 'description': 'Comfortable working across frontend, backend, and infrastructure'}
-        ]
-    },
-    'sap': {
-        'name': 'SAP',
-        'logo_url': 'https://upload.wikimedia.org/wikipedia/commons/5/5c/SAP_2011_logo.svg',
-        'tagline': 'Run Better. Together.',
-        'description': 'SAP is a leading enterprise resource planning software company. Provides integrated business management solutions and cloud-based applications for businesses worldwide.',
-        'industries': ['Enterprise Software', 'ERP Solutions', 'Cloud Computing', 'Business Intelligence', 'Analytics'],
-        'hiring_roles': ['Software Developer', 'ABAP Developer', 'Consultant', 'Sales Engineer', 'Product Manager'],
-        'salary_range': '₹4 - 10 LPA',
-        'bonus': '12-18%',
-        'benefits': ['Premium health insurance', 'Stock options', 'Generous PTO', 'Learning budget', 'Global mobility'],
-        'interview_process': [
-            {'round': 'Coding Assessment', 'description': 'Algorithm and data structure problems (60-90 minutes)'},
-            {'round': 'Technical Phone Interview', 'description': 'Technical depth, problem-solving approach, and domain knowledge'},
-            {'round': 'On-site Technical', 'description': 'System design, architecture discussions, and real-world scenarios'},
-            {'round': 'Final Round', 'description': 'HR round and team cultural fit assessment'}
-        ],
-        'required_skills': [
-            {
-                'category': 'Core Skills',
-                'items': ['Java/Python/C#', 'SQL and Database design', 'Software architecture', 'API development']
-            },
-            {
-                'category': 'SAP Specific',
-                'items': ['ABAP (preferred)', 'SAP Cloud Platform', 'SAP Fiori', 'HANA database basics']
-            }
-        ],
-        'interview_tips': [
-            {'icon': '🏢', 'title': 'Enterprise Focus', 'description': 'Understand enterprise software challenges and solutions'},
-            {'icon': '📊', 'title': 'ERP Knowledge', 'description': 'Basic understanding of ERP concepts and business processes'},
-            {'icon': '🌍', 'title': 'Global Mindset', 'description': 'Show interest in global business and innovation'},
-            {'icon': '💼', 'title': 'Professional Approach', 'description': 'Demonstrate maturity and business acumen in discussions'}
-        ]
-    }
-}
-
-
 def company_details(request, company):
-    """Display detailed information about a specific company."""
+    """Display detailed information about a specific company.
+
+    Profiles live in the `CompanyProfile` table; `company` is resolved
+    through the alias/prefix index and the rendered page is cached per
+    company (see accounts.company_kb).
+    """
     try:
-        company_key = company.lower().strip()
-        
-        if company_key not in COMPANY_DATABASE:
-            # If exact match not found, try to find partial match
-            for key in COMPANY_DATABASE.keys():
-                if key in company_key or company_key in key:
-                    company_key = key
-                    break
-            else:
-                raise Http404(f"Company '{company}' not found")
-        
-        company_data = COMPANY_DATABASE[company_key]
-        
-        context = {
-            'company': company_data,
-            'page_title': f'{company_data["name"]} - Interview Preparation Guide'
-        }
-        
-        return render(request, 'company-details.html', context)
+        slug = company_kb.resolve(company)
+        if slug is None:
+            raise Http404(f"Company '{company}' not found")
+
+        return HttpResponse(company_kb.render_page(request, slug))
     
     except Http404:
         raise
@@ -1888,26 +1329,36 @@ def company_details(request, company):
 
 # ✅ नए Users को देखने के लिए view
 def view_all_users(request):
-    """सभी registered users को show करता है"""
+    """सभी registered users को show करता है (newest first, cursor pages)"""
     from .models import UserProfile
     
-    # सभी users को get करो
-    all_users = AuthUser.objects.all()
+    try:
+        cursor, page_size = pagination.page_params(request)
+    except pagination.InvalidCursor:
+        cursor, page_size = None, settings.LIST_PAGE_SIZE
+
+    # एक page के users, profile के साथ एक ही query में
+    page = pagination.paginate(AuthUser.objects.select_related('profile'), 'date_joined', cursor, page_size)
+    # Full-access flags for the whole page in one query
+    paid_ids = entitlements.with_full_access(
+        user.profile.pk for user in page.items if hasattr(user, 'profile')
+    )
     user_data = []
     
-    for user in all_users:
-        profile = UserProfile.objects.filter(auth_user=user).first()
+    for user in page.items:
+        profile = getattr(user, 'profile', None)
         user_data.append({
             'id': user.id,
             'email': user.email,
             'fullname': user.first_name,
             'date_joined': user.date_joined,
             'phone': profile.phone if profile else '-',
-            'is_paid': profile.has_paid if profile else False,
+            'is_paid': bool(profile and profile.pk in paid_ids),
         })
     
     context = {
         'users': user_data,
-        'total_users': len(user_data),
+        'total_users': AuthUser.objects.count(),
+        'next_cursor': page.next_cursor,
     }
-    return render(request, 'users_list.html', context)
+    return render(request, 'accounts/users_list.html', context)
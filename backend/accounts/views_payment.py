@@ -1,7 +1,8 @@
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
-from .models import Transaction, User, PurchasedItem
+from .models import Transaction, User, PurchasedItem, UserProfile
+from . import entitlements
 from django.utils import timezone
 import json
 
@@ -38,10 +39,8 @@ def verify_transaction(request):
         # Update user's paid companies if user is authenticated
         if request.user.is_authenticated:
             user = request.user
-            paid_companies = user.paid_companies or {}
-            paid_companies[company] = True
-            user.paid_companies = paid_companies
-            user.save()
+            profile, _ = UserProfile.objects.get_or_create(auth_user=user)
+            entitlements.grant(profile, entitlements.COMPANY, company)
             transaction.user = user
             transaction.save()
             
@@ -992,56 +992,43 @@ def api_get_user_profile_data(request, user_id):
     GET /api/user-complete-profile/<user_id>/
     """
     from accounts.models import UserActivity, PurchasedItem, AttemptedMock
+    from accounts import pagination, profile_cache
     
     try:
-        user = DjangoUser.objects.get(id=user_id)
+        # Account fields and stats come from the cached profile aggregate
+        aggregate = profile_cache.get(user_id)
+        if aggregate is None:
+            return JsonResponse({
+                'success': False,
+                'error': 'User not found'
+            }, status=404)
         
         # Get all activities
-        activities = UserActivity.objects.filter(user=user).order_by('-created_at')[:50]
-        
-        # Get purchases
-        purchases = PurchasedItem.objects.filter(user=user).order_by('-purchased_at')
-        
-        # Get mock attempts
-        attempts = AttemptedMock.objects.filter(user=user).order_by('-attempt_date')
-        
-        # Calculate statistics
-        total_purchases = purchases.count()
-        total_mock_attempts = attempts.count()
-        total_activities = activities.count()
+        activities = list(UserActivity.objects.filter(user_id=user_id).order_by('-created_at')[:50])
+        stats = aggregate['stats']
         
-        avg_mock_score = 0
-        if total_mock_attempts > 0:
-            avg_mock_score = sum([a.score for a in attempts]) / total_mock_attempts
+        # Newest page of each list; older pages via /user/<id>/profile/ cursors
+        purchases = pagination.paginate(PurchasedItem.objects.filter(user_id=user_id), 'purchased_at')
+        attempts = pagination.paginate(AttemptedMock.objects.filter(user_id=user_id), 'attempt_date')
         
         return JsonResponse({
             'success': True,
             'profile': {
-                'user': {
-                    'id': user.id,
-                    'email': user.email,
-                    'firstName': user.first_name,
-                    'lastName': user.last_name,
-                    'username': user.username,
-                    'joinedDate': user.date_joined.isoformat()
-                },
+                'user': aggregate['user'],
                 'statistics': {
-                    'totalPurchases': total_purchases,
-                    'totalMockAttempts': total_mock_attempts,
-                    'totalActivities': total_activities,
-                    'averageMockScore': round(avg_mock_score, 2)
+                    'totalPurchases': stats['totalPurchases'],
+                    'totalMockAttempts': stats['totalMockAttempts'],
+                    'totalActivities': len(activities),
+                    'averageMockScore': stats['averageMockScore']
                 },
                 'activities': [activity.as_dict() for activity in activities],
-                'purchases': [purchase.as_dict() for purchase in purchases],
-                'mockAttempts': [attempt.as_dict() for attempt in attempts]
+                'purchases': [purchase.as_dict() for purchase in purchases.items],
+                'mockAttempts': [attempt.as_dict() for attempt in attempts.items],
+                'purchasesNextCursor': purchases.next_cursor,
+                'mockAttemptsNextCursor': attempts.next_cursor
             }
         }, status=200)
     
-    except DjangoUser.DoesNotExist:
-        return JsonResponse({
-            'success': False,
-            'error': 'User not found'
-        }, status=404)
     except Exception as e:
         return JsonResponse({
             'success': False,
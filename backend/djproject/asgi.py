@@ -0,0 +1,13 @@
+"""ASGI config for djproject.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+Serve the project with an ASGI server (``uvicorn djproject.asgi:application``)
+so long-lived responses such as ``/api/events/`` do not tie up worker threads.
+"""
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'djproject.settings')
+
+application = get_asgi_application()
@@ -53,8 +53,15 @@ TEMPLATES = [
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         # Frontend folder contains all HTML templates
         'DIRS': [BASE_DIR.parent / 'frontend'],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Django's default cached loader; it also lets accounts.prerender
+            # see which templates a page renders
+            'loaders': [
+                ('accounts.page_cache.RecordingLoader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -66,6 +73,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'djproject.wsgi.application'
+ASGI_APPLICATION = 'djproject.asgi.application'
 
 # ============================================================================
 # DATABASE CONFIGURATION
@@ -76,6 +84,49 @@ WSGI_APPLICATION = 'djproject.wsgi.application'
 
 DATABASES = get_database_config()
 
+# Process-local cache by default; point CACHE_BACKEND/CACHE_LOCATION at a
+# shared backend (e.g. redis) in production so invalidations reach every worker.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'studypro-default'),
+        'OPTIONS': {'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', '50000'))},
+    },
+}
+
+# Cursor pagination for list endpoints (see accounts.pagination)
+LIST_PAGE_SIZE = int(os.getenv('LIST_PAGE_SIZE', '50'))
+LIST_MAX_PAGE_SIZE = int(os.getenv('LIST_MAX_PAGE_SIZE', '200'))
+
+# Output of `manage.py prerender_site` (static pages for the web server)
+PRERENDER_ROOT = os.getenv('PRERENDER_ROOT', os.path.join(BASE_DIR, 'prerendered'))
+
+# How PDFs and /assets/ files are sent (see accounts.file_delivery):
+# 'python', 'x-accel-redirect' (nginx) or 'x-sendfile' (Apache/lighttpd)
+FILE_DELIVERY = os.getenv('FILE_DELIVERY', 'python')
+FILE_DELIVERY_ACCEL_PREFIX = os.getenv('FILE_DELIVERY_ACCEL_PREFIX', '/protected-assets/')
+# Lifetime in seconds of signed PDF links (see accounts.download_links)
+PDF_LINK_TTL = int(os.getenv('PDF_LINK_TTL', '900'))
+
+# Page counts, hashes and thumbnails of PDFs (see accounts.pdf_meta)
+PDF_META_ROOT = os.getenv('PDF_META_ROOT', os.path.join(BASE_DIR, 'pdf_meta'))
+
+# Node Socket.IO server that relays realtime events (see accounts.realtime)
+SOCKETIO_URL = os.getenv('SOCKETIO_URL', 'http://localhost:3000')
+# Events waiting to be sent per process; newer ones are dropped beyond this
+SOCKETIO_QUEUE_SIZE = int(os.getenv('SOCKETIO_QUEUE_SIZE', '1000'))
+
+# Where accounts.realtime sends profile events: 'socketio' (the Node server)
+# and/or 'sse' (/api/events/). Enable 'sse' only when serving djproject.asgi
+# (see README); under WSGI /api/events/ answers 503.
+REALTIME_TRANSPORTS = os.getenv('REALTIME_TRANSPORTS', 'socketio').split(',')
+# Seconds to collect a user's events into one message (0: send each alone)
+REALTIME_COALESCE_WINDOW = float(os.getenv('REALTIME_COALESCE_WINDOW', '0.25'))
+# Pub/sub behind /api/events/ (see accounts.event_stream); use
+# accounts.event_stream.SQLiteBroker when running several ASGI processes
+EVENT_STREAM_BACKEND = os.getenv('EVENT_STREAM_BACKEND', 'accounts.event_stream.LocalBroker')
+EVENT_STREAM_SQLITE_PATH = os.getenv('EVENT_STREAM_SQLITE_PATH', os.path.join(BASE_DIR, 'events.sqlite3'))
+
 
 AUTH_PASSWORD_VALIDATORS = []
 
@@ -87,8 +138,16 @@ USE_I18N = True
 USE_TZ = True
 
 STATIC_URL = '/static/'
-STATICFILES_DIRS = [BASE_DIR.parent / 'frontend']
+# Only the static trees of frontend/; templates and PDFs (MEDIA_ROOT) are
+# not collected
+STATICFILES_DIRS = [(name, BASE_DIR.parent / 'frontend' / name) for name in ('css', 'js', 'images')]
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
+# Hashed, precompressed files resolved through staticfiles.json
+# (manage.py build_static, see accounts.static_assets)
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'accounts.static_assets.ManifestStorage'},
+}
 
 
 MEDIA_URL = '/assets/'  
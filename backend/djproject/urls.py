@@ -2,14 +2,10 @@
 
 We include the `accounts` app at root for templates and again under `/api/` for API endpoints.
 """
-import os
 from django.contrib import admin
 from django.urls import path, include
 from django.views.generic import RedirectView
-from django.conf import settings
-from django.conf.urls.static import static
 from accounts import views
-from django.views.static import serve
 from django.urls import path, re_path
 
 urlpatterns = [
@@ -23,14 +19,10 @@ urlpatterns = [
     re_path(r'^(?P<path>.*\.html)$', views.dynamic_html, name='dynamic_html'),
 ]
 
-if settings.DEBUG:
-    # Serve static files during development
-    urlpatterns += static(settings.STATIC_URL, document_root=os.path.join(settings.BASE_DIR, 'accounts', 'static'))
-    # Serve media files during development
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
-
-# Explicitly add /assets/ URL mapping
+# /assets/ and /static/ go through file_delivery / static_assets in every
+# mode; a DEBUG static() mapping here would shadow them.
 urlpatterns += [
-    re_path(r'^assets/(?P<path>.*)$', serve, {'document_root': settings.MEDIA_ROOT}),
+    re_path(r'^assets/(?P<path>.*)$', views.serve_asset, name='serve_asset'),
+    re_path(r'^static/(?P<path>.*)$', views.serve_static, name='serve_static'),
 ]
 
@@ -102,8 +102,11 @@ def view_user_details():
             
             # UserProfile से extra details निकालो
             cursor.execute('''
-                SELECT phone, has_paid, created_at 
-                FROM accounts_userprofile 
+                SELECT phone,
+                       EXISTS(SELECT 1 FROM accounts_entitlement e
+                              WHERE e.user_id = p.id AND e.scope = 'all'),
+                       created_at 
+                FROM accounts_userprofile p 
                 WHERE auth_user_id = ?
             ''', (user_id,))
             
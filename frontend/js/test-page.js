@@ -67,6 +67,17 @@ class TestPage {
 
       const data = await response.json();
       this.questions = data.questions || [];
+      // Server-side handle for this exact paper (used for scoring/review)
+      this.paperId = data.paper_id || null;
+      // difficulty=adaptive is resolved by the server; show the level served
+      if (data.difficulty && data.difficulty !== this.config.difficulty) {
+        this.config.difficulty = data.difficulty;
+        const badge = document.getElementById('difficultyBadge');
+        if (badge) {
+          badge.textContent = data.difficulty.charAt(0).toUpperCase() + data.difficulty.slice(1);
+          badge.className = 'difficulty-badge ' + data.difficulty;
+        }
+      }
       console.log(`Loaded ${this.questions.length} questions`);
     } catch (error) {
       console.error('Failed to load questions:', error);
@@ -518,6 +529,7 @@ class TestPage {
         percentage: percentage,
         time_remaining: this.timeRemaining,
         answers: this.answers,
+        paper_id: this.paperId,
         email: userEmail,
         name: userName,
         timestamp: new Date().toISOString()